@@ -1,5 +1,4 @@
-import os
-from dotenv import load_dotenv
+from app.core.settings import env
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -10,16 +9,18 @@ from alembic import context
 from app.database.db import Base
 from app.features.auth.models import user_model
 from app.features.api_keys.models.api_model import ApiKey
-from app.features.wallet.models.wallet_model import Wallet
-from app.features.transaction.models.transaction_model import Transaction
+from app.features.wallet.models.wallet_model import Wallet, WalletBalanceShard
+from app.features.wallet.models.rollup_model import WalletDailyRollup
+from app.features.transaction.models.transaction_model import Transaction, TransactionPayloadArchive
+from app.features.reconciliation.models.checkpoint_model import JobCheckpoint
+from app.features.scheduled_transfers.models.schedule_model import ScheduledTransfer
 
-load_dotenv()
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
-db_url = os.getenv("DATABASE_URL")
+db_url = env("DATABASE_URL")
 
 config.set_main_option("sqlalchemy.url", db_url)
 
@@ -0,0 +1,115 @@
+"""transaction payload archive
+
+Revision ID: 17d01917c751
+Revises: 433770900c91
+Create Date: 2026-10-18 10:41:02.376815
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '17d01917c751'
+down_revision: Union[str, Sequence[str], None] = '433770900c91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INLINE_FIELDS = ("authorization_url", "gateway_response", "channel", "paid_at")
+BATCH_SIZE = 1000
+
+transactions = sa.table(
+    'transactions',
+    sa.column('id', sa.Integer),
+    sa.column('reference', sa.String),
+    sa.column('meta', sa.JSON),
+)
+archive = sa.table(
+    'transaction_payload_archive',
+    sa.column('reference', sa.String),
+    sa.column('source', sa.String),
+    sa.column('payload', sa.LargeBinary),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _compact(payload):
+    nested = payload.get('data') if isinstance(payload.get('data'), dict) else {}
+    kept = {}
+    for field in INLINE_FIELDS:
+        value = nested.get(field, payload.get(field))
+        if value is not None:
+            kept[field] = value
+    return kept or None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_payload_archive',
+    sa.Column('reference', sa.String(), nullable=False),
+    sa.Column('source', sa.String(length=20), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('reference', 'source')
+    )
+
+    # Backfill: archive every inline payload, then shrink meta to the
+    # whitelisted fields. Walks the table by id in batches.
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(transactions.c.id, transactions.c.reference, transactions.c.meta)
+            .where(transactions.c.id > last_id, transactions.c.meta.isnot(None))
+            .order_by(transactions.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        archived, compacted = [], []
+        for row in rows:
+            payload = row.meta
+            if not isinstance(payload, dict):
+                continue
+            # webhook payloads carry an "event"; initialize responses don't
+            source = 'webhook' if 'event' in payload else 'initialize'
+            archived.append({
+                'reference': row.reference,
+                'source': source,
+                'payload': zlib.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'), 6),
+            })
+            compacted.append({'b_id': row.id, 'b_meta': _compact(payload)})
+
+        if archived:
+            conn.execute(postgresql.insert(archive).on_conflict_do_nothing(), archived)
+            conn.execute(
+                transactions.update()
+                .where(transactions.c.id == sa.bindparam('b_id'))
+                .values(meta=sa.bindparam('b_meta', type_=sa.JSON)),
+                compacted,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(archive.c.reference, archive.c.source, archive.c.payload)).all()
+    # restore the latest payload per reference (webhook/verify over initialize)
+    best = {}
+    for row in rows:
+        if row.reference not in best or row.source != 'initialize':
+            best[row.reference] = json.loads(zlib.decompress(row.payload))
+    for reference, payload in best.items():
+        conn.execute(
+            transactions.update()
+            .where(transactions.c.reference == reference)
+            .values(meta=payload)
+        )
+    op.drop_table('transaction_payload_archive')
@@ -0,0 +1,41 @@
+"""reconciliation checkpoints
+
+Revision ID: 433770900c91
+Revises: 80fdd93c0cf6
+Create Date: 2026-10-18 10:03:27.551904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '433770900c91'
+down_revision: Union[str, Sequence[str], None] = '80fdd93c0cf6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_checkpoints',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('position', sa.String(length=200), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    # CONCURRENTLY so transactions stays writable while the index builds
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transactions_status_type_created_at', 'transactions',
+                        ['status', 'type', 'created_at', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transactions_status_type_created_at', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_table('job_checkpoints')
@@ -0,0 +1,46 @@
+"""wallet daily rollups
+
+Revision ID: 46c934f0c430
+Revises: 17d01917c751
+Create Date: 2026-10-18 11:36:15.204467
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '46c934f0c430'
+down_revision: Union[str, Sequence[str], None] = '17d01917c751'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('wallet_daily_rollups',
+    sa.Column('wallet_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('type', postgresql.ENUM('DEPOSIT', 'TRANSFER_IN', 'TRANSFER_OUT', name='transactiontype', create_type=False), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+    sa.PrimaryKeyConstraint('wallet_id', 'day', 'type')
+    )
+    # watermark scan for the rollup catch-up job; CONCURRENTLY so
+    # transactions stays writable while it builds
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transactions_status_updated_at', 'transactions',
+                        ['status', 'updated_at', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_transactions_status_updated_at', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
+    op.drop_table('wallet_daily_rollups')
@@ -0,0 +1,57 @@
+"""user integer keys
+
+Revision ID: 5d1c9e7a2f40
+Revises: b8e2d51f7a3c
+Create Date: 2026-10-18 12:41:07.552913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c9e7a2f40'
+down_revision: Union[str, Sequence[str], None] = 'b8e2d51f7a3c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # identity column: existing rows are numbered as part of the ALTER
+    op.add_column('users', sa.Column('id', sa.Integer(), sa.Identity(always=False), nullable=False))
+    op.create_unique_constraint('users_id_key', 'users', ['id'])
+
+    op.add_column('wallets', sa.Column('user_pk', sa.Integer(), nullable=True))
+    op.add_column('api_keys', sa.Column('user_pk', sa.Integer(), nullable=True))
+    op.execute("UPDATE wallets AS w SET user_pk = u.id FROM users AS u WHERE u.user_id = w.user_id")
+    op.execute("UPDATE api_keys AS k SET user_pk = u.id FROM users AS u WHERE u.user_id = k.user_id")
+    op.alter_column('wallets', 'user_pk', nullable=False)
+    op.alter_column('api_keys', 'user_pk', nullable=False)
+
+    op.create_foreign_key('wallets_user_pk_fkey', 'wallets', 'users', ['user_pk'], ['id'])
+    op.create_unique_constraint('wallets_user_pk_key', 'wallets', ['user_pk'])
+    op.create_foreign_key('api_keys_user_pk_fkey', 'api_keys', 'users', ['user_pk'], ['id'])
+    op.create_index(op.f('ix_api_keys_user_pk'), 'api_keys', ['user_pk'], unique=False)
+
+    # lookups now go through user_pk; the string indexes are dead weight
+    op.drop_constraint('wallets_user_id_key', 'wallets', type_='unique')
+    op.drop_index(op.f('ix_api_keys_user_id'), table_name='api_keys')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_api_keys_user_id'), 'api_keys', ['user_id'], unique=False)
+    op.create_unique_constraint('wallets_user_id_key', 'wallets', ['user_id'])
+
+    op.drop_index(op.f('ix_api_keys_user_pk'), table_name='api_keys')
+    op.drop_constraint('api_keys_user_pk_fkey', 'api_keys', type_='foreignkey')
+    op.drop_constraint('wallets_user_pk_key', 'wallets', type_='unique')
+    op.drop_constraint('wallets_user_pk_fkey', 'wallets', type_='foreignkey')
+    op.drop_column('api_keys', 'user_pk')
+    op.drop_column('wallets', 'user_pk')
+
+    op.drop_constraint('users_id_key', 'users', type_='unique')
+    op.drop_column('users', 'id')
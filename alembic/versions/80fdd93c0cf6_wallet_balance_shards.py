@@ -0,0 +1,42 @@
+"""wallet balance shards
+
+Revision ID: 80fdd93c0cf6
+Revises: 2196ec9c6ffe
+Create Date: 2026-10-18 09:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '80fdd93c0cf6'
+down_revision: Union[str, Sequence[str], None] = '2196ec9c6ffe'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('wallets', sa.Column('shard_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('wallet_balance_shards',
+    sa.Column('wallet_id', sa.Integer(), nullable=False),
+    sa.Column('shard_no', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+    sa.PrimaryKeyConstraint('wallet_id', 'shard_no')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # fold any unconsolidated shard balances back into their wallets first
+    op.execute(
+        "UPDATE wallets SET balance = wallets.balance + s.total "
+        "FROM (SELECT wallet_id, SUM(balance) AS total FROM wallet_balance_shards GROUP BY wallet_id) AS s "
+        "WHERE wallets.id = s.wallet_id"
+    )
+    op.drop_table('wallet_balance_shards')
+    op.drop_column('wallets', 'shard_count')
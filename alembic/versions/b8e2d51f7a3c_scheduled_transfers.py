@@ -0,0 +1,49 @@
+"""scheduled transfers
+
+Revision ID: b8e2d51f7a3c
+Revises: 46c934f0c430
+Create Date: 2026-10-18 12:04:51.318220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2d51f7a3c'
+down_revision: Union[str, Sequence[str], None] = '46c934f0c430'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scheduled_transfers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.String(length=50), nullable=False),
+    sa.Column('wallet_id', sa.Integer(), nullable=False),
+    sa.Column('recipient_wallet_number', sa.String(), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('interval_seconds', sa.Integer(), nullable=True),
+    sa.Column('next_run_at', sa.DateTime(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('run_count', sa.Integer(), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(), nullable=True),
+    sa.Column('last_status', sa.String(length=20), nullable=True),
+    sa.Column('last_error', sa.String(length=200), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ),
+    sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scheduled_transfers_user_id'), 'scheduled_transfers', ['user_id'], unique=False)
+    op.create_index('ix_scheduled_transfers_active_next_run_at', 'scheduled_transfers', ['is_active', 'next_run_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_scheduled_transfers_active_next_run_at', table_name='scheduled_transfers')
+    op.drop_index(op.f('ix_scheduled_transfers_user_id'), table_name='scheduled_transfers')
+    op.drop_table('scheduled_transfers')
@@ -0,0 +1,41 @@
+"""rollup shards
+
+Revision ID: c41e8b2d9a57
+Revises: e3a7c0b94d18
+Create Date: 2026-10-18 16:12:07.514093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e8b2d9a57'
+down_revision: Union[str, Sequence[str], None] = 'e3a7c0b94d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('wallet_daily_rollups', sa.Column('shard_no', sa.Integer(), server_default='0', nullable=False))
+    op.drop_constraint('wallet_daily_rollups_pkey', 'wallet_daily_rollups', type_='primary')
+    op.create_primary_key('wallet_daily_rollups_pkey', 'wallet_daily_rollups', ['wallet_id', 'day', 'type', 'shard_no'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # fold shard rows back into shard 0 before the key narrows
+    op.execute(
+        "INSERT INTO wallet_daily_rollups (wallet_id, day, type, shard_no, count, total) "
+        "SELECT wallet_id, day, type, 0, sum(count), sum(total) FROM wallet_daily_rollups "
+        "WHERE shard_no <> 0 GROUP BY wallet_id, day, type "
+        "ON CONFLICT (wallet_id, day, type, shard_no) DO UPDATE SET "
+        "count = wallet_daily_rollups.count + excluded.count, total = wallet_daily_rollups.total + excluded.total"
+    )
+    op.execute("DELETE FROM wallet_daily_rollups WHERE shard_no <> 0")
+    op.drop_constraint('wallet_daily_rollups_pkey', 'wallet_daily_rollups', type_='primary')
+    op.create_primary_key('wallet_daily_rollups_pkey', 'wallet_daily_rollups', ['wallet_id', 'day', 'type'])
+    op.drop_column('wallet_daily_rollups', 'shard_no')
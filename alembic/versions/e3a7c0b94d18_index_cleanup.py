@@ -0,0 +1,54 @@
+"""index cleanup
+
+Revision ID: e3a7c0b94d18
+Revises: 5d1c9e7a2f40
+Create Date: 2026-10-18 13:02:44.180375
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c0b94d18'
+down_revision: Union[str, Sequence[str], None] = '5d1c9e7a2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# plain indexes duplicating a primary key, plus one nothing filters on
+REDUNDANT = [
+    ('ix_wallets_id', 'wallets', ['id']),
+    ('ix_transactions_id', 'transactions', ['id']),
+    ('ix_users_user_id', 'users', ['user_id']),
+    ('ix_api_keys_api_key', 'api_keys', ['api_key']),
+    ('ix_api_keys_masked_key', 'api_keys', ['masked_key']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY so transactions stays writable while the indexes build
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transactions_wallet_id_created_at', 'transactions',
+                        ['wallet_id', 'created_at', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transactions_counterparty_wallet_id', 'transactions',
+                        ['counterparty_wallet_id'], unique=False,
+                        postgresql_where=sa.text('counterparty_wallet_id IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _columns in REDUNDANT:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            op.create_index(name, table, columns, unique=False,
+                            postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_transactions_counterparty_wallet_id', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_wallet_id_created_at', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,54 @@
+"""transaction search indexes
+
+Revision ID: f5b2a8d61c39
+Revises: c41e8b2d9a57
+Create Date: 2026-10-18 16:48:31.270415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b2a8d61c39'
+down_revision: Union[str, Sequence[str], None] = 'c41e8b2d9a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY so transactions stays writable while the indexes build.
+    # Each new index replaces one from e3a7c0b94d18 that is a prefix of it,
+    # so the table keeps the same number of indexes.
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transactions_wallet_history', 'transactions',
+                        ['wallet_id', 'created_at', 'id'], unique=False,
+                        postgresql_include=['type', 'status', 'amount'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transactions_counterparty_history', 'transactions',
+                        ['counterparty_wallet_id', 'wallet_id', 'created_at', 'id'], unique=False,
+                        postgresql_where=sa.text('counterparty_wallet_id IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_transactions_wallet_id_created_at', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_counterparty_wallet_id', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_transactions_counterparty_wallet_id', 'transactions',
+                        ['counterparty_wallet_id'], unique=False,
+                        postgresql_where=sa.text('counterparty_wallet_id IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_transactions_wallet_id_created_at', 'transactions',
+                        ['wallet_id', 'created_at', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_transactions_counterparty_history', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_transactions_wallet_history', table_name='transactions',
+                      postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,88 @@
+"""
+Report index usage from pg_stat_user_indexes (PostgreSQL only).
+
+    python -m app.cli.index_report [--json]
+
+Run it against a database that has served a representative workload, e.g.
+a seeded one (app.cli.seed) after a load test. Flags:
+
+    unused     no scans since the statistics were last reset, not unique
+    redundant  its columns are a leading prefix of another index on the
+               same table with the same predicate, and it is not unique
+"""
+import argparse
+import json
+
+from sqlalchemy import text
+
+from app.database.db import SessionLocal, init_engines
+
+INDEX_STATS = text("""
+    SELECT s.relname AS table_name,
+           s.indexrelname AS index_name,
+           s.idx_scan,
+           s.idx_tup_read,
+           pg_relation_size(s.indexrelid) AS size_bytes,
+           i.indisunique AS is_unique,
+           i.indisprimary AS is_primary,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+               JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+               ORDER BY k.ord
+           ) AS columns,
+           pg_get_expr(i.indpred, i.indrelid) AS predicate
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    ORDER BY s.relname, s.indexrelname
+""")
+
+
+def flag_indexes(rows: list[dict]) -> list[dict]:
+    for row in rows:
+        flags = []
+        if not row["idx_scan"] and not row["is_unique"]:
+            flags.append("unused")
+        if not row["is_unique"]:
+            cols = list(row["columns"])
+            for other in rows:
+                if (
+                    other is not row
+                    and other["table_name"] == row["table_name"]
+                    and other["predicate"] == row["predicate"]
+                    and list(other["columns"][:len(cols)]) == cols
+                    and (len(other["columns"]) > len(cols) or other["is_unique"])
+                ):
+                    flags.append(f"redundant ({other['index_name']})")
+                    break
+        row["flags"] = flags
+    return rows
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--json", action="store_true", help="print rows as JSON")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        if db.get_bind().dialect.name != "postgresql":
+            raise SystemExit("index_report needs PostgreSQL (pg_stat_user_indexes)")
+        rows = flag_indexes([dict(row._mapping) for row in db.execute(INDEX_STATS)])
+
+    if args.json:
+        print(json.dumps(rows, default=list, indent=2))
+        return
+
+    print(f"{'table':<28} {'index':<44} {'scans':>10} {'size':>10}  columns / flags")
+    for row in rows:
+        size = f"{row['size_bytes'] / 1024 / 1024:.1f}MB"
+        cols = ",".join(row["columns"])
+        if row["predicate"]:
+            cols += f" WHERE {row['predicate']}"
+        flags = f"  [{'; '.join(row['flags'])}]" if row["flags"] else ""
+        print(f"{row['table_name']:<28} {row['index_name']:<44} {row['idx_scan']:>10} {size:>10}  {cols}{flags}")
+
+
+if __name__ == "__main__":
+    main()
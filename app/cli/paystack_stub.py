@@ -0,0 +1,61 @@
+"""
+Minimal local stand-in for the Paystack API, for exercising deposits and
+reconciliation offline.
+
+    uvicorn app.cli.paystack_stub:app --port 9010
+
+Every reference verifies with STUB_VERIFY_STATUS (default "success") unless
+overridden with POST /_stub/transactions/{reference} {"status": "..."}.
+"""
+import os
+from uuid import uuid4
+
+from fastapi import FastAPI, HTTPException, Request
+
+app = FastAPI(title="Paystack stub")
+
+DEFAULT_STATUS = os.getenv("STUB_VERIFY_STATUS", "success")
+_transactions: dict[str, dict] = {}
+
+
+@app.post("/transaction/initialize")
+async def initialize(request: Request):
+    body = await request.json()
+    reference = body.get("reference") or uuid4().hex
+    _transactions.setdefault(reference, {"amount": body.get("amount", 0)})
+    return {
+        "status": True,
+        "message": "Authorization URL created",
+        "data": {
+            "authorization_url": f"http://stub.local/pay/{reference}",
+            "access_code": uuid4().hex[:12],
+            "reference": reference,
+        },
+    }
+
+
+@app.get("/transaction/verify/{reference}")
+async def verify(reference: str):
+    tx = _transactions.get(reference, {})
+    status = tx.get("status", DEFAULT_STATUS)
+    if status == "not_found":
+        raise HTTPException(status_code=400, detail={"status": False, "message": "Transaction reference not found"})
+    return {
+        "status": True,
+        "message": "Verification successful",
+        "data": {
+            "reference": reference,
+            "status": status,
+            "amount": tx.get("amount", 0),
+            "gateway_response": "Successful" if status == "success" else status.capitalize(),
+            "channel": "card",
+            "paid_at": None,
+        },
+    }
+
+
+@app.post("/_stub/transactions/{reference}")
+async def set_status(reference: str, request: Request):
+    body = await request.json()
+    _transactions.setdefault(reference, {}).update(body)
+    return {"status": True}
@@ -0,0 +1,66 @@
+"""
+Reconcile deposits stuck in PENDING (e.g. lost webhooks) against Paystack.
+
+    python -m app.cli.reconcile_deposits [--interval 300] [--min-age-minutes 30]
+
+Point PAYSTACK_BASE_URL at a local stub to exercise it offline:
+
+    uvicorn app.cli.paystack_stub:app --port 9010
+    PAYSTACK_BASE_URL=http://127.0.0.1:9010 python -m app.cli.reconcile_deposits
+"""
+import argparse
+import asyncio
+import json
+from datetime import timedelta
+
+from app.database.db import SessionLocal, init_engines
+from app.features.auth.models import user_model  # noqa: F401  (registers users table)
+from app.features.reconciliation.utils.reconcile_util import (
+    paystack_client,
+    reconcile_pending_deposits,
+)
+
+
+async def run_once(args) -> dict:
+    totals = {}
+    async with paystack_client() as client:
+        while True:
+            with SessionLocal() as db:
+                summary = await reconcile_pending_deposits(
+                    db,
+                    client,
+                    min_age=timedelta(minutes=args.min_age_minutes),
+                    give_up_after=timedelta(hours=args.give_up_hours),
+                    batch_size=args.batch_size,
+                    concurrency=args.concurrency,
+                )
+            for key, value in summary.items():
+                totals[key] = totals.get(key, 0) + value
+            resolved = summary["credited"] + summary["already_applied"] + summary["failed"] + summary["given_up"]
+            # a short batch means we reached the end; a full batch with
+            # nothing resolved would just return the same rows again
+            if summary["scanned"] < args.batch_size or not resolved:
+                return totals
+
+
+async def main_async(args):
+    while True:
+        print(json.dumps(await run_once(args)))
+        if not args.interval:
+            return
+        await asyncio.sleep(args.interval)
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", type=float, default=0, help="repeat every N seconds (0 = run once)")
+    parser.add_argument("--min-age-minutes", type=float, default=30)
+    parser.add_argument("--give-up-hours", type=float, default=24)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Replay Paystack webhook payloads in bulk (e.g. after a settlement outage).
+
+    python -m app.cli.replay_webhooks events.jsonl --batch-size 2000
+
+The input is JSON lines (one webhook payload per line) or a single JSON
+array. Each batch is applied and committed with apply_paystack_events, so
+re-running the same file is safe.
+"""
+import argparse
+import json
+import sys
+
+from app.database.db import SessionLocal, init_engines
+from app.features.auth.models import user_model  # noqa: F401  (registers users table)
+from app.features.wallet.utils.webhook_batch import apply_paystack_events
+
+
+def read_events(stream):
+    text = stream.read()
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        yield from json.loads(stripped)
+        return
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def replay(events, batch_size: int) -> dict:
+    totals = {}
+    batch = []
+
+    def flush():
+        with SessionLocal() as db:
+            summary = apply_paystack_events(db, batch)
+            db.commit()
+        for key, value in summary.items():
+            totals[key] = totals.get(key, 0) + value
+        batch.clear()
+
+    for event in events:
+        batch.append(event)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return totals
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="file with webhook payloads, or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.path == "-":
+        totals = replay(read_events(sys.stdin), args.batch_size)
+    else:
+        with open(args.path, encoding="utf-8") as fh:
+            totals = replay(read_events(fh), args.batch_size)
+    print(json.dumps(totals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Bring wallet_daily_rollups up to date from transactions, starting at the
+stored watermark (updated_at, id) of the last successful row folded in.
+Every (wallet, day) those rows touch is recounted from transactions and
+overwritten, so a rerun or a reset watermark never double counts.
+
+    python -m app.cli.rollup_catchup [--until 2026-10-01T00:00:00] [--interval 60]
+
+With WALLET_ROLLUP_MODE=job this is the only writer of the rollups. In the
+default incremental mode it stops at the start of the current UTC day,
+which live transfers are still writing to; run it once after the deploy
+day to backfill older history. Late credits to earlier days (deposits
+confirmed after midnight) take the same per-day lock as the recount.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, tuple_
+
+from app.core.settings import get_settings
+from app.database.db import SessionLocal, init_engines
+from app.features.auth.models import user_model  # noqa: F401  (registers users table)
+from app.features.reconciliation.utils.reconcile_util import load_checkpoint, save_checkpoint
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus
+from app.features.wallet.utils.rollup_util import rebuild_rollups, rollup_day
+
+CHECKPOINT_NAME = "wallet_rollups"
+# rows committed slightly late can carry an older updated_at; stay behind them
+SETTLE_DELAY = timedelta(minutes=1)
+
+
+def catch_up(until: datetime, batch_size: int) -> int:
+    processed = 0
+    while True:
+        with SessionLocal() as db:
+            checkpoint = load_checkpoint(db, CHECKPOINT_NAME)
+            query = (
+                select(Transaction.id, Transaction.wallet_id, Transaction.created_at, Transaction.updated_at)
+                .where(Transaction.status == TransactionStatus.SUCCESS, Transaction.updated_at <= until)
+                .order_by(Transaction.updated_at, Transaction.id)
+                .limit(batch_size)
+            )
+            if checkpoint:
+                query = query.where(tuple_(Transaction.updated_at, Transaction.id) > checkpoint)
+            rows = db.execute(query).all()
+            if not rows:
+                return processed
+
+            rebuild_rollups(db, {(row.wallet_id, rollup_day(row.created_at)) for row in rows})
+            save_checkpoint(db, CHECKPOINT_NAME, (rows[-1].updated_at, rows[-1].id))
+            db.commit()
+            processed += len(rows)
+
+
+def high_water_mark(until: datetime | None, mode: str, now: datetime) -> datetime:
+    """
+    Latest updated_at to fold in. Incremental mode stops at midnight, and
+    only once SETTLE_DELAY has passed since it: a transfer that started
+    before midnight writes the old day without taking the day lock, so the
+    recount waits for it to commit. Later credits to closed days lock them.
+    """
+    until = until or now - SETTLE_DELAY
+    if mode == "incremental":
+        until = min(until, (now - SETTLE_DELAY).replace(hour=0, minute=0, second=0, microsecond=0))
+    return until
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None,
+                        help="only fold in rows updated before this UTC time")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--interval", type=float, default=0, help="repeat every N seconds (0 = run once)")
+    args = parser.parse_args()
+
+    while True:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        until = high_water_mark(args.until, get_settings().wallet_rollup_mode, now)
+        print(f"folded {catch_up(until, args.batch_size)} transactions into rollups")
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
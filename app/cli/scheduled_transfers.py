@@ -0,0 +1,38 @@
+"""
+Run due scheduled transfers.
+
+    python -m app.cli.scheduled_transfers [--interval 5] [--batch-size 50]
+
+Several copies can run at once; each claims different rows (SKIP LOCKED).
+Each tick runs at most one batch, so a burst of due schedules drains at
+batch-size per interval instead of all at once.
+"""
+import argparse
+import json
+import time
+
+from app.database.db import SessionLocal, init_engines
+from app.features.auth.models import user_model  # noqa: F401  (registers users table)
+from app.features.scheduled_transfers.utils.scheduler_util import run_due_transfers
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", type=float, default=0, help="repeat every N seconds (0 = drain once)")
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    while True:
+        with SessionLocal() as db:
+            summary = run_due_transfers(db, args.batch_size)
+        print(json.dumps(summary))
+        if not args.interval:
+            if summary["claimed"] < args.batch_size:
+                break
+            continue
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Fill a database with synthetic users, wallets, transactions and API keys
+for performance testing.
+
+    python -m app.cli.seed --users 1000000 --transactions 20000000 --api-keys 50000
+    python -m app.cli.seed --create-schema      # SQLite / scratch DBs without migrations
+
+Traffic is skewed the way production is: a few hot merchant wallets receive
+a large share of transfers (--hot-wallets, --hot-share), and the rest
+follows a long tail where low-numbered users are far more active than the
+others. Transactions are spread over the last --days days in time order.
+Transfers never overdraw, and wallet balances match the generated history.
+
+Rows are written with multi-row INSERT ... VALUES batches. API keys are
+hashed with the cheap "test" argon2 profile; --keys-out writes the raw keys
+so load tests can authenticate with them. Afterwards run
+`WALLET_ROLLUP_MODE=job python -m app.cli.rollup_catchup` to build
+wallet_daily_rollups, including today's.
+"""
+import argparse
+import random
+import secrets
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, func, insert, select, text, update
+
+from app.core.ids import time_ordered_hex
+from app.core.settings import ARGON2_PROFILES
+from app.database.db import Base, SessionLocal, init_engines
+from app.features.api_keys.models.api_model import ApiKey, ALLOWED_PERMS
+from app.features.auth.models.user_model import User
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.wallet_model import Wallet
+
+# stays under PostgreSQL's 65535 and SQLite's 32766 bound-parameter limits
+MAX_PARAMS = 30000
+
+
+class Seeder:
+    def __init__(self, db, args):
+        self.db = db
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.user_pk_start = (db.scalar(select(func.max(User.id))) or 0) + 1
+        self.wallet_id_start = (db.scalar(select(func.max(Wallet.id))) or 0) + 1
+        self.balances = [0] * args.users
+
+    def _uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _insert(self, table, rows: list[dict]) -> None:
+        if not rows:
+            return
+        per_batch = max(1, min(self.args.batch_size, MAX_PARAMS // len(rows[0])))
+        for i in range(0, len(rows), per_batch):
+            self.db.execute(insert(table).values(rows[i:i + per_batch]))
+        self.db.commit()
+
+    def _user_id(self, n: int) -> str:
+        # deterministic per (seed, pk) so API keys can point back at their user
+        return str(uuid.UUID(int=(self.args.seed << 64) | (self.user_pk_start + n), version=4))
+
+    def users_and_wallets(self) -> None:
+        users, wallets = [], []
+        created = datetime.now(timezone.utc) - timedelta(days=self.args.days)
+        for n in range(self.args.users):
+            pk = self.user_pk_start + n
+            user_id = self._user_id(n)
+            users.append({
+                "user_id": user_id,
+                "id": pk,
+                "provider_sub": f"seed-{pk}",
+                "email": f"seed-{pk}@example.test",
+                "name": f"Seed User {pk}",
+                "is_active": True,
+                "created_at": created,
+            })
+            wallets.append({
+                "id": self.wallet_id_start + n,
+                "user_id": user_id,
+                "user_pk": pk,
+                "wallet_number": self._uuid().hex,
+                "balance": 0,
+                "shard_count": 0,
+            })
+            if len(users) >= 50_000:
+                self._insert(User.__table__, users)
+                self._insert(Wallet.__table__, wallets)
+                users, wallets = [], []
+        self._insert(User.__table__, users)
+        self._insert(Wallet.__table__, wallets)
+
+    def _pick_user(self) -> int:
+        # long tail: index = n * u^3 puts most activity on low-numbered users
+        return int(self.args.users * self.rng.random() ** 3)
+
+    def _pick_recipient(self, sender: int) -> int:
+        if self.args.hot_wallets and self.rng.random() < self.args.hot_share:
+            recipient = self.rng.randrange(min(self.args.hot_wallets, self.args.users))
+        else:
+            recipient = self._pick_user()
+        return recipient if recipient != sender else (recipient + 1) % self.args.users
+
+    def transactions(self) -> None:
+        args, rng = self.args, self.rng
+        start = datetime.utcnow() - timedelta(days=args.days)
+        step = timedelta(days=args.days) / max(1, args.transactions)
+        batch = []
+        n = 0
+        while n < args.transactions:
+            at = start + step * n
+            user = self._pick_user()
+            amount = int(rng.lognormvariate(8, 1.2)) + 1
+            wallet_id = self.wallet_id_start + user
+            if rng.random() < args.deposit_share or self.balances[user] < amount:
+                roll = rng.random()
+                status = (TransactionStatus.SUCCESS if roll < 0.9
+                          else TransactionStatus.FAILED if roll < 0.97
+                          else TransactionStatus.PENDING)
+                if status == TransactionStatus.SUCCESS:
+                    self.balances[user] += amount
+                batch.append(self._tx(wallet_id, TransactionType.DEPOSIT, status, amount, "dep_", None, at))
+                n += 1
+            else:
+                recipient = self._pick_recipient(user)
+                recipient_id = self.wallet_id_start + recipient
+                self.balances[user] -= amount
+                self.balances[recipient] += amount
+                batch.append(self._tx(wallet_id, TransactionType.TRANSFER_OUT, TransactionStatus.SUCCESS,
+                                      amount, "tr_out_", recipient_id, at))
+                batch.append(self._tx(recipient_id, TransactionType.TRANSFER_IN, TransactionStatus.SUCCESS,
+                                      amount, "tr_in_", wallet_id, at))
+                n += 2
+            if len(batch) >= 50_000:
+                self._insert(Transaction.__table__, batch)
+                batch = []
+                print(f"  transactions: {n}/{args.transactions}")
+        self._insert(Transaction.__table__, batch)
+
+    def _tx(self, wallet_id, tx_type, status, amount, prefix, counterparty, at) -> dict:
+        return {
+            "wallet_id": wallet_id,
+            "type": tx_type,
+            "status": status,
+            "amount": amount,
+            "reference": f"{prefix}{time_ordered_hex()}",
+            "counterparty_wallet_id": counterparty,
+            "created_at": at,
+            "updated_at": at,
+        }
+
+    def balances_to_wallets(self) -> None:
+        wallets = Wallet.__table__
+        stmt = update(wallets).where(wallets.c.id == bindparam("b_id")).values(balance=bindparam("b_balance"))
+        rows = [
+            {"b_id": self.wallet_id_start + user, "b_balance": balance}
+            for user, balance in enumerate(self.balances) if balance
+        ]
+        for i in range(0, len(rows), 50_000):
+            self.db.execute(stmt, rows[i:i + 50_000])
+        self.db.commit()
+
+    def api_keys(self) -> list[str]:
+        from passlib.hash import argon2
+        rounds, memory_cost, parallelism = ARGON2_PROFILES["test"]
+        hasher = argon2.using(rounds=rounds, memory_cost=memory_cost, parallelism=parallelism)
+
+        perms = sorted(ALLOWED_PERMS)
+        expires = datetime.now(timezone.utc) + timedelta(days=365)
+        rows, raw_keys = [], []
+        for _ in range(self.args.api_keys):
+            user = self._pick_user()
+            public_id = self._uuid().hex
+            secret = secrets.token_urlsafe(32)
+            rows.append({
+                "api_key": hasher.hash(secret),
+                "public_api_id": public_id,
+                "user_id": self._user_id(user),
+                "user_pk": self.user_pk_start + user,
+                "masked_key": f"sk_live_{public_id[:5]}_***{secret[-3:]}",
+                "name": "seed",
+                "permissions": self.rng.sample(perms, self.rng.randint(1, len(perms))),
+                "is_revoked": False,
+                "expires_at": expires,
+            })
+            raw_keys.append(f"sk_live_{public_id}_{secret}")
+        self._insert(ApiKey.__table__, rows)
+        return raw_keys
+
+    def fix_sequences(self) -> None:
+        # ids were assigned explicitly; move the generators past them
+        if self.db.get_bind().dialect.name != "postgresql":
+            return
+        for table, column in (("users", "id"), ("wallets", "id")):
+            self.db.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', '{column}'), "
+                f"(SELECT COALESCE(MAX({column}), 1) FROM {table}))"
+            ))
+        self.db.commit()
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--transactions", type=int, default=200_000)
+    parser.add_argument("--api-keys", type=int, default=1_000)
+    parser.add_argument("--days", type=int, default=180, help="spread transactions over this many days")
+    parser.add_argument("--hot-wallets", type=int, default=5, help="merchant wallets receiving a large share of transfers")
+    parser.add_argument("--hot-share", type=float, default=0.3)
+    parser.add_argument("--deposit-share", type=float, default=0.3)
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT statement (capped by parameter limits)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keys-out", help="write raw API keys here, one per line")
+    parser.add_argument("--create-schema", action="store_true", help="create missing tables first (no Alembic)")
+    args = parser.parse_args()
+    if args.users < 2:
+        raise SystemExit("--users must be at least 2")
+
+    with SessionLocal() as db:
+        if args.create_schema:
+            Base.metadata.create_all(db.get_bind())
+        seeder = Seeder(db, args)
+
+        started = time.perf_counter()
+        for label, step in (
+            ("users + wallets", seeder.users_and_wallets),
+            ("transactions", seeder.transactions),
+            ("wallet balances", seeder.balances_to_wallets),
+        ):
+            t = time.perf_counter()
+            step()
+            print(f"{label}: {time.perf_counter() - t:.1f}s")
+
+        t = time.perf_counter()
+        raw_keys = seeder.api_keys()
+        print(f"api keys: {time.perf_counter() - t:.1f}s")
+        seeder.fix_sequences()
+        print(f"done in {time.perf_counter() - started:.1f}s")
+
+    if args.keys_out:
+        with open(args.keys_out, "w") as fh:
+            fh.write("\n".join(raw_keys) + "\n")
+
+
+if __name__ == "__main__":
+    main()
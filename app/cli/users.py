@@ -0,0 +1,32 @@
+"""
+Activate or deactivate a user. Their JWTs and API keys are rejected on
+every worker as soon as the change commits.
+
+    python -m app.cli.users deactivate <email>
+    python -m app.cli.users activate <email>
+"""
+import argparse
+
+from app.database.db import SessionLocal, init_engines
+from app.features.auth.models.user_model import User
+from app.features.auth.utils.auth_cache import set_user_active
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["activate", "deactivate"])
+    parser.add_argument("email")
+    args = parser.parse_args()
+
+    with SessionLocal() as db:
+        user = db.query(User).filter(User.email == args.email).first()
+        if not user:
+            raise SystemExit(f"user {args.email} not found")
+        set_user_active(db, user, args.command == "activate")
+        db.commit()
+        print(f"{args.email}: is_active={user.is_active}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Manage sharded balances for hot receiving wallets.
+
+    python -m app.cli.wallet_shards enable <wallet_number> --shards 16
+    python -m app.cli.wallet_shards disable <wallet_number>
+    python -m app.cli.wallet_shards consolidate [--interval 30]
+"""
+import argparse
+import time
+
+from app.database.db import SessionLocal, init_engines
+from app.features.auth.models import user_model  # noqa: F401  (registers users table)
+from app.features.wallet.models.wallet_model import Wallet
+from app.features.wallet.utils.wallet_util import consolidate_wallet_shards, set_wallet_shards
+
+
+def _load_wallet(db, wallet_number: str) -> Wallet:
+    wallet = (
+        db.query(Wallet)
+        .filter(Wallet.wallet_number == wallet_number)
+        .with_for_update()
+        .first()
+    )
+    if not wallet:
+        raise SystemExit(f"wallet {wallet_number} not found")
+    return wallet
+
+
+def set_shards(wallet_number: str, shard_count: int) -> None:
+    with SessionLocal() as db:
+        wallet = _load_wallet(db, wallet_number)
+        set_wallet_shards(db, wallet, shard_count)
+        db.commit()
+        print(f"wallet {wallet_number}: shard_count={shard_count}")
+
+
+def consolidate_all() -> int:
+    """
+    Fold every sharded wallet's sub-balances into its main balance, one
+    short transaction per wallet so credits are blocked only briefly.
+    """
+    with SessionLocal() as db:
+        wallet_ids = [wid for (wid,) in db.query(Wallet.id).filter(Wallet.shard_count > 0)]
+
+    moved_total = 0
+    for wallet_id in wallet_ids:
+        with SessionLocal() as db:
+            wallet = db.query(Wallet).filter(Wallet.id == wallet_id).with_for_update().first()
+            moved_total += consolidate_wallet_shards(db, wallet)
+            db.commit()
+    return moved_total
+
+
+def main():
+    init_engines()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enable = sub.add_parser("enable")
+    enable.add_argument("wallet_number")
+    enable.add_argument("--shards", type=int, default=8)
+
+    disable = sub.add_parser("disable")
+    disable.add_argument("wallet_number")
+
+    consolidate = sub.add_parser("consolidate")
+    consolidate.add_argument("--interval", type=float, default=0,
+                             help="repeat every N seconds (0 = run once)")
+
+    args = parser.parse_args()
+
+    if args.command == "enable":
+        set_shards(args.wallet_number, args.shards)
+    elif args.command == "disable":
+        set_shards(args.wallet_number, 0)
+    else:
+        while True:
+            moved = consolidate_all()
+            print(f"consolidated {moved} into main balances")
+            if not args.interval:
+                break
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
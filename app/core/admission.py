@@ -0,0 +1,180 @@
+"""
+Admission control: per-worker concurrency limits by route class.
+
+Every HTTP request is put in one class:
+
+    webhook  Paystack webhooks
+    auth     /auth and /keys (Google calls, argon2 hashing)
+    write    other POST/PUT/PATCH/DELETE (deposits call Paystack, transfers lock rows)
+    read     other GETs
+
+Each class has its own limit on requests in flight and its own bounded
+queue, so a burst in one class cannot hold up the others: a deposit storm
+fills the "write" queue while webhooks and balance reads are admitted as
+usual. When the queue is full, or a request has waited
+ADMISSION_QUEUE_TIMEOUT_SECONDS, the request is answered at once with 503
+and Retry-After instead of piling up in memory.
+"""
+import asyncio
+from collections import deque
+
+from app.core.metrics import register_collector
+from app.core.settings import get_settings
+
+ROUTE_CLASSES = ("auth", "write", "read", "webhook")
+
+# cheap, no database or shared state, or parked without holding anything
+EXEMPT_PATHS = ("/metrics", "/", "/docs", "/openapi.json")
+EXEMPT_SUFFIXES = ("/status/wait",)
+
+
+def parse_admission_limit(value: str) -> tuple[int, int]:
+    """
+    Convert '16/64' into (max in flight, max queued).
+    """
+    try:
+        in_flight, queued = value.split("/", 1)
+        in_flight, queued = int(in_flight), int(queued)
+    except ValueError:
+        raise ValueError(f"Invalid admission limit: {value!r} (expected '<in-flight>/<queue>')")
+    if in_flight <= 0 or queued < 0:
+        raise ValueError(f"Invalid admission limit: {value!r}")
+    return in_flight, queued
+
+
+def classify(method: str, path: str) -> str | None:
+    """
+    Route class for a request, or None when it bypasses admission control.
+    """
+    if path in EXEMPT_PATHS or path.endswith(EXEMPT_SUFFIXES):
+        return None
+    if path.startswith("/wallet/paystack/webhook"):
+        return "webhook"
+    if path.startswith(("/auth/", "/keys")):
+        return "auth"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "read"
+    return "write"
+
+
+class AdmissionLimiter:
+    """
+    Concurrency limit with a bounded FIFO queue. Runs on the worker's event
+    loop only, so the counters need no lock. A finished request hands its
+    slot straight to the oldest waiter.
+    """
+
+    def __init__(self, name: str, max_in_flight: int, max_queued: int, queue_timeout: float):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queued:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if waiter.done() and not waiter.cancelled():
+                # the slot arrived as we gave up; pass it on
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            self.timed_out += 1
+            return False
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # in_flight is unchanged: the slot moves to the waiter
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def collect(self):
+        prefix = f"admission_{self.name}"
+        yield (f"{prefix}_in_flight", "gauge", f"{self.name} requests being served", self.in_flight)
+        yield (f"{prefix}_queued", "gauge", f"{self.name} requests waiting for a slot", self.queued)
+        yield (f"{prefix}_admitted_total", "counter", f"{self.name} requests admitted", self.admitted)
+        yield (f"{prefix}_rejected_total", "counter", f"{self.name} requests rejected with a full queue", self.rejected)
+        yield (f"{prefix}_timed_out_total", "counter", f"{self.name} requests rejected after waiting in the queue", self.timed_out)
+
+
+def build_limiters(settings) -> dict[str, AdmissionLimiter]:
+    return {
+        name: AdmissionLimiter(
+            name,
+            *parse_admission_limit(getattr(settings, f"admission_limit_{name}")),
+            queue_timeout=settings.admission_queue_timeout_seconds,
+        )
+        for name in ROUTE_CLASSES
+    }
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware applying the per-class limiters. The slot is held
+    until the response has been sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        settings = get_settings()
+        self.limiters = build_limiters(settings)
+        self.retry_after = str(settings.admission_retry_after_seconds)
+        for limiter in self.limiters.values():
+            register_collector(limiter.collect)
+
+    async def __call__(self, scope, receive, send):
+        route_class = classify(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        if not await limiter.acquire():
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def _reject(self, send) -> None:
+        body = b'{"detail":"Server busy, retry later"}'
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", self.retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
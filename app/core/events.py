@@ -0,0 +1,175 @@
+import logging
+import select
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+# Postgres caps NOTIFY payloads at 8000 bytes.
+MAX_PAYLOAD_BYTES = 7500
+
+
+class EventBus:
+    """
+    Small pub/sub between worker processes.
+
+    On PostgreSQL, publish() always issues pg_notify inside the caller's
+    transaction; Postgres only delivers it on commit. A listener thread in
+    every web worker (start()) receives it and runs the local subscribers.
+    Publishers that never call start(), such as the CLI jobs, still reach
+    every worker this way. Without Postgres (SQLite), publish() runs the
+    local subscribers right after the session commits, so a single process
+    still works. Subscribers run on the listener thread and must be
+    thread-safe.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self._connect_callbacks: list[Callable[[], None]] = []
+        self._listener: "_PgListener | None" = None
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]) -> None:
+        self._subscribers[channel].append(callback)
+        if self._listener is not None:
+            self._listener.listen(channel)
+
+    def on_connect(self, callback: Callable[[], None]) -> None:
+        """
+        Run `callback` each time the listener (re)connects. Notifications sent
+        while it was disconnected are lost, so caches should flush here.
+        """
+        self._connect_callbacks.append(callback)
+
+    def connected(self) -> None:
+        for callback in self._connect_callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("event bus connect callback failed")
+
+    def publish(self, db: Session, channel: str, payload: str) -> None:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+            return
+        self._queue_local(db, channel, payload)
+
+    def _queue_local(self, db: Session, channel: str, payload: str) -> None:
+        # held on the session until it commits; a rollback discards them
+        key = f"event_bus_pending_{id(self)}"
+        if key not in db.info:
+            event.listen(db, "after_commit", lambda session: self._dispatch_pending(session, key))
+            event.listen(db, "after_soft_rollback", lambda session, previous: self._discard_pending(session, previous, key))
+            db.info[key] = []
+        db.info[key].append((channel, payload))
+
+    @staticmethod
+    def _discard_pending(session: Session, previous, key: str) -> None:
+        # only the outermost transaction; a rolled-back savepoint keeps them
+        if previous.parent is None:
+            session.info[key].clear()
+
+    def _dispatch_pending(self, session: Session, key: str) -> None:
+        pending = list(session.info[key])
+        session.info[key].clear()
+        for channel, payload in pending:
+            self.dispatch(channel, payload)
+
+    def publish_many(self, db: Session, channel: str, items: list[str], sep: str = ",") -> None:
+        """
+        Publish `items` joined by `sep`, split across as few notifications as
+        the payload limit allows.
+        """
+        chunk, size = [], 0
+        for item in items:
+            if chunk and size + len(item) + 1 > MAX_PAYLOAD_BYTES:
+                self.publish(db, channel, sep.join(chunk))
+                chunk, size = [], 0
+            chunk.append(item)
+            size += len(item) + 1
+        if chunk:
+            self.publish(db, channel, sep.join(chunk))
+
+    def dispatch(self, channel: str, payload: str) -> None:
+        for callback in self._subscribers.get(channel, ()):
+            try:
+                callback(payload)
+            except Exception:
+                logger.exception("event subscriber for %s failed", channel)
+
+    def start(self, database_url: str) -> None:
+        if self._listener is not None or not database_url.startswith("postgresql"):
+            return
+        self._listener = _PgListener(database_url, self)
+        for channel in list(self._subscribers):
+            self._listener.listen(channel)
+        self._listener.start()
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+class _PgListener(threading.Thread):
+    """
+    Holds one dedicated connection in LISTEN mode and reconnects with backoff.
+    """
+
+    def __init__(self, database_url: str, bus: EventBus):
+        super().__init__(name="pg-listener", daemon=True)
+        self._engine = create_engine(database_url, poolclass=NullPool)
+        self._bus = bus
+        self._channels: set[str] = set()
+        self._listening: set[str] = set()
+        self._stopped = threading.Event()
+
+    def listen(self, channel: str) -> None:
+        self._channels.add(channel)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join(timeout=5)
+        self._engine.dispose()
+
+    def run(self) -> None:
+        backoff = 0.5
+        while not self._stopped.is_set():
+            try:
+                self._run_connection()
+                backoff = 0.5
+            except Exception:
+                logger.exception("pg listener connection failed; retrying in %.1fs", backoff)
+                self._stopped.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def _run_connection(self) -> None:
+        raw = self._engine.raw_connection()
+        try:
+            conn = raw.dbapi_connection
+            conn.autocommit = True
+            cursor = conn.cursor()
+            self._listening = set()
+            connected = False
+            while not self._stopped.is_set():
+                for channel in self._channels - self._listening:
+                    cursor.execute(f'LISTEN "{channel}"')
+                    self._listening.add(channel)
+                if not connected:
+                    self._bus.connected()
+                    connected = True
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    note = conn.notifies.pop(0)
+                    self._bus.dispatch(note.channel, note.payload)
+        finally:
+            raw.close()
+
+
+event_bus = EventBus()
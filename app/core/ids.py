@@ -0,0 +1,40 @@
+import os
+import threading
+import time
+import uuid
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+_COUNTER_MAX = 0xFFF
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): 48-bit unix milliseconds, a
+    12-bit counter that keeps ids from one process strictly increasing within
+    the same millisecond, then 62 random bits.
+
+    New ids sort after older ones, so inserts go to the right-hand edge of a
+    B-tree index instead of a random page.
+    """
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms, _counter = ms, 0
+        else:
+            # same millisecond (or the clock stepped back): keep counting
+            _counter += 1
+            if _counter > _COUNTER_MAX:
+                _last_ms, _counter = _last_ms + 1, 0
+        ms, counter = _last_ms, _counter
+    rand = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return uuid.UUID(int=(ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand)
+
+
+def time_ordered_hex() -> str:
+    """
+    32 lowercase hex chars, same shape as uuid4().hex.
+    """
+    return uuid7().hex
@@ -0,0 +1,23 @@
+from typing import Callable, Iterable
+
+# A collector returns (name, type, help, value) tuples; type is "counter" or "gauge".
+Sample = tuple[str, str, str, float]
+
+_collectors: list[Callable[[], Iterable[Sample]]] = []
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]) -> None:
+    _collectors.append(collector)
+
+
+def render_metrics() -> str:
+    """
+    Current values of all registered collectors in Prometheus text format.
+    """
+    lines = []
+    for collector in _collectors:
+        for name, kind, help_text, value in collector():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
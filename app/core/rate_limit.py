@@ -0,0 +1,170 @@
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+import time
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from app.core.settings import get_settings
+
+
+def parse_limit(value: str) -> Tuple[float, float]:
+    """
+    Convert '30/60' into (capacity, refill tokens per second).
+    """
+    try:
+        capacity, period = value.split("/", 1)
+        capacity, period = float(capacity), float(period)
+    except ValueError:
+        raise ValueError(f"Invalid rate limit: {value!r} (expected '<capacity>/<seconds>')")
+    if capacity <= 0 or period <= 0:
+        raise ValueError(f"Invalid rate limit: {value!r}")
+    return capacity, capacity / period
+
+
+def load_limits(settings) -> dict:
+    """
+    Per-permission (capacity, refill rate); limits are "<capacity>/<seconds>",
+    a bucket of `capacity` tokens that refills completely over `seconds`.
+    """
+    return {
+        "read": parse_limit(settings.rate_limit_read),
+        "deposit": parse_limit(settings.rate_limit_deposit),
+        "transfer": parse_limit(settings.rate_limit_transfer),
+    }
+
+
+class BucketStore(ABC):
+    """
+    Storage for token buckets. `take` consumes one token from the bucket at
+    `key` and returns (allowed, retry_after_seconds).
+    """
+
+    @abstractmethod
+    def take(self, key: str, capacity: float, refill_rate: float) -> Tuple[bool, float]:
+        ...
+
+
+class InMemoryBucketStore(BucketStore):
+    """
+    Per-process buckets. A bucket is a two-item list [tokens, last_refill],
+    so a check is one dict lookup and some float arithmetic under a lock.
+    Buckets are kept in last-use order; once `max_keys` is reached a new key
+    evicts the least recently used one, which is the one idle the longest.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_keys = max_keys
+
+    def take(self, key: str, capacity: float, refill_rate: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self._max_keys:
+                    self._buckets.popitem(last=False)
+                self._buckets[key] = [capacity - 1, now]
+                return True, 0.0
+
+            self._buckets.move_to_end(key)
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return True, 0.0
+            bucket[0] = tokens
+            return False, (1 - tokens) / refill_rate
+
+
+# Atomic refill-and-take executed inside Redis. Returns {allowed, retry_after_ms}.
+_REDIS_TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry = math.ceil((1 - tokens) / rate * 1000)
+end
+redis.call('HSET', KEYS[1], 't', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, retry}
+"""
+
+
+class RedisBucketStore(BucketStore):
+    """
+    Buckets shared by every worker/pod through Redis. Needs the `redis`
+    extra; selected by setting RATE_LIMIT_BACKEND_URL=redis://...
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_BACKEND_URL is set but redis is not installed (pip install '.[redis]')")
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE_SCRIPT)
+        self._prefix = prefix
+
+    def take(self, key: str, capacity: float, refill_rate: float) -> Tuple[bool, float]:
+        allowed, retry_ms = self._take(keys=[self._prefix + key], args=[capacity, refill_rate, time.time()])
+        return bool(allowed), retry_ms / 1000
+
+
+class RateLimiter:
+    def __init__(self, store: BucketStore, limits: dict):
+        self.store = store
+        self.limits = limits
+
+    def check(self, identity: str, permission: str) -> Tuple[bool, float]:
+        limit = self.limits.get(permission)
+        if limit is None:
+            return True, 0.0
+        capacity, refill_rate = limit
+        return self.store.take(f"{permission}:{identity}", capacity, refill_rate)
+
+
+def build_store(url: str | None) -> BucketStore:
+    if not url:
+        return InMemoryBucketStore()
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBucketStore(url)
+    raise ValueError(f"Unsupported RATE_LIMIT_BACKEND_URL: {url}")
+
+
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        settings = get_settings()
+        _limiter = RateLimiter(build_store(settings.rate_limit_backend_url), load_limits(settings))
+    return _limiter
+
+
+def enforce_rate_limit(principal, permission: str):
+    """
+    Consume one token for `principal` on `permission`, raising 429 with a
+    Retry-After header when the bucket is empty.
+    """
+    if not get_settings().rate_limit_enabled:
+        return
+    allowed, retry_after = get_rate_limiter().check(principal.rate_limit_key, permission)
+    if not allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
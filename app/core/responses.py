@@ -0,0 +1,62 @@
+import json
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_jsonable_python
+from app.core.settings import get_settings
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        # match pydantic's output for UTC datetimes
+        if value.tzinfo is not None and value.utcoffset() == timezone.utc.utcoffset(None):
+            text = text[:-6] + "Z"
+        return text
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when it is installed. Accepts plain
+    dicts/lists containing datetimes and enums, so routes can hand over rows
+    directly without building and re-validating pydantic models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+        return json.dumps(
+            content,
+            default=_default,
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+
+def default_response_class():
+    return FastJSONResponse if get_settings().fast_json_responses else JSONResponse
+
+
+def json_response(content: Any, status_code: int = 200) -> JSONResponse:
+    """
+    Response for routes that hand back plain rows: FastJSONResponse when
+    FAST_JSON_RESPONSES is on, otherwise the stock JSONResponse over
+    pydantic's encoding. Both render the same JSON.
+    """
+    if get_settings().fast_json_responses:
+        return FastJSONResponse(content, status_code=status_code)
+    return JSONResponse(to_jsonable_python(content), status_code=status_code)
@@ -0,0 +1,191 @@
+import os
+from functools import lru_cache
+from typing import Literal, Optional
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+_loaded = False
+
+
+def load_environment() -> None:
+    """
+    Read .env into the process environment. Safe to call repeatedly; only
+    the first call touches the filesystem.
+    """
+    global _loaded
+    if not _loaded:
+        load_dotenv()
+        _loaded = True
+
+
+def env(name: str, default: str | None = None) -> str | None:
+    load_environment()
+    return os.getenv(name, default)
+
+
+# argon2 cost profiles for API key hashing: (rounds, memory_cost KiB, parallelism)
+ARGON2_PROFILES = {
+    "production": (3, 102400, 8),
+    # cheap enough for test suites and synthetic data seeding
+    "test": (1, 1024, 1),
+}
+
+
+class Settings(BaseModel):
+    """
+    All configuration, read from the environment (variable name = field name
+    upper-cased) once per process. Invalid values fail at startup.
+    """
+
+    # database
+    database_url: str
+    read_database_url: Optional[str] = None
+    db_pool_size: int = Field(5, ge=1)
+    db_max_overflow: int = Field(10, ge=0)
+    db_pool_timeout: float = Field(30, gt=0)
+    db_pool_recycle: int = Field(1800, ge=-1)
+    # total connection budget for all worker processes of one container;
+    # when set, each worker's pool is capped at its share
+    db_max_connections: Optional[int] = Field(None, ge=1)
+    web_concurrency: int = Field(1, ge=1)
+    replica_max_lag_seconds: float = Field(5, ge=0)
+    replica_lag_check_interval: float = Field(2, gt=0)
+    read_your_writes_seconds: float = Field(10, ge=0)
+
+    # auth
+    jwt_secret_key: str = Field(min_length=1)
+    jwt_algorithm: str = "HS256"
+    jwt_expires_minutes: int = Field(60, gt=0)
+    google_client_id: Optional[str] = None
+    google_client_secret: Optional[str] = None
+    google_redirect_uri: Optional[str] = None
+    argon2_profile: Literal["production", "test"] = "production"
+    auth_cache_ttl_seconds: float = Field(60, ge=0)
+    # processes hashing keys for POST /keys/bulk, per gunicorn worker
+    key_hash_workers: int = Field(2, ge=1)
+    # argon2 verifies of not-yet-cached API keys running at once, per worker
+    key_verify_concurrency: int = Field(2, ge=1)
+
+    # caches
+    wallet_number_cache_size: int = Field(10000, ge=0)
+
+    # outbound calls
+    paystack_secret_key: str = ""
+    paystack_base_url: str = "https://api.paystack.co"
+    paystack_callback_url: Optional[str] = None
+    paystack_timeout_seconds: float = Field(30, gt=0)
+    google_timeout_seconds: float = Field(10, gt=0)
+
+    # rate limiting ("<capacity>/<seconds>")
+    rate_limit_enabled: bool = True
+    rate_limit_read: str = "120/60"
+    rate_limit_deposit: str = "20/60"
+    rate_limit_transfer: str = "30/60"
+    rate_limit_backend_url: Optional[str] = None
+
+    # admission control per route class ("<in-flight>/<queue>", per worker)
+    admission_control_enabled: bool = True
+    admission_limit_auth: str = "4/32"
+    admission_limit_write: str = "16/64"
+    admission_limit_read: str = "32/128"
+    admission_limit_webhook: str = "8/64"
+    admission_queue_timeout_seconds: float = Field(2, gt=0)
+    admission_retry_after_seconds: int = Field(1, ge=0)
+
+    # responses / storage
+    fast_json_responses: bool = False
+    transaction_meta_policy: Literal["compact", "full"] = "compact"
+    transaction_meta_fields: tuple[str, ...] = ("authorization_url", "gateway_response", "channel", "paid_at")
+    # "incremental": rollups updated in the same transaction as each credit/debit
+    # "job": only app.cli.rollup_catchup writes them
+    wallet_rollup_mode: Literal["incremental", "job"] = "incremental"
+    # /wallet/transactions/search counts exactly up to this many matches,
+    # then reports the planner's estimate
+    transaction_search_exact_count_limit: int = Field(1000, ge=0)
+    # scheduled transfers are pushed back by a random 0..N seconds at creation
+    scheduled_transfer_jitter_seconds: int = Field(300, ge=0)
+
+    # tracing ("none" | "console" | "file"); needs the `tracing` extra
+    tracing_exporter: Literal["none", "console", "file"] = "none"
+    tracing_file: str = "traces-{pid}.jsonl"
+    tracing_sample_ratio: float = Field(1.0, ge=0, le=1)
+    tracing_service_name: str = "hng-wallet"
+
+    @field_validator("rate_limit_read", "rate_limit_deposit", "rate_limit_transfer")
+    def validate_rate_limit(cls, value):
+        from app.core.rate_limit import parse_limit
+        parse_limit(value)
+        return value
+
+    @field_validator("admission_limit_auth", "admission_limit_write", "admission_limit_read", "admission_limit_webhook")
+    def validate_admission_limit(cls, value):
+        from app.core.admission import parse_admission_limit
+        parse_admission_limit(value)
+        return value
+
+    @field_validator("transaction_meta_fields", mode="before")
+    def split_fields(cls, value):
+        if isinstance(value, str):
+            return tuple(f.strip() for f in value.split(",") if f.strip())
+        return value
+
+    @field_validator("transaction_meta_policy", "argon2_profile", "wallet_rollup_mode", "tracing_exporter", mode="before")
+    def lower(cls, value):
+        return value.lower() if isinstance(value, str) else value
+
+    @model_validator(mode="after")
+    def check_connection_budget(self):
+        if self.db_max_connections is not None:
+            needed = self.web_concurrency * (self.listener_connections + (2 if self.read_database_url else 1))
+            if self.db_max_connections < needed:
+                raise ValueError(
+                    f"DB_MAX_CONNECTIONS={self.db_max_connections} is below the {needed} connections "
+                    f"{self.web_concurrency} worker(s) need at minimum"
+                )
+        return self
+
+    @property
+    def listener_connections(self) -> int:
+        """
+        Connections each worker holds outside its pools: the event bus
+        LISTEN connection (app/core/events.py), PostgreSQL only.
+        """
+        return 1 if self.database_url.startswith("postgresql") else 0
+
+    def pool_limits(self, replica: bool = False) -> tuple[int, int]:
+        """
+        (pool_size, max_overflow) for one worker's primary or replica engine.
+        With DB_MAX_CONNECTIONS, a worker's share covers its LISTEN
+        connection and both pools, so the container never exceeds it.
+        """
+        if self.db_max_connections is None:
+            return self.db_pool_size, self.db_max_overflow
+        share = self.db_max_connections // self.web_concurrency - self.listener_connections
+        if self.read_database_url:
+            # the primary takes the odd connection
+            share = share // 2 if replica else share - share // 2
+        pool_size = min(self.db_pool_size, share)
+        return pool_size, share - pool_size
+
+    @property
+    def argon2_params(self) -> tuple[int, int, int]:
+        return ARGON2_PROFILES[self.argon2_profile]
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        load_environment()
+        values = {}
+        for name in cls.model_fields:
+            raw = os.getenv(name.upper())
+            if raw is not None and raw != "":
+                values[name] = raw
+        return cls(**values)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    The process-wide settings. Also usable as a FastAPI dependency.
+    """
+    return Settings.from_env()
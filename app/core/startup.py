@@ -0,0 +1,44 @@
+import importlib
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Records wall time and newly imported module count for each startup step.
+    Disabled profilers still run the steps, they just don't record them.
+
+    For a per-module breakdown of a single slow step, use
+    `python -X importtime main.py --profile-startup`.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.steps: list[tuple[str, float, int]] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        modules_before = len(sys.modules)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((name, time.perf_counter() - started, len(sys.modules) - modules_before))
+
+    def import_module(self, dotted: str):
+        with self.step(f"import {dotted}"):
+            return importlib.import_module(dotted)
+
+    def report(self, stream=None) -> None:
+        stream = stream or sys.stderr
+        total = time.perf_counter() - self._started
+        width = max((len(name) for name, _, _ in self.steps), default=10)
+        print(f"{'step':<{width}}  {'ms':>9}  {'modules':>7}", file=stream)
+        for name, seconds, modules in sorted(self.steps, key=lambda s: s[1], reverse=True):
+            print(f"{name:<{width}}  {seconds * 1000:9.1f}  {modules:7d}", file=stream)
+        print(f"{'total since profiler start':<{width}}  {total * 1000:9.1f}  {len(sys.modules):7d}", file=stream)
@@ -0,0 +1,203 @@
+"""
+OpenTelemetry tracing. Needs the optional `tracing` extra
+(opentelemetry-api + opentelemetry-sdk) when TRACING_EXPORTER is not "none".
+
+Each request gets a server span (TracingMiddleware). Inside it:
+- the auth dependency (`traced`);
+- every SQL statement (SQLAlchemy engine events);
+- every outbound HTTP call made through `http_client` (TracingTransport).
+
+Spans are written as OTLP-style JSON, one per line, to stdout ("console")
+or to TRACING_FILE ("file"). The file name may contain {pid}, since each
+worker process writes its own file.
+"""
+import functools
+import os
+import sys
+from contextlib import nullcontext
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.settings import get_settings
+
+_tracer = None
+
+
+def tracing_configured() -> bool:
+    return get_settings().tracing_exporter != "none"
+
+
+def init_tracing() -> None:
+    """
+    Set up the tracer provider for this process. Call once per worker, after
+    fork (the lifespan does this); a no-op when tracing is off.
+    """
+    global _tracer
+    settings = get_settings()
+    if _tracer is not None or settings.tracing_exporter == "none":
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        raise RuntimeError("TRACING_EXPORTER is set but opentelemetry-sdk is not installed (pip install '.[tracing]')")
+
+    if settings.tracing_exporter == "file":
+        out = open(settings.tracing_file.format(pid=os.getpid()), "a", buffering=1)
+    else:
+        out = sys.stdout
+    exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("hng-wallet")
+    _instrument_sqlalchemy()
+
+
+def shutdown_tracing() -> None:
+    global _tracer
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+    trace.get_tracer_provider().shutdown()
+    _tracer = None
+
+
+def span(name: str, **attributes):
+    """
+    Context manager for a child span of the current one; free when tracing
+    is off.
+    """
+    if _tracer is None:
+        return nullcontext()
+    return _tracer.start_as_current_span(name, attributes=attributes or None)
+
+
+def traced(name: str):
+    """
+    Decorator version of `span` for async functions. functools.wraps keeps
+    the signature, so it is safe on FastAPI dependencies.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return await fn(*args, **kwargs)
+            with _tracer.start_as_current_span(name):
+                return await fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware opening the server span for each HTTP request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        name = f"{scope['method']} {scope['path']}"
+        with _tracer.start_as_current_span(name, kind=SpanKind.SERVER) as server_span:
+            server_span.set_attribute("http.method", scope["method"])
+            server_span.set_attribute("http.target", scope["path"])
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    server_span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        server_span.set_status(Status(StatusCode.ERROR))
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+def _instrument_sqlalchemy() -> None:
+    # statements are cut short: attribute size matters at high QPS
+    max_len = 500
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if _tracer is None or context is None:
+            return
+        db_span = _tracer.start_span(
+            "db.query",
+            attributes={
+                "db.system": conn.dialect.name,
+                "db.statement": statement[:max_len],
+                "db.executemany": executemany,
+            },
+        )
+        context._trace_span = db_span
+
+    @event.listens_for(Engine, "after_cursor_execute")
+    def _end(conn, cursor, statement, parameters, context, executemany):
+        db_span = getattr(context, "_trace_span", None)
+        if db_span is not None:
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                db_span.set_attribute("db.rowcount", cursor.rowcount)
+            db_span.end()
+            context._trace_span = None
+
+    @event.listens_for(Engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        db_span = getattr(context, "_trace_span", None)
+        if db_span is not None:
+            from opentelemetry.trace import Status, StatusCode
+            db_span.set_status(Status(StatusCode.ERROR, str(exception_context.original_exception)[:200]))
+            db_span.end()
+            context._trace_span = None
+
+
+class TracingTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps an httpx transport with a client span per request.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self._transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if _tracer is None:
+            return await self._transport.handle_async_request(request)
+
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        with _tracer.start_as_current_span(f"HTTP {request.method} {request.url.host}", kind=SpanKind.CLIENT) as client_span:
+            client_span.set_attribute("http.method", request.method)
+            # no query string: it may carry secrets
+            client_span.set_attribute("http.url", f"{request.url.scheme}://{request.url.host}{request.url.path}")
+            response = await self._transport.handle_async_request(request)
+            client_span.set_attribute("http.status_code", response.status_code)
+            if response.status_code >= 500:
+                client_span.set_status(Status(StatusCode.ERROR))
+            return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    httpx.AsyncClient whose requests are traced when tracing is on.
+    """
+    if tracing_configured():
+        kwargs.setdefault("transport", TracingTransport())
+    return httpx.AsyncClient(**kwargs)
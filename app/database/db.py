@@ -1,28 +1,207 @@
-import os
-from sqlalchemy import create_engine
+import threading
+import time
+from collections import OrderedDict
+from math import ceil
+from fastapi import Request, Response
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from dotenv import load_dotenv
+from app.core.settings import get_settings
 
 
-load_dotenv()
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-
 class Base(DeclarativeBase):
     pass
 
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+# Engines are created by init_engines() (FastAPI lifespan, CLI entry points)
+# rather than at import, so importing the app stays cheap and forked
+# workers never inherit a connection pool.
+engine = None
+read_engine = None
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
-    bind=engine,
 )
 
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+)
+
+
+def _create_engine(url: str, settings, replica: bool = False):
+    options = {"echo": False, "future": True, "pool_pre_ping": True}
+    if not url.startswith("sqlite"):
+        pool_size, max_overflow = settings.pool_limits(replica)
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return create_engine(url, **options)
+
+
+def init_engines():
+    global engine, read_engine
+    if engine is not None:
+        return engine
+    settings = get_settings()
+    engine = _create_engine(settings.database_url, settings)
+    read_engine = _create_engine(settings.read_database_url, settings, replica=True) if settings.read_database_url else None
+    SessionLocal.configure(bind=engine)
+    ReadSessionLocal.configure(bind=read_engine if read_engine is not None else engine)
+    return engine
+
+
+def dispose_engines():
+    global engine, read_engine
+    for eng in (engine, read_engine):
+        if eng is not None:
+            eng.dispose()
+    engine = None
+    read_engine = None
+
 
 def get_db():
+    if engine is None:
+        init_engines()
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# A replica that has replayed everything it received is current however old
+# its last replayed commit is; the timestamp alone would report an idle
+# primary as lag. Only when replay trails receipt is the timestamp used.
+_REPLAY_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+class ReplicaHealth:
+    """
+    Caches the replica's replay lag so it is measured at most once per
+    replica_lag_check_interval rather than on every read request.
+    """
+
+    def __init__(self):
+        self._checked_at = 0.0
+        self._healthy = True
+        self._lock = threading.Lock()
+        # seconds, from the last successful measurement
+        self.lag = 0.0
+
+    def is_healthy(self) -> bool:
+        interval = get_settings().replica_lag_check_interval
+        now = time.monotonic()
+        if now - self._checked_at < interval:
+            return self._healthy
+        with self._lock:
+            if now - self._checked_at >= interval:
+                self._healthy = self._measure()
+                self._checked_at = now
+        return self._healthy
+
+    def _measure(self) -> bool:
+        try:
+            with read_engine.connect() as conn:
+                lag = conn.execute(text(_REPLAY_LAG_SQL)).scalar()
+        except Exception:
+            return False
+        if lag is None:
+            return False
+        self.lag = float(lag)
+        return self.lag <= get_settings().replica_max_lag_seconds
+
+
+replica_health = ReplicaHealth()
+
+# Last primary write per user (wall clock, so it compares with the value a
+# client carries back from another worker). LRU-bounded; entries older than
+# read_your_writes_seconds are dropped when looked up.
+_recent_writes: OrderedDict[str, float] = OrderedDict()
+_recent_writes_lock = threading.Lock()
+_RECENT_WRITES_MAX = 10_000
+
+LAST_WRITE_COOKIE = "last_write_at"
+LAST_WRITE_HEADER = "x-last-write-at"
+
+
+def mark_primary_write(user_id: str, response: Response | None = None) -> None:
+    """
+    Record that `user_id` just wrote to the primary so their next reads are
+    served from the primary until the replica has caught up. With
+    `response`, the write time also goes back to the client as a cookie and
+    an X-Last-Write-At header, so whichever worker gets their next read
+    applies the same check.
+    """
+    if read_engine is None:
+        return
+    now = time.time()
+    if user_id:
+        with _recent_writes_lock:
+            _recent_writes[user_id] = now
+            _recent_writes.move_to_end(user_id)
+            while len(_recent_writes) > _RECENT_WRITES_MAX:
+                _recent_writes.popitem(last=False)
+    if response is not None:
+        value = f"{now:.3f}"
+        response.headers[LAST_WRITE_HEADER] = value
+        response.set_cookie(
+            LAST_WRITE_COOKIE, value,
+            max_age=ceil(get_settings().read_your_writes_seconds), httponly=True, samesite="lax",
+        )
+
+
+def _client_write_at(request: Request) -> float | None:
+    raw = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+    try:
+        return float(raw) if raw else None
+    except ValueError:
+        return None
+
+
+def _is_sticky(user_id: str | None, client_write_at: float | None = None) -> bool:
+    """
+    True while the caller's last write may not have reached the replica:
+    for the replica's measured lag plus one check interval (the measurement
+    can be that old), capped at read_your_writes_seconds.
+    """
+    settings = get_settings()
+    now = time.time()
+    local = None
+    if user_id:
+        with _recent_writes_lock:
+            local = _recent_writes.get(user_id)
+            if local is not None and now - local > settings.read_your_writes_seconds:
+                del _recent_writes[user_id]
+                local = None
+    window = min(settings.read_your_writes_seconds, replica_health.lag + settings.replica_lag_check_interval)
+    # abs(): another pod's clock may run slightly ahead; far-off values are ignored
+    return any(abs(now - written) <= window for written in (local, client_write_at) if written is not None)
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only endpoints. Uses the replica when one is configured
+    and healthy, unless the caller (request.state.user_id, set by the auth
+    dependency, or the last-write time the client sent back) wrote recently.
+    Declare it after the auth dependency so the user is already known.
+    """
+    if engine is None:
+        init_engines()
+    use_replica = (
+        read_engine is not None
+        and replica_health.is_healthy()
+        and not _is_sticky(getattr(request.state, "user_id", None), _client_write_at(request))
+    )
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
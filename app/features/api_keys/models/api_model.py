@@ -1,16 +1,35 @@
-from sqlalchemy import Column, String, Boolean, DateTime, func, ForeignKey, Enum, JSON, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey, Enum, JSON, CheckConstraint
 from app.database.db import Base
 from uuid import uuid4
 
 ALLOWED_PERMS = {"deposit", "transfer", "read"}
 
+# one bit per permission, so a key's permissions are a single int
+PERMISSION_BITS = {"deposit": 1, "transfer": 2, "read": 4}
+ALL_PERMISSIONS = sum(PERMISSION_BITS.values())
+
+
+def permission_mask(permissions) -> int:
+    """
+    Bitmask for a JSON list or comma-separated string of permission names;
+    unknown names are ignored.
+    """
+    if isinstance(permissions, str):
+        permissions = permissions.split(",")
+    mask = 0
+    for name in permissions or ():
+        if name:
+            mask |= PERMISSION_BITS.get(name.strip(), 0)
+    return mask
+
 class ApiKey(Base):
     __tablename__ = "api_keys"
 
-    api_key = Column(String(200), primary_key=True, index=True) 
+    api_key = Column(String(200), primary_key=True)
     public_api_id = Column(String(50), unique=True, index=True, default=lambda: str(uuid4()))
-    user_id = Column(String(50), ForeignKey("users.user_id"), index=True, nullable=False)
-    masked_key = Column(String(50), index=True, nullable=False)
+    user_id = Column(String(50), ForeignKey("users.user_id"), nullable=False)
+    user_pk = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    masked_key = Column(String(50), nullable=False)
     name = Column(String(100), nullable=False)
     permissions = Column(JSON, nullable=False)
     is_revoked = Column(Boolean, default=False, nullable=False)
@@ -4,23 +4,30 @@ from datetime import datetime, timezone
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from app.features.api_keys.schemas.api_schema import (
+    ApiKeyBulkRequest,
     ApiKeyCreate, 
+    ApiKeyIssued,
     ApiKeyRequest, 
     ApiKeyResponse,
     ApiKeyRollOver, 
     ApiKeyUserResponse
     
 )
-from app.database.db import get_db
+from app.database.db import get_db, get_read_db
+from app.core.responses import json_response
 from app.features.auth.utils.jwt_token import get_current_user
 from app.features.api_keys.models.api_model import ApiKey
 from app.features.api_keys.utils.api_util import(
     list_user_active_keys,
     create_new_api,
-    verify_secret_hashes
+    issue_api_keys,
+    verify_secret_hashes,
+    serialize_user_keys
 )
 
 from app.features.api_keys.utils.security import (hash_key, verify_key)
+from app.features.auth.utils.auth_cache import publish_key_invalidation
+from app.features.auth.dependencies import require_active_user
 
 
 router = APIRouter(prefix="/keys", tags=["APIKeys"])
@@ -44,23 +51,40 @@ def create_api_key(
         expires_at=api_key.expires_at
     )
 
+@router.post("/bulk", response_model=List[ApiKeyIssued], status_code=status.HTTP_201_CREATED)
+def create_api_keys_bulk(
+    payload: ApiKeyBulkRequest,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Issue up to 5 keys in one call. The raw keys are only returned here.
+    A plain def: FastAPI runs it in the threadpool, off the event loop,
+    while it waits on the database and the hashing pool.
+    """
+    return issue_api_keys(db, current_user, payload.keys)
+
 @router.get("/", response_model=List[ApiKeyUserResponse])
 def list_user_keys(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
-    user_id = current_user.user_id
-    keys = db.query(ApiKey).filter(ApiKey.user_id == user_id).all()
+    user_pk = require_active_user(db, current_user.user_id)
+    keys = (
+        db.query(ApiKey.masked_key, ApiKey.is_revoked, ApiKey.expires_at, ApiKey.name, ApiKey.permissions)
+        .filter(ApiKey.user_pk == user_pk)
+        .all()
+    )
 
-    return keys
+    return json_response(serialize_user_keys(keys))
 
 @router.get("/active", response_model=List[ApiKeyUserResponse])
 def list_active_keys(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user=Depends(get_current_user),
 ):
     
-    return list_user_active_keys(db, current_user)
+    return json_response(serialize_user_keys(list_user_active_keys(db, current_user)))
 
 @router.post("/{api_key}/revoke", status_code=status.HTTP_200_OK)
 def revoke_key(
@@ -71,6 +95,7 @@ def revoke_key(
     db_api_key = verify_secret_hashes(api_key, current_user, db)
     
     db_api_key.is_revoked = True
+    publish_key_invalidation(db, db_api_key.public_api_id)
     db.commit()
     return {
         "message" : f"{api_key} successfully revoked"
@@ -90,6 +115,8 @@ def rollover_expired_key(
     if db_api_key.expires_at is None or db_api_key.expires_at > now:
         raise HTTPException(status_code=400, detail="Key is still active; revoke or wait for expiry before rollover")
     
+    # drop the expired key from worker caches along with the new key's commit
+    publish_key_invalidation(db, db_api_key.public_api_id)
     api_details = create_new_api(db, current_user, db_api_key, payload.expiry)
 
     api_key = api_details.get("api_key")
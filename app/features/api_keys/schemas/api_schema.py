@@ -37,6 +37,7 @@ class ApiKeyCreate(ApiKeyRequest):
     api_key : str
     masked_key : str
     user_id : str
+    user_pk : int
     public_api_id : str
     expires_at : datetime
     
@@ -45,6 +46,12 @@ class ApiKeyResponse(BaseModel):
     api_key : str
     expires_at : datetime
 
+class ApiKeyBulkRequest(BaseModel):
+    keys: list[ApiKeyRequest] = Field(min_length=1, max_length=5)
+
+class ApiKeyIssued(ApiKeyResponse):
+    name : str
+
 class ApiKeyUserResponse(BaseModel):
     api_key: str = Field(..., alias="masked_key")
     is_active: bool = Field(..., alias="is_revoked")
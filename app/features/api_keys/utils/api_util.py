@@ -1,12 +1,17 @@
-from sqlalchemy import or_
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import load_only
 import re, secrets
 from datetime import datetime, timezone, timedelta
 from dateutil.relativedelta import relativedelta
-from app.features.api_keys.utils.security import hash_key, verify_key
+from app.features.api_keys.utils.security import hash_key, hash_keys, verify_key
+from app.features.auth.models.user_model import User
 from app.features.api_keys.models.api_model import ApiKey
 from uuid import uuid4
 from fastapi import HTTPException, status
 from app.features.api_keys.schemas.api_schema import ApiKeyCreate, ApiKeyRequest
+from app.features.auth.dependencies import require_active_user
+
+MAX_ACTIVE_KEYS = 5
 
 def parse_duration_to_utc(offset_str: str) -> datetime:
     """
@@ -55,26 +60,31 @@ def is_expired(expiry_dt: datetime) -> bool:
 
 
 
-def generate_secure_key():
+def generate_key_material():
     raw_key = secrets.token_urlsafe(32)
-    hashed_key = hash_key(raw_key)
     public_id = uuid4().hex
     masked_key = f"sk_live_{public_id[:5]}_***{raw_key[-3:]}"
     return {
         "raw_key": raw_key,
-        "hashed_key": hashed_key,
         "masked_key": masked_key,
         "public_id" : public_id
     }
 
 
+def generate_secure_key():
+    generated = generate_key_material()
+    generated["hashed_key"] = hash_key(generated["raw_key"])
+    return generated
+
+
 def list_user_active_keys(db,current_user):
-    user_id = current_user.user_id
+    user_pk = require_active_user(db, current_user.user_id)
     now = datetime.now(timezone.utc)
     keys = (
         db.query(ApiKey)
+        .options(load_only(ApiKey.masked_key, ApiKey.is_revoked, ApiKey.expires_at, ApiKey.name, ApiKey.permissions))
         .filter(
-            ApiKey.user_id == user_id,
+            ApiKey.user_pk == user_pk,
             ApiKey.is_revoked.is_(False),
             or_(ApiKey.expires_at.is_(None), ApiKey.expires_at > now),
         )
@@ -82,10 +92,30 @@ def list_user_active_keys(db,current_user):
     )
     return keys
 
+def count_active_keys(db, user_pk: int) -> int:
+    now = datetime.now(timezone.utc)
+    return db.query(func.count(ApiKey.public_api_id)).filter(
+        ApiKey.user_pk == user_pk,
+        ApiKey.is_revoked.is_(False),
+        or_(ApiKey.expires_at.is_(None), ApiKey.expires_at > now),
+    ).scalar()
+
+
+def _check_key_limit(db, user_pk: int, requested: int) -> None:
+    active_keys = count_active_keys(db, user_pk)
+    if active_keys + requested > MAX_ACTIVE_KEYS:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Limit of {MAX_ACTIVE_KEYS} active keys reached ({active_keys} active, {requested} requested)",
+        )
+
+
 def create_new_api(db, current_user, payload: ApiKeyRequest, expires = None):
-    active_keys = len(list_user_active_keys(db, current_user))
+    user_pk = require_active_user(db, current_user.user_id)
+    active_keys = count_active_keys(db, user_pk)
     
-    if active_keys >= 5:
+    if active_keys >= MAX_ACTIVE_KEYS:
         raise HTTPException(status_code= status.HTTP_409_CONFLICT, detail="Limit of 5 active keys reached")
     
     generated_key = generate_secure_key()
@@ -99,6 +129,7 @@ def create_new_api(db, current_user, payload: ApiKeyRequest, expires = None):
             masked_key = generated_key.get("masked_key"),
             public_api_id = generated_key.get("public_id"),
             user_id=current_user.user_id,
+            user_pk=user_pk,
             name = payload.name,
             permissions=payload.permissions,
             expires_at=expires_at
@@ -123,10 +154,10 @@ def verify_secret_hashes(api_key, current_user, db):
     public_key = split_value[2]
     secret_key = split_value[3]
     
-    user_id = current_user.user_id
+    user_pk = require_active_user(db, current_user.user_id)
     api_key = (
         db.query(ApiKey).filter(
-            ApiKey.user_id == user_id,
+            ApiKey.user_pk == user_pk,
             ApiKey.public_api_id == public_key
             ).first()
     )
@@ -139,4 +170,66 @@ def verify_secret_hashes(api_key, current_user, db):
     if not is_verified:
         raise HTTPException(status_code=404, detail="API key not found")
     
-    return api_key
\ No newline at end of file
+    return api_key
+
+
+def serialize_user_keys(keys):
+    """
+    Render keys exactly as ApiKeyUserResponse would (by alias) without
+    building a model per row.
+    """
+    return [
+        {
+            "masked_key": key.masked_key,
+            "is_revoked": key.is_revoked,
+            "expires_at": key.expires_at,
+            "name": key.name,
+            "permissions": list(key.permissions),
+        }
+        for key in keys
+    ]
+
+
+def issue_api_keys(db, current_user, payloads: list[ApiKeyRequest]) -> list[dict]:
+    """
+    Create several keys in one transaction: one count against the
+    active-key limit, argon2 hashing in parallel on the process pool, and a
+    single multi-row INSERT. Returns the raw keys; they are not stored.
+
+    Hashing happens before the per-user lock is taken and with no
+    transaction open, so the lock is only held for the recount and insert.
+    """
+    user_pk = require_active_user(db, current_user.user_id)
+    # fail fast before spending argon2 time; rechecked under the lock below
+    _check_key_limit(db, user_pk, len(payloads))
+    db.commit()
+
+    generated = [generate_key_material() for _ in payloads]
+    hashes = hash_keys([g["raw_key"] for g in generated])
+
+    # serialise key issuance per user so concurrent calls can't both pass the limit
+    db.query(User.id).filter(User.id == user_pk).with_for_update().one()
+    _check_key_limit(db, user_pk, len(payloads))
+
+    rows, issued = [], []
+    for payload, material, hashed in zip(payloads, generated, hashes):
+        expires_at = parse_duration_to_utc(payload.expires_at)
+        rows.append({
+            "api_key": hashed,
+            "public_api_id": material["public_id"],
+            "user_id": current_user.user_id,
+            "user_pk": user_pk,
+            "masked_key": material["masked_key"],
+            "name": payload.name,
+            "permissions": payload.permissions,
+            "is_revoked": False,
+            "expires_at": expires_at,
+        })
+        issued.append({
+            "name": payload.name,
+            "api_key": f"sk_live_{material['public_id']}_{material['raw_key']}",
+            "expires_at": expires_at,
+        })
+    db.execute(insert(ApiKey).values(rows))
+    db.commit()
+    return issued
@@ -13,10 +13,55 @@
 
 
 
-from passlib.hash import argon2
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _argon2():
+    # imported on first use so app startup doesn't pay for loading the backend
+    from passlib.hash import argon2
+    from app.core.settings import get_settings
+    rounds, memory_cost, parallelism = get_settings().argon2_params
+    return argon2.using(rounds=rounds, memory_cost=memory_cost, parallelism=parallelism)
 
 def hash_key(secret: str) -> str:
-    return argon2.using(rounds=3, memory_cost=102400, parallelism=8).hash(secret)
+    return _argon2().hash(secret)
 
 def verify_key(secret: str, hashed: str) -> bool:
-    return argon2.verify(secret, hashed)
\ No newline at end of file
+    return _argon2().verify(secret, hashed)
+
+
+_hash_pool: ProcessPoolExecutor | None = None
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    # created on first use, i.e. after gunicorn has forked the worker. The
+    # hashing processes start from a clean forkserver (spawn where that is
+    # unavailable) rather than forking a worker that holds threads, the
+    # event loop and DB connections.
+    global _hash_pool
+    if _hash_pool is None:
+        from app.core.settings import get_settings
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=get_settings().key_hash_workers,
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _hash_pool
+
+
+def hash_keys(secrets: list[str]) -> list[str]:
+    """
+    hash_key for many secrets at once, spread over the process pool so
+    argon2 runs off the GIL. Blocks the calling thread until all are done.
+    """
+    return list(_get_hash_pool().map(hash_key, secrets))
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(cancel_futures=True)
+        _hash_pool = None
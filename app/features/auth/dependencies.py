@@ -1,14 +1,18 @@
+import asyncio
 from datetime import datetime, timezone
 from typing import Optional, List
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
+from app.core.settings import get_settings
+from app.core.tracing import traced
 from app.database.db import get_db
 from app.features.auth.utils.jwt_token import get_current_user
-from app.features.api_keys.models.api_model import ApiKey
-from app.features.api_keys.utils.security import verify_key
+from app.features.api_keys.models.api_model import ApiKey, ALL_PERMISSIONS, PERMISSION_BITS, permission_mask
+from app.features.auth.utils.auth_cache import CachedApiKey, auth_cache
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
@@ -17,10 +21,83 @@ class PrincipalType:
     SERVICE = "service"
 
 class Principal:
-    def __init__(self, type: str, user_id: str, permissions: Optional[List[str]] = None):
-        self.type = type
-        self.user_id = user_id
-        self.permissions = permissions or []
+    """
+    Authenticated caller. Immutable and slotted: API key principals are built
+    once per cached key and shared by every request using that key.
+    """
+    __slots__ = ("type", "user_id", "user_pk", "permission_mask", "key_id", "rate_limit_key")
+
+    def __init__(self, type: str, user_id: str, user_pk: int, permission_mask: int = 0, key_id: Optional[str] = None):
+        set_ = object.__setattr__
+        set_(self, "type", type)
+        set_(self, "user_id", user_id)
+        set_(self, "user_pk", user_pk)
+        set_(self, "permission_mask", permission_mask)
+        set_(self, "key_id", key_id)
+        # API keys are throttled individually; JWT sessions per user
+        set_(self, "rate_limit_key", f"key:{key_id}" if key_id else f"user:{user_id}")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Principal is immutable")
+
+    @property
+    def permissions(self) -> List[str]:
+        return [name for name, bit in PERMISSION_BITS.items() if self.permission_mask & bit]
+
+def load_api_key(db: Session, public_id: str) -> Optional[CachedApiKey]:
+    """
+    Read an API key from the database into the auth cache.
+    """
+    generation = auth_cache.generation
+    row = (
+        db.query(ApiKey.api_key, ApiKey.user_id, ApiKey.user_pk, ApiKey.permissions, ApiKey.expires_at, ApiKey.is_revoked)
+        .filter(ApiKey.public_api_id == public_id)
+        .first()
+    )
+    if not row:
+        return None
+    entry = CachedApiKey(
+        hashed_key=row.api_key,
+        user_id=row.user_id,
+        expires_at=row.expires_at,
+        is_revoked=row.is_revoked,
+        principal=Principal(
+            type=PrincipalType.SERVICE,
+            user_id=row.user_id,
+            user_pk=row.user_pk,
+            permission_mask=permission_mask(row.permissions),
+            key_id=public_id,
+        ),
+    )
+    auth_cache.put_key(public_id, entry, generation)
+    return entry
+
+_verify_slots: Optional[asyncio.Semaphore] = None
+
+async def verify_api_key(api_key: CachedApiKey, secret: str) -> bool:
+    """
+    Check `secret` against a cached key. The first check of an entry runs
+    argon2 on the threadpool, at most KEY_VERIFY_CONCURRENCY at a time per
+    worker; later ones are a digest compare on the event loop.
+    """
+    global _verify_slots
+    if api_key.verified_digest is not None:
+        return api_key.verify(secret)
+    if _verify_slots is None:
+        _verify_slots = asyncio.Semaphore(get_settings().key_verify_concurrency)
+    async with _verify_slots:
+        return await run_in_threadpool(api_key.verify, secret)
+
+def require_active_user(db: Session, user_id: str) -> int:
+    """
+    The user's integer key; 401 if the user is unknown or deactivated.
+    """
+    user = auth_cache.get_user(db, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User is inactive")
+    return user.pk
 
 def parse_api_key_header(raw: str) -> tuple[str, str, str]:
     """
@@ -36,7 +113,9 @@ def parse_api_key_header(raw: str) -> tuple[str, str, str]:
     secret = parts[3]
     return prefix, public_id, secret
 
+@traced("auth.get_principal")
 async def get_principal(
+    request: Request,
     db: Session = Depends(get_db),
     bearer: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
     x_api_key: Optional[str] = Header(None, alias="x-api-key"),
@@ -46,7 +125,9 @@ async def get_principal(
         user = get_current_user(bearer.credentials)  # no await
         if not user:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        return Principal(type=PrincipalType.USER, user_id=user.user_id)
+        user_pk = require_active_user(db, user.user_id)
+        request.state.user_id = user.user_id
+        return Principal(type=PrincipalType.USER, user_id=user.user_id, user_pk=user_pk, permission_mask=ALL_PERMISSIONS)
 
     # 2. API key
     if x_api_key:
@@ -55,11 +136,13 @@ async def get_principal(
         except ValueError:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
-        api_key: ApiKey = db.query(ApiKey).filter(ApiKey.public_api_id == public_id).first()
-        if not api_key:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        api_key = auth_cache.get_key(public_id)
+        if api_key is None:
+            api_key = load_api_key(db, public_id)
+            if not api_key:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
-        if not verify_key(secret, api_key.api_key):
+        if not await verify_api_key(api_key, secret):
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
 
         if api_key.expires_at:
@@ -70,19 +153,15 @@ async def get_principal(
         if api_key.is_revoked:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="API key revoked")
 
-        # permissions: handle list or comma-separated string
-        perms_raw = api_key.permissions or []
-        if isinstance(perms_raw, str):
-            perms = [p.strip() for p in perms_raw.split(",") if p.strip()]
-        else:
-            perms = [p for p in perms_raw if p]
-        return Principal(type=PrincipalType.SERVICE, user_id=api_key.user_id, permissions=perms)
+        require_active_user(db, api_key.user_id)
+
+        request.state.user_id = api_key.user_id
+        return api_key.principal
 
     # 3. No auth
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
 def require_permission(principal: Principal, permission: str):
-    if principal.type == PrincipalType.USER:
-        return
-    if permission not in principal.permissions:
+    # JWT users carry every bit
+    if not principal.permission_mask & PERMISSION_BITS.get(permission, 0):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Missing permission: {permission}")
@@ -1,12 +1,14 @@
 # models.py
-from sqlalchemy import Column, String, Boolean, DateTime, func
+from sqlalchemy import Column, Integer, Identity, String, Boolean, DateTime, func
 from app.database.db import Base
 from uuid import uuid4
 
 class User(Base):
     __tablename__ = "users"
 
-    user_id = Column(String(50), primary_key=True, index=True, default=lambda:str(uuid4()))
+    user_id = Column(String(50), primary_key=True, default=lambda:str(uuid4()))
+    # compact internal key used by wallets/api_keys; user_id stays the external id
+    id = Column(Integer, Identity(), unique=True, nullable=False)
     provider_sub =  Column(String(50), unique=True, index=True)
     email = Column(String(50), unique=True, index=True, nullable=False)
     name = Column(String(70), nullable=True)
@@ -1,8 +1,7 @@
-import os
 from fastapi import APIRouter, HTTPException, Depends
 from urllib.parse import urlencode
-from dotenv import load_dotenv
-import httpx
+from app.core.settings import Settings, get_settings
+from app.core.tracing import http_client
 from sqlalchemy.orm import Session
 
 from app.features.auth.schemas.auth_schema import TokenResponse
@@ -12,24 +11,20 @@ from app.features.auth.models.user_model import User
 from app.features.wallet.routes.wallet_route import get_or_create_wallet
 
 
-load_dotenv()
 router = APIRouter(prefix='/auth/google', tags=["Authentication"])
 
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USERINFO_URL = "https://openidconnect.googleapis.com/v1/userinfo"
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-GOOGLE_REDIRECT_URI = os.getenv("GOOGLE_REDIRECT_URI")
-GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 
 OAUTH_SCOPES = "openid email profile"
 
 @router.get("/")
-async def google_login():
+async def google_login(settings: Settings = Depends(get_settings)):
     params = {
-        "client_id": GOOGLE_CLIENT_ID,
+        "client_id": settings.google_client_id,
         "response_type": "code",
-        "redirect_uri": GOOGLE_REDIRECT_URI,
+        "redirect_uri": settings.google_redirect_uri,
         "scope": OAUTH_SCOPES,
         "access_type": "offline",
         "prompt": "consent",  
@@ -45,7 +40,12 @@ async def google_login():
 
 
 @router.get("/callback")
-async def callback(code: str | None = None, error: str | None = None, db: Session = Depends(get_db)):
+async def callback(
+    code: str | None = None,
+    error: str | None = None,
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings),
+):
     
 
     if error:
@@ -54,12 +54,12 @@ async def callback(code: str | None = None, error: str | None = None, db: Sessio
         raise HTTPException(status_code=400, detail="Missing code from Google")
 
     
-    async with httpx.AsyncClient() as client:
+    async with http_client(timeout=settings.google_timeout_seconds) as client:
         token_data = {
             "code": code,
-            "client_id": GOOGLE_CLIENT_ID,
-            "client_secret": GOOGLE_CLIENT_SECRET,
-            "redirect_uri": GOOGLE_REDIRECT_URI,
+            "client_id": settings.google_client_id,
+            "client_secret": settings.google_client_secret,
+            "redirect_uri": settings.google_redirect_uri,
             "grant_type": "authorization_code",
         }
         token_resp = await client.post(GOOGLE_TOKEN_URL, data=token_data)
@@ -108,7 +108,7 @@ async def callback(code: str | None = None, error: str | None = None, db: Sessio
         db.commit()
         db.refresh(user)
 
-    get_or_create_wallet(db, user_id= user.user_id)
+    get_or_create_wallet(db, user_pk=user.id, user_id=user.user_id)
 
     access_jwt = create_access_token({"user_id":user.user_id})
 
@@ -0,0 +1,168 @@
+import hashlib
+import hmac
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.events import event_bus
+from app.core.metrics import register_collector
+from app.core.settings import get_settings
+from app.core.tracing import span
+from app.features.api_keys.utils.security import verify_key
+from app.features.auth.models.user_model import User
+
+CHANNEL = "auth_invalidate"
+
+
+@dataclass
+class CachedApiKey:
+    hashed_key: str
+    user_id: str
+    expires_at: datetime | None
+    is_revoked: bool
+    # the Principal handed to every request using this key
+    principal: Any
+    # sha256 of the last secret that passed argon2 verification
+    verified_digest: bytes | None = field(default=None, repr=False)
+
+    def verify(self, secret: str) -> bool:
+        """
+        argon2 once per cache entry; later requests compare a sha256 digest.
+        """
+        digest = hashlib.sha256(secret.encode()).digest()
+        if self.verified_digest is not None:
+            return hmac.compare_digest(digest, self.verified_digest)
+        with span("auth.argon2_verify"):
+            if not verify_key(secret, self.hashed_key):
+                return False
+        self.verified_digest = digest
+        return True
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    pk: int
+    is_active: bool
+
+
+class AuthCache:
+    """
+    Per-process cache of API keys (by public id) and users (integer key and
+    active flag, by external user_id).
+
+    Entries live for AUTH_CACHE_TTL_SECONDS but are dropped as soon as an
+    invalidation arrives on the event bus, so revocations apply within
+    milliseconds on every worker. The TTL only bounds staleness if a
+    notification is lost. A load that started before an invalidation is not
+    stored (generation check), so a racing request can't re-cache the old state.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self._keys: dict[str, tuple[float, CachedApiKey]] = {}
+        self._users: dict[str, tuple[float, CachedUser]] = {}
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self) -> float:
+        return get_settings().auth_cache_ttl_seconds
+
+    def _get(self, table: dict, key: str):
+        entry = table.get(key)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def _put(self, table: dict, key: str, value, generation: int) -> None:
+        if not self.ttl:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            if len(table) >= self._max_entries:
+                table.clear()
+            table[key] = (time.monotonic(), value)
+
+    def get_key(self, public_id: str) -> CachedApiKey | None:
+        return self._get(self._keys, public_id)
+
+    def put_key(self, public_id: str, entry: CachedApiKey, generation: int) -> None:
+        self._put(self._keys, public_id, entry, generation)
+
+    def get_user(self, db: Session, user_id: str) -> CachedUser | None:
+        """
+        The user's integer key and active flag; None if the user doesn't exist.
+        """
+        user = self._get(self._users, user_id)
+        if user is None:
+            generation = self.generation
+            row = db.query(User.id, User.is_active).filter(User.user_id == user_id).first()
+            if row is None:
+                return None
+            # NULL is_active predates the flag being enforced: treat as active
+            user = CachedUser(pk=row.id, is_active=row.is_active is not False)
+            self._put(self._users, user_id, user, generation)
+        return user
+
+    def invalidate(self, kind: str, value: str) -> None:
+        with self._lock:
+            self.generation += 1
+            if kind == "key":
+                self._keys.pop(value, None)
+            elif kind == "user":
+                self._users.pop(value, None)
+                for public_id in [k for k, (_, e) in self._keys.items() if e.user_id == value]:
+                    del self._keys[public_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._keys.clear()
+            self._users.clear()
+
+    def handle_event(self, payload: str) -> None:
+        # payload: "<key|user>:<id>,..."
+        for item in payload.split(","):
+            kind, _, value = item.partition(":")
+            if value:
+                self.invalidate(kind, value)
+
+    def collect(self):
+        yield ("auth_cache_hits_total", "counter", "Auth lookups served from cache", self.hits)
+        yield ("auth_cache_misses_total", "counter", "Auth lookups that queried the database", self.misses)
+        yield ("auth_cache_keys", "gauge", "Cached API keys", len(self._keys))
+
+
+auth_cache = AuthCache()
+event_bus.subscribe(CHANNEL, auth_cache.handle_event)
+event_bus.on_connect(auth_cache.clear)
+register_collector(auth_cache.collect)
+
+
+def publish_key_invalidation(db: Session, *public_ids: str) -> None:
+    """
+    Drop these API keys from every worker's cache once `db` commits.
+    """
+    event_bus.publish_many(db, CHANNEL, [f"key:{public_id}" for public_id in public_ids])
+
+
+def publish_user_invalidation(db: Session, user_id: str) -> None:
+    event_bus.publish(db, CHANNEL, f"user:{user_id}")
+
+
+def set_user_active(db: Session, user: User, active: bool) -> None:
+    """
+    Activate/deactivate a user; their JWTs and API keys stop (or resume)
+    working on every worker once the caller commits.
+    """
+    user.is_active = active
+    publish_user_invalidation(db, user.user_id)
@@ -1,18 +1,9 @@
-import os
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2AuthorizationCodeBearer, HTTPBearer, HTTPAuthorizationCredentials
 from app.features.auth.schemas.auth_schema import CurrentUser, TokenPayload
 from jose import jwt, JWTError
-from dotenv import load_dotenv
-
-load_dotenv()
-
-
-
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
-JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
-JWT_EXPIRES_MINUTES = os.getenv("JWT_EXPIRES_MINUTES")
+from app.core.settings import get_settings
 
 
 bearer_scheme = HTTPBearer(auto_error=True)
@@ -20,19 +11,21 @@ bearer_scheme = HTTPBearer(auto_error=True)
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expiry_time = datetime.now(timezone.utc) + timedelta(minutes = int(JWT_EXPIRES_MINUTES))
+    settings = get_settings()
+    expiry_time = datetime.now(timezone.utc) + timedelta(minutes = settings.jwt_expires_minutes)
     
     to_encode["exp"] =  int(expiry_time.timestamp())
 
     token_payload = TokenPayload(**to_encode)
-    return jwt.encode(token_payload.model_dump(), JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    return jwt.encode(token_payload.model_dump(), settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
 def decode_access_token(token: str) -> CurrentUser:
+    settings = get_settings()
     try:
         payload = jwt.decode(token, 
-                             JWT_SECRET_KEY, 
-                             algorithms=[JWT_ALGORITHM]
+                             settings.jwt_secret_key, 
+                             algorithms=[settings.jwt_algorithm]
                 )
         
         user_id = payload.get("user_id")
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime
+from app.database.db import Base
+
+
+class JobCheckpoint(Base):
+    """
+    Resume position of a background job, so each run continues where the
+    previous one stopped instead of rescanning from the start.
+    """
+    __tablename__ = "job_checkpoints"
+
+    name = Column(String(100), primary_key=True)
+    position = Column(String(200), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+from app.core.settings import get_settings
+from app.core.tracing import http_client
+
+from app.features.reconciliation.models.checkpoint_model import JobCheckpoint
+from app.features.transaction.models.transaction_model import (
+    Transaction,
+    TransactionType,
+    TransactionStatus,
+)
+from app.features.wallet.utils.wallet_util import apply_paystack_event
+
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_NAME = "paystack_reconciliation"
+TERMINAL_STATUSES = {"success", "failed", "abandoned"}
+
+
+def load_checkpoint(db: Session, name: str) -> tuple[datetime, int] | None:
+    row = db.get(JobCheckpoint, name)
+    if not row or not row.position:
+        return None
+    created_at, tx_id = row.position.rsplit("|", 1)
+    return datetime.fromisoformat(created_at), int(tx_id)
+
+
+def save_checkpoint(db: Session, name: str, position: tuple[datetime, int]) -> None:
+    value = f"{position[0].isoformat()}|{position[1]}"
+    row = db.get(JobCheckpoint, name)
+    if row:
+        row.position = value
+    else:
+        db.add(JobCheckpoint(name=name, position=value))
+
+
+async def verify_reference(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, reference: str) -> dict | None:
+    """
+    Paystack's verify result for `reference`: its transaction data, {} when
+    Paystack answered that it has no such transaction, or None when the
+    answer couldn't be determined (network error, timeout, 5xx, unreadable
+    body).
+    """
+    async with semaphore:
+        try:
+            resp = await client.get(f"/transaction/verify/{reference}")
+        except httpx.HTTPError as exc:
+            logger.warning("verify %s failed: %s", reference, exc)
+            return None
+    if resp.status_code >= 500:
+        logger.warning("verify %s failed: HTTP %s", reference, resp.status_code)
+        return None
+    try:
+        body = resp.json()
+    except ValueError:
+        logger.warning("verify %s failed: unreadable body (HTTP %s)", reference, resp.status_code)
+        return None
+    if not isinstance(body, dict):
+        return None
+    if resp.status_code != 200 or not body.get("status"):
+        # a well-formed refusal, e.g. "Transaction reference not found"
+        return {} if 400 <= resp.status_code < 500 else None
+    return body.get("data") or {}
+
+
+async def reconcile_pending_deposits(
+    db: Session,
+    client: httpx.AsyncClient,
+    min_age: timedelta = timedelta(minutes=30),
+    give_up_after: timedelta = timedelta(hours=24),
+    batch_size: int = 500,
+    concurrency: int = 10,
+) -> dict:
+    """
+    Verify one batch of PENDING deposits older than `min_age` against
+    Paystack and apply the outcome through apply_paystack_event.
+
+    Rows are read in (created_at, id) order from the stored checkpoint via
+    ix_transactions_status_type_created_at. The checkpoint only advances past
+    rows that reached a final state. A deposit Paystack still reports as in
+    flight holds it back, so that deposit is retried on the next run, and
+    so does one whose verify call failed. Only Paystack's own "failed" or
+    "abandoned" marks a deposit FAILED: once one Paystack still reports as
+    in flight (or doesn't know) is older than `give_up_after`, the
+    checkpoint moves past it and it stays PENDING for a late webhook.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    checkpoint = load_checkpoint(db, CHECKPOINT_NAME)
+
+    query = (
+        select(Transaction.id, Transaction.reference, Transaction.created_at)
+        .where(
+            Transaction.status == TransactionStatus.PENDING,
+            Transaction.type == TransactionType.DEPOSIT,
+            Transaction.created_at <= now - min_age,
+        )
+        .order_by(Transaction.created_at, Transaction.id)
+        .limit(batch_size)
+    )
+    if checkpoint:
+        query = query.where(tuple_(Transaction.created_at, Transaction.id) > checkpoint)
+    rows = db.execute(query).all()
+    # end the read transaction so no pooled connection sits idle in a
+    # transaction while the verify calls are in flight
+    db.commit()
+
+    summary = {"scanned": len(rows), "credited": 0, "already_applied": 0,
+               "failed": 0, "given_up": 0, "unresolved": 0}
+    if not rows:
+        return summary
+
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(verify_reference(client, semaphore, ref) for _, ref, _ in rows))
+
+    # Apply in one short transaction. Webhooks keep arriving meanwhile;
+    # apply_paystack_event locks each row and skips deposits that a webhook
+    # already credited.
+    position = checkpoint
+    blocked = False
+    for (tx_id, reference, created_at), data in zip(rows, results):
+        paystack_status = (data or {}).get("status")
+        if paystack_status in TERMINAL_STATUSES:
+            if apply_paystack_event(db, {"event": f"charge.{paystack_status}", "data": data}, source="verify"):
+                summary["credited"] += 1
+            elif paystack_status == "success":
+                summary["already_applied"] += 1
+            else:
+                summary["failed"] += 1
+        elif data is not None and now - created_at >= give_up_after:
+            logger.warning("giving up on deposit %s: Paystack reports %r", reference, paystack_status)
+            summary["given_up"] += 1
+        else:
+            summary["unresolved"] += 1
+            blocked = True
+        if not blocked:
+            position = (created_at, tx_id)
+
+    if position and position != checkpoint:
+        save_checkpoint(db, CHECKPOINT_NAME, position)
+    db.commit()
+    return summary
+
+
+def paystack_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    return http_client(
+        base_url=settings.paystack_base_url,
+        headers={"Authorization": f"Bearer {settings.paystack_secret_key}"},
+        timeout=settings.paystack_timeout_seconds,
+    )
@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
+from app.database.db import Base
+
+
+class ScheduledTransfer(Base):
+    """
+    A transfer run by the scheduler at `next_run_at`; recurring when
+    `interval_seconds` is set, otherwise deactivated after its one run.
+    """
+    __tablename__ = "scheduled_transfers"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String(50), ForeignKey("users.user_id"), index=True, nullable=False)
+    wallet_id = Column(Integer, ForeignKey("wallets.id"), nullable=False)
+    recipient_wallet_number = Column(String, nullable=False)
+    amount = Column(Integer, nullable=False)
+    interval_seconds = Column(Integer, nullable=True)
+    next_run_at = Column(DateTime, nullable=False)
+    is_active = Column(Boolean, nullable=False, default=True)
+    run_count = Column(Integer, nullable=False, default=0)
+    last_run_at = Column(DateTime, nullable=True)
+    last_status = Column(String(20), nullable=True)
+    last_error = Column(String(200), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # scheduler claims active rows in next_run_at order
+        Index("ix_scheduled_transfers_active_next_run_at", "is_active", "next_run_at"),
+    )
@@ -0,0 +1,103 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.rate_limit import enforce_rate_limit
+from app.core.responses import json_response
+from app.database.db import get_db, get_read_db
+from app.features.auth.dependencies import get_principal, require_permission, Principal
+from app.features.scheduled_transfers.models.schedule_model import ScheduledTransfer
+from app.features.scheduled_transfers.schemas.schedule_schema import (
+    ScheduledTransferItem,
+    ScheduledTransferRequest,
+)
+from app.features.scheduled_transfers.utils.scheduler_util import spread_run_at
+from app.features.wallet.utils.transfer_util import resolve_recipient
+from app.features.wallet.utils.wallet_util import get_or_create_wallet
+
+router = APIRouter(prefix="/wallet/scheduled-transfers", tags=["wallet"])
+
+
+def _serialize(job: ScheduledTransfer) -> dict:
+    return {
+        "id": job.id,
+        "wallet_number": job.recipient_wallet_number,
+        "amount": job.amount,
+        "interval_seconds": job.interval_seconds,
+        "next_run_at": job.next_run_at,
+        "is_active": job.is_active,
+        "run_count": job.run_count,
+        "last_run_at": job.last_run_at,
+        "last_status": job.last_status,
+        "last_error": job.last_error,
+    }
+
+
+@router.post("", response_model=ScheduledTransferItem, status_code=status.HTTP_201_CREATED)
+async def create_scheduled_transfer(
+    body: ScheduledTransferRequest,
+    principal: Principal = Depends(get_principal),
+    db: Session = Depends(get_db),
+):
+    require_permission(principal, "transfer")
+    enforce_rate_limit(principal, "transfer")
+
+    sender_wallet = get_or_create_wallet(db, principal.user_pk, principal.user_id)
+    # reject unknown/own recipients now rather than at run time
+    resolve_recipient(db, sender_wallet, body.wallet_number)
+
+    job = ScheduledTransfer(
+        user_id=principal.user_id,
+        wallet_id=sender_wallet.id,
+        recipient_wallet_number=body.wallet_number,
+        amount=body.amount,
+        interval_seconds=body.interval_seconds,
+        next_run_at=spread_run_at(body.run_at),
+        is_active=True,
+        run_count=0,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return json_response(_serialize(job), status_code=status.HTTP_201_CREATED)
+
+
+@router.get("", response_model=list[ScheduledTransferItem])
+async def list_scheduled_transfers(
+    principal: Principal = Depends(get_principal),
+    db: Session = Depends(get_read_db),
+):
+    require_permission(principal, "read")
+    enforce_rate_limit(principal, "read")
+
+    jobs = (
+        db.query(ScheduledTransfer)
+        .filter(ScheduledTransfer.user_id == principal.user_id)
+        .order_by(ScheduledTransfer.id)
+        .all()
+    )
+    return json_response([_serialize(job) for job in jobs])
+
+
+@router.delete("/{schedule_id}")
+async def cancel_scheduled_transfer(
+    schedule_id: int,
+    principal: Principal = Depends(get_principal),
+    db: Session = Depends(get_db),
+):
+    require_permission(principal, "transfer")
+    enforce_rate_limit(principal, "transfer")
+
+    job = (
+        db.query(ScheduledTransfer)
+        .filter(ScheduledTransfer.id == schedule_id, ScheduledTransfer.user_id == principal.user_id)
+        .with_for_update()
+        .first()
+    )
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scheduled transfer not found",
+        )
+    job.is_active = False
+    db.commit()
+    return {"status": True, "message": "Scheduled transfer cancelled"}
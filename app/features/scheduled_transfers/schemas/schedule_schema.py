@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+from pydantic import BaseModel, Field, field_validator
+
+
+class ScheduledTransferRequest(BaseModel):
+    wallet_number: str
+    amount: int = Field(gt=0)
+    run_at: datetime
+    # omit for a one-off transfer
+    interval_seconds: int | None = Field(None, ge=3600)
+
+    @field_validator("run_at")
+    def to_naive_utc(cls, value):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
+class ScheduledTransferItem(BaseModel):
+    id: int
+    wallet_number: str
+    amount: int
+    interval_seconds: int | None
+    next_run_at: datetime
+    is_active: bool
+    run_count: int
+    last_run_at: datetime | None
+    last_status: str | None
+    last_error: str | None
@@ -0,0 +1,118 @@
+import logging
+import random
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.settings import get_settings
+from app.features.auth.models.user_model import User
+from app.features.scheduled_transfers.models.schedule_model import ScheduledTransfer
+from app.features.wallet.models.wallet_model import Wallet
+from app.features.wallet.utils.transfer_util import perform_transfer
+
+logger = logging.getLogger(__name__)
+
+
+def spread_run_at(run_at: datetime) -> datetime:
+    """
+    Offset a requested run time by a random delay inside the jitter window,
+    so schedules everyone sets to midnight don't all come due at once.
+    Recurring runs keep the offset because each one adds exactly
+    `interval_seconds` to the previous run time.
+    """
+    window = get_settings().scheduled_transfer_jitter_seconds
+    if not window:
+        return run_at
+    return run_at + timedelta(seconds=random.uniform(0, window))
+
+
+def next_run_after(job: ScheduledTransfer, now: datetime) -> datetime | None:
+    if not job.interval_seconds:
+        return None
+    step = timedelta(seconds=job.interval_seconds)
+    next_run = job.next_run_at + step
+    if next_run <= now:
+        # the scheduler was down; skip missed runs instead of replaying them
+        missed = (now - next_run) // step + 1
+        next_run += step * missed
+    return next_run
+
+
+def claim_due_transfers(db: Session, now: datetime, limit: int) -> list[ScheduledTransfer]:
+    """
+    Lock up to `limit` due schedules. SKIP LOCKED lets several scheduler
+    processes work side by side without picking the same rows.
+    """
+    return list(db.scalars(
+        select(ScheduledTransfer)
+        .where(ScheduledTransfer.is_active.is_(True), ScheduledTransfer.next_run_at <= now)
+        .order_by(ScheduledTransfer.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ))
+
+
+def run_scheduled_transfer(db: Session, job: ScheduledTransfer, now: datetime) -> bool:
+    """
+    Execute one claimed schedule inside a savepoint, so a failed transfer
+    rolls back alone and only its status is recorded. Schedules of
+    deactivated users are switched off without running. Returns True on
+    success.
+    """
+    if not db.scalar(select(User.is_active).where(User.user_id == job.user_id)):
+        job.last_status, job.last_error = "failed", "User is inactive"
+        job.is_active = False
+        return False
+
+    try:
+        with db.begin_nested():
+            sender_wallet = db.query(Wallet).filter(Wallet.id == job.wallet_id).one()
+            perform_transfer(db, sender_wallet, job.recipient_wallet_number, job.amount)
+        job.last_status, job.last_error = "success", None
+    except HTTPException as exc:
+        job.last_status, job.last_error = "failed", str(exc.detail)[:200]
+    except SQLAlchemyError as exc:
+        logger.exception("scheduled transfer %s hit a database error", job.id)
+        job.last_status, job.last_error = "failed", type(exc).__name__
+
+    job.run_count += 1
+    job.last_run_at = now
+    next_run = next_run_after(job, now)
+    if next_run is None:
+        job.is_active = False
+    else:
+        job.next_run_at = next_run
+    return job.last_status == "success"
+
+
+def run_due_transfers(db: Session, batch_size: int) -> dict:
+    """
+    Claim and run up to `batch_size` due schedules, one transaction each, so
+    a job's wallet locks are released before the next job takes its own.
+    """
+    now = datetime.utcnow()
+    summary = {"claimed": 0, "succeeded": 0, "failed": 0}
+    for _ in range(batch_size):
+        jobs = claim_due_transfers(db, now, 1)
+        if not jobs:
+            break
+        [job] = jobs
+        summary["claimed"] += 1
+        try:
+            succeeded = run_scheduled_transfer(db, job, now)
+            db.commit()
+        except SQLAlchemyError:
+            # the status update itself failed; the job stays due for a later tick
+            db.rollback()
+            logger.exception("scheduled transfer %s could not be recorded", job.id)
+            summary["failed"] += 1
+            break
+        if succeeded:
+            summary["succeeded"] += 1
+        else:
+            summary["failed"] += 1
+            logger.info("scheduled transfer %s failed: %s", job.id, job.last_error)
+    return summary
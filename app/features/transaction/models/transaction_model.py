@@ -11,7 +11,11 @@ from sqlalchemy import (
     ForeignKey,
     Enum,
     JSON,
+    Index,
+    LargeBinary,
+    text,
 )
+from sqlalchemy.orm import deferred
 
 class TransactionType(str, enum.Enum):
     DEPOSIT = "deposit"
@@ -28,13 +32,49 @@ class TransactionStatus(str, enum.Enum):
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     wallet_id = Column(Integer, ForeignKey("wallets.id"), nullable=False)
     type = Column(Enum(TransactionType), nullable=False)
     status = Column(Enum(TransactionStatus), nullable=False, default=TransactionStatus.PENDING)
     amount = Column(Integer, nullable=False)
     reference = Column(String, unique=True, index=True, nullable=False)
     counterparty_wallet_id = Column(Integer, ForeignKey("wallets.id"), nullable=True)
-    meta = Column(JSON, nullable=True)
+    # raw Paystack payloads; deferred so loading a Transaction doesn't pull them
+    meta = deferred(Column(JSON, nullable=True))
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # reconciliation scans PENDING deposits by age
+        Index("ix_transactions_status_type_created_at", "status", "type", "created_at", "id"),
+        # rollup catch-up job reads successful rows by update time
+        Index("ix_transactions_status_updated_at", "status", "updated_at", "id"),
+        # a wallet's history, newest first. Search pages walk it in keyset
+        # order; the INCLUDE columns let type/status/amount filters run on
+        # the index entries, so only matching rows are fetched from the heap.
+        Index(
+            "ix_transactions_wallet_history",
+            "wallet_id", "created_at", "id",
+            postgresql_include=["type", "status", "amount"],
+        ),
+        # deposits have no counterparty, so only transfers are indexed. Also
+        # serves a wallet's history filtered by counterparty.
+        Index(
+            "ix_transactions_counterparty_history",
+            "counterparty_wallet_id", "wallet_id", "created_at", "id",
+            postgresql_where=text("counterparty_wallet_id IS NOT NULL"),
+        ),
+    )
+
+
+class TransactionPayloadArchive(Base):
+    """
+    Full provider payloads (zlib-compressed JSON), kept out of the hot
+    transactions table. One row per reference and source.
+    """
+    __tablename__ = "transaction_payload_archive"
+
+    reference = Column(String, primary_key=True)
+    source = Column(String(20), primary_key=True)
+    payload = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
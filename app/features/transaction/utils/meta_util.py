@@ -0,0 +1,87 @@
+import json
+import zlib
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+from app.core.settings import get_settings
+
+from app.features.transaction.models.transaction_model import Transaction, TransactionPayloadArchive
+
+
+def meta_policy() -> str:
+    return get_settings().transaction_meta_policy
+
+
+def compact_meta(payload: dict) -> dict | None:
+    """
+    Whitelisted fields from a Paystack payload. Webhook and verify payloads
+    nest them under "data"; initialize responses are already flat.
+    """
+    if not isinstance(payload, dict):
+        return None
+    nested = payload.get("data")
+    sources = (nested, payload) if isinstance(nested, dict) else (payload,)
+    kept = {}
+    for field in get_settings().transaction_meta_fields:
+        for source in sources:
+            if source.get(field) is not None:
+                kept[field] = source[field]
+                break
+    return kept or None
+
+
+def compress_payload(payload: dict) -> bytes:
+    return zlib.compress(json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8"), 6)
+
+
+def decompress_payload(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob))
+
+
+def archive_payloads(db: Session, rows: Iterable[tuple[str, str, dict]]) -> None:
+    """
+    Upsert (reference, source, payload) rows into the archive, so a replayed
+    webhook replaces the earlier copy instead of failing on the key.
+    """
+    values = [
+        {"reference": reference, "source": source, "payload": compress_payload(payload)}
+        for reference, source, payload in rows
+    ]
+    if not values:
+        return
+
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(TransactionPayloadArchive)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["reference", "source"],
+                set_={"payload": stmt.excluded.payload, "created_at": stmt.excluded.created_at},
+            ),
+            values,
+        )
+    else:
+        for value in values:
+            db.merge(TransactionPayloadArchive(**value))
+
+
+def store_transaction_meta(db: Session, tx: Transaction, payload: dict, source: str) -> None:
+    """
+    Set tx.meta from a provider payload according to the meta policy:
+    "compact" keeps whitelisted fields inline and archives the full payload,
+    "full" stores the whole payload inline.
+    """
+    if meta_policy() == "full":
+        tx.meta = payload
+        return
+    tx.meta = compact_meta(payload)
+    archive_payloads(db, [(tx.reference, source, payload)])
+
+
+def load_archived_payload(db: Session, reference: str, source: str) -> dict | None:
+    row = db.get(TransactionPayloadArchive, (reference, source))
+    return decompress_payload(row.payload) if row else None
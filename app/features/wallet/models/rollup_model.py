@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, BigInteger, Date, ForeignKey, Enum
+from app.database.db import Base
+from app.features.transaction.models.transaction_model import TransactionType
+
+
+class WalletDailyRollup(Base):
+    """
+    Per wallet, per UTC day and per transaction type: how many successful
+    transactions and their total amount. Maintained as transactions succeed,
+    so summaries read O(days) rows instead of the whole history. Sharded
+    wallets spread live updates over `shard_no` rows the way their balance
+    is spread; readers sum them.
+    """
+    __tablename__ = "wallet_daily_rollups"
+
+    wallet_id = Column(Integer, ForeignKey("wallets.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    type = Column(Enum(TransactionType), primary_key=True)
+    shard_no = Column(Integer, primary_key=True, default=0, server_default="0")
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(BigInteger, nullable=False, default=0)
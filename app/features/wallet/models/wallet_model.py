@@ -5,7 +5,18 @@ from app.database.db import Base
 class Wallet(Base):
     __tablename__ = "wallets"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String(50), ForeignKey("users.user_id"), unique=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(String(50), ForeignKey("users.user_id"), nullable=False)
+    user_pk = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)
     wallet_number = Column(String, unique=True, index=True, nullable=False)
-    balance = Column(Integer, nullable=False, default=0) 
\ No newline at end of file
+    balance = Column(Integer, nullable=False, default=0)
+    # 0 = plain wallet; N > 0 = credits are spread over N WalletBalanceShard rows
+    shard_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class WalletBalanceShard(Base):
+    __tablename__ = "wallet_balance_shards"
+
+    wallet_id = Column(Integer, ForeignKey("wallets.id"), primary_key=True)
+    shard_no = Column(Integer, primary_key=True)
+    balance = Column(Integer, nullable=False, default=0)
@@ -1,19 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, Header, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Header, Query, status
 from sqlalchemy.orm import Session
-from uuid import uuid4
-import os
+from datetime import datetime
 
-import httpx
 
-from app.database.db import get_db
+from app.database.db import get_db, get_read_db, mark_primary_write
 from app.features.auth.dependencies import get_principal, require_permission, Principal
-from app.features.wallet.models.wallet_model import Wallet
+from app.core.rate_limit import enforce_rate_limit
+from app.core.responses import json_response
+from app.core.tracing import http_client, span
 from app.features.transaction.models.transaction_model import (
     Transaction,
     TransactionType,
     TransactionStatus,
 )
 from app.features.auth.models.user_model import User 
+from app.features.transaction.utils.meta_util import store_transaction_meta
 from app.features.wallet.schemas.wallet_schema import (
     DepositRequest,
     DepositResponse,
@@ -21,30 +22,40 @@ from app.features.wallet.schemas.wallet_schema import (
     BalanceResponse,
     TransferRequest,
     TransferResponse,
-    TransactionItem
+    TransactionItem,
+    TransactionSearchResponse,
+    WalletSummaryItem
 )
+from app.features.wallet.utils.webhook_batch import apply_paystack_events
+from app.features.wallet.utils.transfer_util import perform_transfer
+from app.features.wallet.utils.rollup_util import wallet_summary
+from app.features.wallet.utils.transaction_search import TransactionFilters, estimate_count, search_transactions
+from app.features.wallet.utils.wallet_cache import resolve_wallet_id
+from app.features.wallet.utils.deposit_notifier import deposit_notifier, publish_deposit_statuses
 from app.features.wallet.utils.wallet_util import (
     get_or_create_wallet,
+    find_wallet,
+    wallet_total_balance,
+    apply_paystack_event,
     verify_paystack_signature,
     generate_reference_number
 
 )
-from dotenv import load_dotenv
-load_dotenv()
+from app.core.settings import Settings, get_settings
 
 router = APIRouter(prefix="/wallet", tags=["wallet"])
 
-PAYSTACK_SECRET_KEY = os.getenv("PAYSTACK_SECRET_KEY", "")
-PAYSTACK_BASE_URL = "https://api.paystack.co"
-
 
 @router.post("/deposit", response_model=DepositResponse)
 async def create_deposit(
     body: DepositRequest,
+    response: Response,
     principal: Principal = Depends(get_principal),
     db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings),
 ):
     require_permission(principal, "deposit")
+    enforce_rate_limit(principal, "deposit")
 
     if body.amount <= 0:
         raise HTTPException(
@@ -52,7 +63,8 @@ async def create_deposit(
             detail="Amount must be positive",
         )
 
-    wallet = get_or_create_wallet(db, principal.user_id)
+    with span("wallet.get_or_create"):
+        wallet = get_or_create_wallet(db, principal.user_pk, principal.user_id)
 
     reference = generate_reference_number()
 
@@ -69,7 +81,7 @@ async def create_deposit(
 
     
 
-    headers = {"Authorization": f"Bearer {PAYSTACK_SECRET_KEY}"}
+    headers = {"Authorization": f"Bearer {settings.paystack_secret_key}"}
     user = db.query(User).filter(User.user_id == wallet.user_id).first()
     payload = {
         "amount": body.amount * 100,
@@ -77,16 +89,17 @@ async def create_deposit(
         "reference": reference,
     }
 
-    async with httpx.AsyncClient() as client:
+    async with http_client() as client:
         resp = await client.post(
-            f"{PAYSTACK_BASE_URL}/transaction/initialize",
+            f"{settings.paystack_base_url}/transaction/initialize",
             json=payload,
             headers=headers,
-            timeout=30,
+            timeout=settings.paystack_timeout_seconds,
         )
 
     if resp.status_code != 200:
         tx.status = TransactionStatus.FAILED
+        publish_deposit_statuses(db, [(reference, tx.status.value)])
         db.commit()
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -96,6 +109,7 @@ async def create_deposit(
     data = resp.json()
     if not data.get("status"):
         tx.status = TransactionStatus.FAILED
+        publish_deposit_statuses(db, [(reference, tx.status.value)])
         db.commit()
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -103,8 +117,9 @@ async def create_deposit(
         )
 
     auth_url = data["data"]["authorization_url"]
-    tx.meta = data["data"]
+    store_transaction_meta(db, tx, data["data"], source="initialize")
     db.commit()
+    mark_primary_write(principal.user_id, response)
 
     return DepositResponse(reference=reference, authorization_url=auth_url)
 
@@ -114,59 +129,63 @@ async def paystack_webhook(
     request: Request,
     db: Session = Depends(get_db),
     x_paystack_signature: str = Header(None, alias="x-paystack-signature"),
+    settings: Settings = Depends(get_settings),
 ):
     raw_body = await request.body()
 
-    if not x_paystack_signature or not verify_paystack_signature(raw_body, x_paystack_signature, PAYSTACK_SECRET_KEY):
+    if not x_paystack_signature or not verify_paystack_signature(raw_body, x_paystack_signature, settings.paystack_secret_key):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid signature",
         )
 
     payload = await request.json()
-    data = payload.get("data") or {}
-    reference = data.get("reference")
-    status_str = data.get("status")
 
-    if not reference:
-        return {"status": True}
+    credited_wallet = apply_paystack_event(db, payload)
+    db.commit()
+    if credited_wallet:
+        mark_primary_write(credited_wallet.user_id)
 
-    # Find transaction by reference
-    tx = (
-        db.query(Transaction)
-        .filter(Transaction.reference == reference)
-        .first()
-    )
-    if not tx:
-        # Unknown reference, ignore for security
-        return {"status": True}
+    return {"status": True}
 
-    # Idempotency: if already success, do nothing
-    if tx.status == TransactionStatus.SUCCESS:
-        return {"status": True}
+@router.post("/paystack/webhook/batch", include_in_schema=False)
+async def paystack_webhook_batch(
+    request: Request,
+    db: Session = Depends(get_db),
+    x_paystack_signature: str = Header(None, alias="x-paystack-signature"),
+    settings: Settings = Depends(get_settings),
+):
+    """
+    Internal replay endpoint: {"events": [<paystack webhook payload>, ...]},
+    signed like a Paystack webhook (HMAC-SHA512 of the body).
+    """
+    raw_body = await request.body()
 
-    tx.meta = payload
+    if not x_paystack_signature or not verify_paystack_signature(raw_body, x_paystack_signature, settings.paystack_secret_key):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid signature",
+        )
 
-    if status_str == "success":
-        wallet = db.query(Wallet).filter(Wallet.id == tx.wallet_id).first()
-        wallet.balance += tx.amount
-        tx.status = TransactionStatus.SUCCESS
-        db.commit()
-    elif status_str in {"failed", "abandoned"}:
-        tx.status = TransactionStatus.FAILED
-        db.commit()
-    else:
-        db.commit()
+    payload = await request.json()
+    events = payload.get("events")
+    if not isinstance(events, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="events must be a list",
+        )
 
-    return {"status": True}
+    summary = apply_paystack_events(db, events)
+    db.commit()
+    return {"status": True, "data": summary}
 
 @router.get("/deposit/{reference}/status", response_model=DepositStatusResponse)
 async def get_deposit_status(
     reference: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     tx = (
-        db.query(Transaction)
+        db.query(Transaction.reference, Transaction.status, Transaction.amount)
         .filter(
             Transaction.reference == reference,
             Transaction.type == TransactionType.DEPOSIT,
@@ -186,13 +205,55 @@ async def get_deposit_status(
     )
 
 
+@router.get("/deposit/{reference}/status/wait", response_model=DepositStatusResponse)
+async def wait_for_deposit_status(
+    reference: str,
+    timeout: float = Query(25, gt=0, le=60),
+    db: Session = Depends(get_db),
+):
+    """
+    Long-poll variant of /status: answers immediately if the deposit is no
+    longer pending, otherwise holds the request until the webhook settles it
+    or `timeout` seconds pass, then returns the (possibly still pending) status.
+    """
+    with deposit_notifier.watch(reference) as watch:
+        # read the primary: a replica could still show pending after the notify
+        tx = (
+            db.query(Transaction.reference, Transaction.status, Transaction.amount)
+            .filter(
+                Transaction.reference == reference,
+                Transaction.type == TransactionType.DEPOSIT,
+            )
+            .first()
+        )
+        if not tx:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Deposit not found",
+            )
+        # don't hold a pooled connection while parked
+        db.close()
+
+        current = tx.status.value
+        if tx.status == TransactionStatus.PENDING:
+            current = await watch.wait(timeout) or current
+
+    return DepositStatusResponse(
+        reference=tx.reference,
+        status=current,
+        amount=tx.amount,
+    )
+
+
 @router.post("/transfer", response_model=TransferResponse)
 async def transfer(
     body: TransferRequest,
+    response: Response,
     principal: Principal = Depends(get_principal),
     db: Session = Depends(get_db),
 ):
     require_permission(principal, "transfer")
+    enforce_rate_limit(principal, "transfer")
 
     if body.amount <= 0:
         raise HTTPException(
@@ -200,55 +261,10 @@ async def transfer(
             detail="Amount must be positive",
         )
 
-    sender_wallet = get_or_create_wallet(db, principal.user_id)
-
-    if sender_wallet.wallet_number == body.wallet_number:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot transfer to same wallet",
-        )
-
-    recipient_wallet = (
-        db.query(Wallet)
-        .filter(Wallet.wallet_number == body.wallet_number)
-        .first()
-    )
-    if not recipient_wallet:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Recipient wallet not found",
-        )
-
-    # Atomic transfer (simple version)
-    if sender_wallet.balance < body.amount:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Insufficient balance",
-        )
-
-    sender_wallet.balance -= body.amount
-    recipient_wallet.balance += body.amount
-
-    out_tx = Transaction(
-        wallet_id=sender_wallet.id,
-        type=TransactionType.TRANSFER_OUT,
-        status=TransactionStatus.SUCCESS,
-        amount=body.amount,
-        reference=f"tr_out_{uuid4().hex}",
-        counterparty_wallet_id=recipient_wallet.id,
-    )
-    in_tx = Transaction(
-        wallet_id=recipient_wallet.id,
-        type=TransactionType.TRANSFER_IN,
-        status=TransactionStatus.SUCCESS,
-        amount=body.amount,
-        reference=f"tr_in_{uuid4().hex}",
-        counterparty_wallet_id=sender_wallet.id,
-    )
-
-    db.add(out_tx)
-    db.add(in_tx)
+    sender_wallet = get_or_create_wallet(db, principal.user_pk, principal.user_id)
+    perform_transfer(db, sender_wallet, body.wallet_number, body.amount)
     db.commit()
+    mark_primary_write(principal.user_id, response)
 
     return TransferResponse(status="success", message="Transfer completed")
 
@@ -257,36 +273,115 @@ async def transfer(
 @router.get("/balance", response_model=BalanceResponse)
 async def get_wallet_balance(
     principal: Principal = Depends(get_principal),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     require_permission(principal, "read")
+    enforce_rate_limit(principal, "read")
 
-    wallet = get_or_create_wallet(db, principal.user_id)
-    return BalanceResponse(balance=wallet.balance)
+    # wallets are created at login; a missing one has nothing in it yet
+    wallet = find_wallet(db, principal.user_pk)
+    return BalanceResponse(balance=wallet_total_balance(db, wallet) if wallet else 0)
 
 
 @router.get("/transactions", response_model=list[TransactionItem])
 async def get_transactions(
     principal: Principal = Depends(get_principal),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     require_permission(principal, "read")
+    enforce_rate_limit(principal, "read")
 
-    wallet = get_or_create_wallet(db, principal.user_id)
+    wallet = find_wallet(db, principal.user_pk)
+    if not wallet:
+        return json_response([])
 
+    # project only the columns TransactionItem needs
     txs = (
-        db.query(Transaction)
+        db.query(
+            Transaction.type,
+            Transaction.amount,
+            Transaction.status,
+            Transaction.created_at,
+        )
         .filter(Transaction.wallet_id == wallet.id)
         .order_by(Transaction.created_at.desc())
         .all()
     )
 
-    return [
-        TransactionItem(
-            type=tx.type.value,
-            amount=tx.amount,
-            status=tx.status.value,
-            created_at=tx.created_at,
-        )
+    # Rows are already in the TransactionItem shape; returning the response
+    # directly skips response_model re-validation and jsonable_encoder.
+    return json_response([
+        {
+            "type": tx.type.value,
+            "amount": tx.amount,
+            "status": tx.status.value,
+            "created_at": tx.created_at,
+        }
         for tx in txs
-    ]
+    ])
+
+
+@router.get("/transactions/search", response_model=TransactionSearchResponse)
+async def search_wallet_transactions(
+    tx_type: TransactionType | None = Query(None, alias="type"),
+    status_filter: TransactionStatus | None = Query(None, alias="status"),
+    min_amount: int | None = Query(None, ge=0),
+    max_amount: int | None = Query(None, ge=0),
+    created_from: datetime | None = Query(None, alias="from"),
+    created_to: datetime | None = Query(None, alias="to"),
+    counterparty: str | None = Query(None, description="counterparty wallet number"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    principal: Principal = Depends(get_principal),
+    db: Session = Depends(get_read_db),
+):
+    require_permission(principal, "read")
+    enforce_rate_limit(principal, "read")
+
+    wallet = find_wallet(db, principal.user_pk)
+    if not wallet:
+        return json_response({"items": [], "next_cursor": None, "total": 0, "total_is_estimate": False})
+
+    filters = TransactionFilters(
+        type=tx_type,
+        status=status_filter,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    if counterparty is not None:
+        filters.counterparty_wallet_id = resolve_wallet_id(db, counterparty)
+        if filters.counterparty_wallet_id is None:
+            return json_response({"items": [], "next_cursor": None, "total": 0, "total_is_estimate": False})
+
+    items, next_cursor = search_transactions(db, wallet.id, filters, limit, cursor)
+    total, total_is_estimate = None, False
+    if cursor is None:
+        if next_cursor is None:
+            total = len(items)
+        else:
+            total, total_is_estimate = estimate_count(db, wallet.id, filters)
+
+    return json_response({
+        "items": items,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+    })
+
+
+@router.get("/summary", response_model=list[WalletSummaryItem])
+async def get_wallet_summary(
+    days: int = Query(30, ge=1, le=366),
+    principal: Principal = Depends(get_principal),
+    db: Session = Depends(get_read_db),
+):
+    require_permission(principal, "read")
+    enforce_rate_limit(principal, "read")
+
+    wallet = find_wallet(db, principal.user_pk)
+    if not wallet:
+        return json_response([])
+
+    return json_response(wallet_summary(db, wallet.id, days))
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from typing import Optional
 from pydantic import BaseModel, Field
 
 class DepositRequest(BaseModel):
@@ -28,3 +29,26 @@ class TransactionItem(BaseModel):
     type: str
     amount: int
     status: str
+    created_at: datetime
+
+class TransactionSearchItem(BaseModel):
+    reference: str
+    type: str
+    status: str
+    amount: int
+    counterparty_wallet_number: Optional[str] = None
+    created_at: datetime
+
+class TransactionSearchResponse(BaseModel):
+    items: list[TransactionSearchItem]
+    next_cursor: Optional[str] = None
+    # only on the first page (no cursor)
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+class WalletSummaryItem(BaseModel):
+    day: date
+    inflow_count: int
+    inflow_total: int
+    outflow_count: int
+    outflow_total: int
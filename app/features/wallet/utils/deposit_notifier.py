@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Iterable
+
+from sqlalchemy.orm import Session
+
+from app.core.events import event_bus
+from app.core.metrics import register_collector
+
+CHANNEL = "deposit_status"
+
+
+class DepositWatch:
+    """
+    One parked request. set() may be called from any thread.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._event = asyncio.Event()
+        self.status: str | None = None
+
+    def set(self, status: str) -> None:
+        self.status = status
+        self._loop.call_soon_threadsafe(self._event.set)
+
+    async def wait(self, timeout: float) -> str | None:
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.status
+
+
+class DepositNotifier:
+    """
+    In-process registry of requests waiting on a deposit reference. Status
+    changes reach it through the event bus, so a webhook handled by any
+    worker wakes the waiters in every worker.
+    """
+
+    def __init__(self):
+        self._watches: dict[str, set[DepositWatch]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def watch(self, reference: str):
+        """
+        Register before reading the current status so a change committed in
+        between is not missed.
+        """
+        watch = DepositWatch(asyncio.get_running_loop())
+        with self._lock:
+            self._watches.setdefault(reference, set()).add(watch)
+        try:
+            yield watch
+        finally:
+            with self._lock:
+                watches = self._watches.get(reference)
+                if watches is not None:
+                    watches.discard(watch)
+                    if not watches:
+                        del self._watches[reference]
+
+    def notify(self, reference: str, status: str) -> None:
+        with self._lock:
+            watches = list(self._watches.get(reference, ()))
+        for watch in watches:
+            watch.set(status)
+
+    def handle_event(self, payload: str) -> None:
+        # payload: "<reference>:<status>,<reference>:<status>,..."
+        for item in payload.split(","):
+            reference, _, status = item.rpartition(":")
+            if reference:
+                self.notify(reference, status)
+
+    def collect(self):
+        with self._lock:
+            waiting = sum(len(watches) for watches in self._watches.values())
+        yield ("deposit_status_waiters", "gauge", "Requests parked on a deposit status change", waiting)
+
+
+deposit_notifier = DepositNotifier()
+event_bus.subscribe(CHANNEL, deposit_notifier.handle_event)
+register_collector(deposit_notifier.collect)
+
+
+def publish_deposit_statuses(db: Session, changes: Iterable[tuple[str, str]]) -> None:
+    """
+    Announce (reference, status) changes; delivered when `db` commits.
+    """
+    items = [f"{reference}:{status}" for reference, status in changes]
+    if items:
+        event_bus.publish_many(db, CHANNEL, items)
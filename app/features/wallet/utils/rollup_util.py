@@ -0,0 +1,196 @@
+import random
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import Date, delete, func, select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.settings import get_settings
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.rollup_model import WalletDailyRollup
+from app.features.wallet.models.wallet_model import Wallet
+
+INFLOW_TYPES = {TransactionType.DEPOSIT, TransactionType.TRANSFER_IN}
+
+# (wallet_id, day, type, amount) for one successful transaction
+RollupEntry = tuple[int, date, TransactionType, int]
+
+# one transaction-scoped lock per (wallet_id, day ordinal), taken in key order
+_LOCK_DAYS_SQL = text(
+    "SELECT count(pg_advisory_xact_lock(k.wallet_id, k.day)) FROM ("
+    "SELECT wallet_id, day FROM unnest(CAST(:wallet_ids AS integer[]), CAST(:days AS integer[])) "
+    "AS k(wallet_id, day) ORDER BY wallet_id, day) AS k"
+)
+
+
+def _lock_days(db: Session, keys: Iterable[tuple[int, date]]) -> None:
+    """
+    Serialise late writes to a closed (wallet_id, day) with its recount.
+    Without it a recount could miss a credit that is inserting the day's
+    first row and then overwrite it on conflict. Postgres only; SQLite
+    already runs one writer at a time.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    keys = sorted(set(keys))
+    if keys:
+        db.execute(_LOCK_DAYS_SQL, {
+            "wallet_ids": [wallet_id for wallet_id, _ in keys],
+            "days": [day.toordinal() for _, day in keys],
+        })
+
+
+def _upsert(db: Session, rows: list[dict], replace: bool = False) -> None:
+    """
+    Add `rows` onto the existing rollup rows, or overwrite them with
+    `replace`. Rows must be sorted by key so concurrent writers lock in the
+    same order.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for row in rows:
+            existing = db.get(WalletDailyRollup, (row["wallet_id"], row["day"], row["type"], row["shard_no"]))
+            if existing and replace:
+                existing.count, existing.total = row["count"], row["total"]
+            elif existing:
+                existing.count += row["count"]
+                existing.total += row["total"]
+            else:
+                db.add(WalletDailyRollup(**row))
+        return
+
+    stmt = insert(WalletDailyRollup)
+    if replace:
+        set_ = {"count": stmt.excluded.count, "total": stmt.excluded.total}
+    else:
+        set_ = {
+            "count": WalletDailyRollup.count + stmt.excluded.count,
+            "total": WalletDailyRollup.total + stmt.excluded.total,
+        }
+    db.execute(stmt.on_conflict_do_update(index_elements=["wallet_id", "day", "type", "shard_no"], set_=set_), rows)
+
+
+def _sorted_rows(grouped: dict) -> list[dict]:
+    return [
+        {"wallet_id": wallet_id, "day": day, "type": tx_type, "shard_no": shard_no, "count": count, "total": total}
+        for (wallet_id, day, tx_type, shard_no), (count, total) in sorted(
+            grouped.items(), key=lambda kv: (kv[0][0], kv[0][1], kv[0][2].value, kv[0][3])
+        )
+    ]
+
+
+def add_to_rollups(db: Session, entries: Iterable[RollupEntry]) -> None:
+    """
+    Fold successful transactions into the daily rollups in the caller's
+    transaction. Does nothing when WALLET_ROLLUP_MODE=job (the catch-up job
+    owns the table then).
+
+    Sharded wallets add onto a random one of their `shard_count` rollup
+    rows so hot recipients don't queue on a single row lock. Credits to a
+    day that has already ended (deposits confirmed after midnight) lock the
+    day against the catch-up job's recount first.
+    """
+    if get_settings().wallet_rollup_mode != "incremental":
+        return
+    entries = list(entries)
+    if not entries:
+        return
+    wallet_ids = {wallet_id for wallet_id, _, _, _ in entries}
+    shard_counts = dict(db.execute(
+        select(Wallet.id, Wallet.shard_count).where(Wallet.id.in_(wallet_ids), Wallet.shard_count > 0)
+    ).all())
+    today = datetime.now(timezone.utc).date()
+    _lock_days(db, [(wallet_id, day) for wallet_id, day, _, _ in entries if day < today])
+
+    grouped = defaultdict(lambda: [0, 0])
+    for wallet_id, day, tx_type, amount in entries:
+        shard_no = random.randrange(shard_counts[wallet_id]) if wallet_id in shard_counts else 0
+        bucket = grouped[(wallet_id, day, tx_type, shard_no)]
+        bucket[0] += 1
+        bucket[1] += amount
+    _upsert(db, _sorted_rows(grouped))
+
+
+def rebuild_rollups(db: Session, keys: Iterable[tuple[int, date]]) -> None:
+    """
+    Recount the rollup rows of each (wallet_id, day) in `keys` from the
+    transactions table and overwrite them, so rebuilding a day twice gives
+    the same rows. The totals land on shard 0 and other shard rows are
+    dropped. The days are locked before counting: a late writer holding
+    the lock has committed by the time the count runs, and one arriving
+    later adds on top of the recount.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    _lock_days(db, keys)
+    wallet_ids = sorted({wallet_id for wallet_id, _ in keys})
+    first, last = min(day for _, day in keys), max(day for _, day in keys)
+
+    existing = db.execute(
+        select(WalletDailyRollup.wallet_id, WalletDailyRollup.day, WalletDailyRollup.type, WalletDailyRollup.shard_no)
+        .where(WalletDailyRollup.wallet_id.in_(wallet_ids), WalletDailyRollup.day.between(first, last))
+    ).all()
+
+    tx_day = func.date(Transaction.created_at, type_=Date)
+    counts = db.execute(
+        select(Transaction.wallet_id, tx_day, Transaction.type, func.count(), func.sum(Transaction.amount))
+        .where(
+            Transaction.status == TransactionStatus.SUCCESS,
+            Transaction.wallet_id.in_(wallet_ids),
+            Transaction.created_at >= datetime.combine(first, time.min),
+            Transaction.created_at < datetime.combine(last + timedelta(days=1), time.min),
+        )
+        .group_by(Transaction.wallet_id, tx_day, Transaction.type)
+    ).all()
+
+    grouped = {
+        (wallet_id, day, tx_type, 0): (count, total)
+        for wallet_id, day, tx_type, count, total in counts
+        if (wallet_id, day) in keys
+    }
+    emptied = [tuple(row) for row in existing if (row[0], row[1]) in keys and tuple(row) not in grouped]
+    if emptied:
+        db.execute(delete(WalletDailyRollup).where(
+            tuple_(
+                WalletDailyRollup.wallet_id, WalletDailyRollup.day, WalletDailyRollup.type, WalletDailyRollup.shard_no
+            ).in_(emptied)
+        ))
+    if grouped:
+        _upsert(db, _sorted_rows(grouped), replace=True)
+
+
+def rollup_day(created_at: datetime) -> date:
+    """
+    The UTC day a transaction counts towards: the day it was created, on
+    every write path and in the catch-up job.
+    """
+    return created_at.date()
+
+
+def wallet_summary(db: Session, wallet_id: int, days: int) -> list[dict]:
+    """
+    Daily inflow/outflow for the last `days` UTC days (newest first), only
+    for days with activity.
+    """
+    since = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+    rows = (
+        db.query(WalletDailyRollup.day, WalletDailyRollup.type, WalletDailyRollup.count, WalletDailyRollup.total)
+        .filter(WalletDailyRollup.wallet_id == wallet_id, WalletDailyRollup.day >= since)
+        .order_by(WalletDailyRollup.day.desc())
+        .all()
+    )
+    by_day = {}
+    for day, tx_type, count, total in rows:
+        item = by_day.setdefault(day, {
+            "day": day, "inflow_count": 0, "inflow_total": 0, "outflow_count": 0, "outflow_total": 0,
+        })
+        side = "inflow" if tx_type in INFLOW_TYPES else "outflow"
+        item[f"{side}_count"] += count
+        item[f"{side}_total"] += total
+    return list(by_day.values())
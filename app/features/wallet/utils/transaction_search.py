@@ -0,0 +1,157 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.core.settings import get_settings
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.wallet_model import Wallet
+
+
+@dataclass
+class TransactionFilters:
+    type: TransactionType | None = None
+    status: TransactionStatus | None = None
+    min_amount: int | None = None
+    max_amount: int | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+    counterparty_wallet_id: int | None = None
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    # created_at is stored as naive UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(created_at: datetime, tx_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{tx_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, tx_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(tx_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _conditions(wallet_id: int, filters: TransactionFilters) -> list:
+    # wallet_id always leads: a range scan of ix_transactions_wallet_history,
+    # or of ix_transactions_counterparty_history with a counterparty
+    conditions = [Transaction.wallet_id == wallet_id]
+    if filters.type is not None:
+        conditions.append(Transaction.type == filters.type)
+    if filters.status is not None:
+        conditions.append(Transaction.status == filters.status)
+    if filters.min_amount is not None:
+        conditions.append(Transaction.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        conditions.append(Transaction.amount <= filters.max_amount)
+    if filters.created_from is not None:
+        conditions.append(Transaction.created_at >= _naive_utc(filters.created_from))
+    if filters.created_to is not None:
+        conditions.append(Transaction.created_at < _naive_utc(filters.created_to))
+    if filters.counterparty_wallet_id is not None:
+        conditions.append(Transaction.counterparty_wallet_id == filters.counterparty_wallet_id)
+    return conditions
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_count(db: Session, wallet_id: int, filters: TransactionFilters) -> tuple[int, bool]:
+    """
+    (count, is_estimate). Counts exactly up to
+    TRANSACTION_SEARCH_EXACT_COUNT_LIMIT rows, which stays a short index scan.
+    Past that, PostgreSQL returns the planner's row estimate and other
+    databases return the limit itself.
+    """
+    limit = get_settings().transaction_search_exact_count_limit
+    matching = select(Transaction.id).where(*_conditions(wallet_id, filters))
+
+    capped = db.scalar(select(func.count()).select_from(matching.limit(limit + 1).subquery()))
+    if capped <= limit:
+        return capped, False
+    if db.get_bind().dialect.name != "postgresql":
+        return limit, True
+    plan = db.execute(_Explain(matching)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return max(int(plan[0]["Plan"]["Plan Rows"]), limit + 1), True
+
+
+def search_transactions(
+    db: Session,
+    wallet_id: int,
+    filters: TransactionFilters,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[dict], str | None]:
+    """
+    One page of the wallet's transactions matching `filters`, newest first,
+    plus the cursor for the next page (None on the last page). Pages are
+    keyed on (created_at, id), so deep pages cost the same as the first.
+    """
+    counterparty = aliased(Wallet)
+    stmt = (
+        select(
+            Transaction.id,
+            Transaction.reference,
+            Transaction.type,
+            Transaction.status,
+            Transaction.amount,
+            Transaction.created_at,
+            counterparty.wallet_number.label("counterparty_wallet_number"),
+        )
+        .select_from(Transaction)
+        .outerjoin(counterparty, counterparty.id == Transaction.counterparty_wallet_id)
+        .where(*_conditions(wallet_id, filters))
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, tx_id = decode_cursor(cursor)
+        # row comparison: one index range condition on PostgreSQL
+        stmt = stmt.where(tuple_(Transaction.created_at, Transaction.id) < (created_at, tx_id))
+
+    rows = db.execute(stmt).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return [
+        {
+            "reference": row.reference,
+            "type": row.type.value,
+            "status": row.status.value,
+            "amount": row.amount,
+            "counterparty_wallet_number": row.counterparty_wallet_number,
+            "created_at": row.created_at,
+        }
+        for row in rows
+    ], next_cursor
@@ -0,0 +1,80 @@
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.ids import time_ordered_hex
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.wallet_model import Wallet
+from app.features.wallet.utils.rollup_util import add_to_rollups, rollup_day
+from app.features.wallet.utils.wallet_cache import resolve_wallet_id
+from app.features.wallet.utils.wallet_util import credit_wallet_id, debit_wallet
+
+
+def resolve_recipient(db: Session, sender_wallet: Wallet, wallet_number: str) -> int:
+    if sender_wallet.wallet_number == wallet_number:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot transfer to same wallet",
+        )
+    recipient_wallet_id = resolve_wallet_id(db, wallet_number)
+    if recipient_wallet_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipient wallet not found",
+        )
+    return recipient_wallet_id
+
+
+def perform_transfer(db: Session, sender_wallet: Wallet, wallet_number: str, amount: int) -> tuple[Transaction, Transaction]:
+    """
+    Move `amount` from `sender_wallet` to the wallet with `wallet_number`,
+    recording the TRANSFER_OUT/TRANSFER_IN pair. Raises HTTPException
+    (400/404) for invalid transfers; the caller commits.
+    """
+    if amount <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Amount must be positive",
+        )
+    recipient_wallet_id = resolve_recipient(db, sender_wallet, wallet_number)
+
+    # Touch the two wallet rows in id order, so transfers in opposite
+    # directions can't deadlock. A failed debit raises after the credit; the
+    # caller's rollback undoes both.
+    if recipient_wallet_id < sender_wallet.id:
+        credit_wallet_id(db, recipient_wallet_id, amount)
+        debit_wallet(db, sender_wallet, amount)
+    else:
+        debit_wallet(db, sender_wallet, amount)
+        credit_wallet_id(db, recipient_wallet_id, amount)
+    # one timestamp for both rows and their rollup day, so a transfer at
+    # midnight lands on the same day here and in the catch-up job
+    created_at = datetime.utcnow()
+    day = rollup_day(created_at)
+    add_to_rollups(db, [
+        (sender_wallet.id, day, TransactionType.TRANSFER_OUT, amount),
+        (recipient_wallet_id, day, TransactionType.TRANSFER_IN, amount),
+    ])
+
+    out_tx = Transaction(
+        wallet_id=sender_wallet.id,
+        type=TransactionType.TRANSFER_OUT,
+        status=TransactionStatus.SUCCESS,
+        amount=amount,
+        reference=f"tr_out_{time_ordered_hex()}",
+        counterparty_wallet_id=recipient_wallet_id,
+        created_at=created_at,
+    )
+    in_tx = Transaction(
+        wallet_id=recipient_wallet_id,
+        type=TransactionType.TRANSFER_IN,
+        status=TransactionStatus.SUCCESS,
+        amount=amount,
+        reference=f"tr_in_{time_ordered_hex()}",
+        counterparty_wallet_id=sender_wallet.id,
+        created_at=created_at,
+    )
+    db.add(out_tx)
+    db.add(in_tx)
+    return out_tx, in_tx
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import register_collector
+from app.core.settings import get_settings
+from app.features.wallet.models.wallet_model import Wallet
+
+
+class WalletNumberCache:
+    """
+    LRU map of wallet_number -> wallet id. Wallet numbers never change once
+    get_or_create_wallet assigns them, so entries never need invalidating.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, wallet_number: str) -> int | None:
+        with self._lock:
+            wallet_id = self._entries.get(wallet_number)
+            if wallet_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(wallet_number)
+            self.hits += 1
+            return wallet_id
+
+    def put(self, wallet_number: str, wallet_id: int) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[wallet_number] = wallet_id
+            self._entries.move_to_end(wallet_number)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def collect(self):
+        yield ("wallet_number_cache_hits_total", "counter", "Recipient lookups served from cache", self.hits)
+        yield ("wallet_number_cache_misses_total", "counter", "Recipient lookups that queried wallets", self.misses)
+        yield ("wallet_number_cache_entries", "gauge", "Cached wallet numbers", len(self._entries))
+        yield ("wallet_number_cache_hit_ratio", "gauge", "Hits / lookups since start", round(self.hit_ratio(), 4))
+
+
+wallet_number_cache = WalletNumberCache(get_settings().wallet_number_cache_size)
+register_collector(wallet_number_cache.collect)
+
+
+def resolve_wallet_id(db: Session, wallet_number: str) -> int | None:
+    wallet_id = wallet_number_cache.get(wallet_number)
+    if wallet_id is not None:
+        return wallet_id
+    wallet_id = db.query(Wallet.id).filter(Wallet.wallet_number == wallet_number).scalar()
+    if wallet_id is not None:
+        wallet_number_cache.put(wallet_number, wallet_id)
+    return wallet_id
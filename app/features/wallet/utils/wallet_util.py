@@ -1,14 +1,29 @@
 import hmac
 import hashlib
-from app.features.wallet.models.wallet_model import Wallet
+import random
+from app.features.wallet.models.wallet_model import Wallet, WalletBalanceShard
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.utils.rollup_util import add_to_rollups, rollup_day
+from app.features.wallet.utils.deposit_notifier import publish_deposit_statuses
+from app.features.transaction.utils.meta_util import store_transaction_meta
+from app.core.ids import time_ordered_hex
+from fastapi import HTTPException, status
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 from uuid import uuid4
 
-def get_or_create_wallet(db: Session, user_id: str) -> Wallet:
-    wallet = db.query(Wallet).filter(Wallet.user_id == user_id).first()
+def find_wallet(db: Session, user_pk: int) -> Wallet | None:
+    """
+    Read-only wallet lookup, safe to run against a read replica.
+    """
+    return db.query(Wallet).filter(Wallet.user_pk == user_pk).first()
+
+
+def get_or_create_wallet(db: Session, user_pk: int, user_id: str) -> Wallet:
+    wallet = db.query(Wallet).filter(Wallet.user_pk == user_pk).first()
     if wallet:
         return wallet
-    wallet = Wallet(user_id=user_id, wallet_number=uuid4().hex, balance=0)
+    wallet = Wallet(user_id=user_id, user_pk=user_pk, wallet_number=uuid4().hex, balance=0)
     db.add(wallet)
     db.commit()
     db.refresh(wallet)
@@ -25,4 +40,191 @@ def verify_paystack_signature(raw_body: bytes, signature: str, secret: str) -> b
 
 
 def generate_reference_number() -> str:
-    return f"dep_{uuid4().hex}"
\ No newline at end of file
+    return f"dep_{time_ordered_hex()}"
+
+
+def _credit_shard(db: Session, wallet_id: int, shard_count: int, amount: int) -> bool:
+    shard_no = random.randrange(shard_count)
+    result = db.execute(
+        update(WalletBalanceShard)
+        .where(
+            WalletBalanceShard.wallet_id == wallet_id,
+            WalletBalanceShard.shard_no == shard_no,
+        )
+        .values(balance=WalletBalanceShard.balance + amount)
+    )
+    # 0 rows: sharding was resized/disabled since shard_count was read
+    return result.rowcount == 1
+
+
+def credit_wallet_id(db: Session, wallet_id: int, amount: int) -> bool:
+    """
+    Add `amount` to the wallet with an in-place UPDATE (balance = balance +
+    amount), so concurrent credits never overwrite each other. Sharded
+    wallets take the credit on a random sub-balance row so concurrent
+    credits don't queue on one row lock. Returns False if the wallet
+    doesn't exist.
+    """
+    result = db.execute(
+        update(Wallet)
+        .where(Wallet.id == wallet_id, Wallet.shard_count == 0)
+        .values(balance=Wallet.balance + amount)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        return True
+    shard_count = db.query(Wallet.shard_count).filter(Wallet.id == wallet_id).scalar()
+    if shard_count is None:
+        return False
+    if shard_count and _credit_shard(db, wallet_id, shard_count, amount):
+        return True
+    db.execute(
+        update(Wallet)
+        .where(Wallet.id == wallet_id)
+        .values(balance=Wallet.balance + amount)
+        .execution_options(synchronize_session=False)
+    )
+    return True
+
+
+def _debit_main_balance(db: Session, wallet_id: int, amount: int) -> bool:
+    result = db.execute(
+        update(Wallet)
+        .where(Wallet.id == wallet_id, Wallet.balance >= amount)
+        .values(balance=Wallet.balance - amount)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def debit_wallet(db: Session, wallet: Wallet, amount: int) -> None:
+    """
+    Subtract `amount` from the wallet's main balance with one conditional
+    in-place UPDATE (... WHERE balance >= amount), so concurrent debits can
+    neither overdraw the wallet nor overwrite each other. Sharded wallets
+    pull in their shard balances first when the main balance alone can't
+    cover it.
+    """
+    debited = _debit_main_balance(db, wallet.id, amount)
+    if not debited and wallet.shard_count:
+        consolidate_wallet_shards(db, wallet)
+        debited = _debit_main_balance(db, wallet.id, amount)
+    # the loaded balance is stale now; never flush it back
+    db.expire(wallet, ["balance"])
+    if not debited:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient balance",
+        )
+
+
+def wallet_total_balance(db: Session, wallet: Wallet) -> int:
+    if not wallet.shard_count:
+        return wallet.balance
+    shard_total = (
+        db.query(func.coalesce(func.sum(WalletBalanceShard.balance), 0))
+        .filter(WalletBalanceShard.wallet_id == wallet.id)
+        .scalar()
+    )
+    return wallet.balance + shard_total
+
+
+def consolidate_wallet_shards(db: Session, wallet: Wallet) -> int:
+    """
+    Move all shard balances into the wallet's main balance. Locks the shard
+    rows for the rest of the transaction; the caller commits.
+    """
+    # core statements, not ORM attribute changes: set_wallet_shards deletes
+    # shard rows in bulk right after, and a pending ORM flush would then
+    # try to update rows that are gone
+    balances = db.scalars(
+        select(WalletBalanceShard.balance)
+        .where(WalletBalanceShard.wallet_id == wallet.id)
+        .with_for_update()
+    ).all()
+    moved = sum(balances)
+    if moved:
+        db.execute(
+            update(WalletBalanceShard)
+            .where(WalletBalanceShard.wallet_id == wallet.id)
+            .values(balance=0)
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(Wallet)
+            .where(Wallet.id == wallet.id)
+            .values(balance=Wallet.balance + moved)
+            .execution_options(synchronize_session=False)
+        )
+        db.expire(wallet, ["balance"])
+    return moved
+
+
+def set_wallet_shards(db: Session, wallet: Wallet, shard_count: int) -> None:
+    """
+    Enable (shard_count > 0), resize or disable (0) balance sharding for a
+    wallet. Existing shard balances are always folded back in first.
+    """
+    if shard_count < 0:
+        raise ValueError("shard_count must be >= 0")
+    consolidate_wallet_shards(db, wallet)
+    db.query(WalletBalanceShard).filter(
+        WalletBalanceShard.wallet_id == wallet.id,
+        WalletBalanceShard.shard_no >= shard_count,
+    ).delete(synchronize_session=False)
+    existing = {
+        no for (no,) in db.query(WalletBalanceShard.shard_no)
+        .filter(WalletBalanceShard.wallet_id == wallet.id)
+    }
+    for shard_no in range(shard_count):
+        if shard_no not in existing:
+            db.add(WalletBalanceShard(wallet_id=wallet.id, shard_no=shard_no, balance=0))
+    wallet.shard_count = shard_count
+
+
+def apply_paystack_event(db: Session, payload: dict, source: str = "webhook") -> Wallet | None:
+    """
+    Apply one Paystack event (webhook payload or verify result) to its
+    deposit transaction. Unknown references, non-deposit transactions and
+    transactions that already succeeded are ignored, so applying the same
+    event twice credits once. The row is locked (FOR UPDATE) before its
+    status is checked: a concurrent webhook, batch replay or reconciliation
+    run waits for this transaction and then sees SUCCESS. Returns the
+    credited wallet, if any; the caller commits.
+    """
+    data = payload.get("data") or {}
+    reference = data.get("reference")
+    status_str = data.get("status")
+
+    if not reference:
+        return None
+
+    tx = (
+        db.query(Transaction)
+        .filter(Transaction.reference == reference, Transaction.type == TransactionType.DEPOSIT)
+        .with_for_update()
+        .populate_existing()
+        .first()
+    )
+    if not tx:
+        # Unknown reference, ignore for security
+        return None
+
+    # Idempotency: if already success, do nothing
+    if tx.status == TransactionStatus.SUCCESS:
+        return None
+
+    store_transaction_meta(db, tx, payload, source=source)
+
+    if status_str == "success":
+        wallet = db.get(Wallet, tx.wallet_id)
+        # in-place UPDATE: concurrent credits to the wallet don't overwrite each other
+        credit_wallet_id(db, tx.wallet_id, tx.amount)
+        tx.status = TransactionStatus.SUCCESS
+        add_to_rollups(db, [(tx.wallet_id, rollup_day(tx.created_at), TransactionType.DEPOSIT, tx.amount)])
+        publish_deposit_statuses(db, [(reference, tx.status.value)])
+        return wallet
+    if status_str in {"failed", "abandoned"}:
+        tx.status = TransactionStatus.FAILED
+        publish_deposit_statuses(db, [(reference, tx.status.value)])
+    return None
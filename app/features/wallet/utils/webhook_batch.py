@@ -0,0 +1,183 @@
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import Integer, bindparam, column, select, update, values
+from sqlalchemy.orm import Session
+
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.transaction.utils.meta_util import archive_payloads, compact_meta, meta_policy
+from app.features.wallet.models.wallet_model import Wallet
+from app.features.wallet.utils.wallet_util import credit_wallet_id
+from app.features.wallet.utils.rollup_util import add_to_rollups, rollup_day
+from app.features.wallet.utils.deposit_notifier import publish_deposit_statuses
+
+# keeps the IN (...) list and VALUES list well under driver parameter limits
+LOOKUP_CHUNK = 5000
+
+FAILED_STATUSES = {"failed", "abandoned"}
+
+
+def _latest_event_per_reference(events: Iterable[dict]) -> dict:
+    """
+    Collapse events to one per reference. A success event always wins, so a
+    replay containing (pending, success) for a reference credits once.
+    """
+    by_reference = {}
+    for event in events:
+        data = event.get("data") or {}
+        reference = data.get("reference")
+        if not reference:
+            continue
+        current = by_reference.get(reference)
+        if current is not None and (current.get("data") or {}).get("status") == "success":
+            continue
+        by_reference[reference] = event
+    return by_reference
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _apply_wallet_credits(db: Session, credits: dict) -> None:
+    """
+    Add the aggregated amounts to their wallets, one UPDATE ... FROM (VALUES)
+    per chunk on PostgreSQL. Sharded wallets go through credit_wallet_id.
+
+    Wallets are handled in id order and each chunk's rows are locked with
+    SELECT ... ORDER BY id FOR NO KEY UPDATE before its UPDATE, whose join
+    locks rows in whatever order the planner picks. Overlapping batches, and
+    transfers (which also lock the lower id first), then queue instead of
+    deadlocking. NO KEY UPDATE is the lock the UPDATE takes anyway; plain
+    FOR UPDATE would also conflict with the key-share locks that foreign
+    key checks (rollup inserts) hold on wallets.
+    """
+    sharded = sorted(
+        wallet_id
+        for (wallet_id,) in db.query(Wallet.id).filter(Wallet.id.in_(list(credits)), Wallet.shard_count > 0)
+    )
+    for wallet_id in sharded:
+        credit_wallet_id(db, wallet_id, credits.pop(wallet_id))
+
+    rows = sorted(credits.items())
+    if not rows:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        for chunk in _chunks(rows, LOOKUP_CHUNK):
+            db.execute(
+                select(Wallet.id)
+                .where(Wallet.id.in_([wallet_id for wallet_id, _ in chunk]))
+                .order_by(Wallet.id)
+                .with_for_update(key_share=True)
+            ).all()
+            batch = values(
+                column("wallet_id", Integer),
+                column("amount", Integer),
+                name="credits",
+            ).data(chunk)
+            db.execute(
+                update(Wallet)
+                .where(Wallet.id == batch.c.wallet_id)
+                .values(balance=Wallet.balance + batch.c.amount)
+                .execution_options(synchronize_session=False)
+            )
+    else:
+        wallets = Wallet.__table__
+        db.execute(
+            update(wallets)
+            .where(wallets.c.id == bindparam("b_wallet_id"))
+            .values(balance=wallets.c.balance + bindparam("b_amount")),
+            [{"b_wallet_id": wallet_id, "b_amount": amount} for wallet_id, amount in rows],
+        )
+
+
+def apply_paystack_events(db: Session, events: Iterable[dict], source: str = "webhook") -> dict:
+    """
+    Apply a batch of Paystack webhook payloads with set-based SQL.
+
+    Same guarantees as paystack_webhook: unknown references and
+    non-deposit transactions are ignored,
+    transactions already in SUCCESS are never touched again, and a wallet is
+    credited exactly once per transaction that flips to SUCCESS. The rows
+    are locked (FOR UPDATE, in id order) before their status is read, the
+    same way apply_paystack_event does it, so concurrent appliers queue on
+    the row and can't both credit the same transaction; the flip itself is
+    also guarded by `status != SUCCESS ... RETURNING`. The caller commits.
+    """
+    by_reference = _latest_event_per_reference(events)
+    summary = {"received": len(by_reference), "unknown": 0, "skipped": 0,
+               "credited": 0, "failed": 0, "updated": 0}
+    if not by_reference:
+        return summary
+
+    known = {}
+    for chunk in _chunks(list(by_reference), LOOKUP_CHUNK):
+        rows = db.execute(
+            select(Transaction.id, Transaction.reference, Transaction.status)
+            .where(Transaction.reference.in_(chunk), Transaction.type == TransactionType.DEPOSIT)
+            .order_by(Transaction.id)
+            .with_for_update()
+        ).all()
+        for tx_id, reference, tx_status in rows:
+            known[reference] = (tx_id, tx_status)
+    summary["unknown"] = len(by_reference) - len(known)
+
+    pending = {ref: tx_id for ref, (tx_id, tx_status) in known.items() if tx_status != TransactionStatus.SUCCESS}
+    summary["skipped"] = len(known) - len(pending)
+    if not pending:
+        return summary
+
+    # store the payload on every transaction we are about to touch
+    if meta_policy() == "full":
+        meta_rows = [{"id": tx_id, "meta": by_reference[ref]} for ref, tx_id in pending.items()]
+    else:
+        meta_rows = [{"id": tx_id, "meta": compact_meta(by_reference[ref])} for ref, tx_id in pending.items()]
+        archive_payloads(db, ((ref, source, by_reference[ref]) for ref in pending))
+    db.execute(update(Transaction), meta_rows)
+
+    success_ids, failed_ids = [], []
+    for ref, tx_id in pending.items():
+        status_str = (by_reference[ref].get("data") or {}).get("status")
+        if status_str == "success":
+            success_ids.append(tx_id)
+        elif status_str in FAILED_STATUSES:
+            failed_ids.append(tx_id)
+    summary["updated"] = len(pending) - len(success_ids) - len(failed_ids)
+
+    credits = defaultdict(int)
+    rollups = []
+    changed = []
+    for chunk in _chunks(success_ids, LOOKUP_CHUNK):
+        flipped = db.execute(
+            update(Transaction)
+            .where(Transaction.id.in_(chunk), Transaction.status != TransactionStatus.SUCCESS)
+            .values(status=TransactionStatus.SUCCESS)
+            .returning(Transaction.reference, Transaction.wallet_id, Transaction.amount,
+                       Transaction.type, Transaction.created_at)
+            .execution_options(synchronize_session=False)
+        ).all()
+        for reference, wallet_id, amount, tx_type, created_at in flipped:
+            changed.append((reference, TransactionStatus.SUCCESS.value))
+            credits[wallet_id] += amount
+            rollups.append((wallet_id, rollup_day(created_at), tx_type, amount))
+            summary["credited"] += 1
+
+    for chunk in _chunks(failed_ids, LOOKUP_CHUNK):
+        failed = db.execute(
+            update(Transaction)
+            .where(Transaction.id.in_(chunk), Transaction.status != TransactionStatus.SUCCESS)
+            .values(status=TransactionStatus.FAILED)
+            .returning(Transaction.reference)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        changed.extend((reference, TransactionStatus.FAILED.value) for reference in failed)
+        summary["failed"] += len(failed)
+
+    if credits:
+        _apply_wallet_credits(db, dict(credits))
+        add_to_rollups(db, rollups)
+    publish_deposit_statuses(db, changed)
+
+    return summary
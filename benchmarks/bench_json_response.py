@@ -0,0 +1,73 @@
+"""
+Compare the default FastAPI serialization path for list endpoints with the
+FastJSONResponse path.
+
+    python -m benchmarks.bench_json_response --rows 500 --repeat 200
+
+"before": build a TransactionItem per row, validate the list against the
+response_model, run jsonable_encoder and render with JSONResponse.
+"after": render the row dicts directly with FastJSONResponse.
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse, orjson
+from app.features.wallet.schemas.wallet_schema import TransactionItem
+
+
+def make_rows(n: int):
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "type": "transfer_in" if i % 3 else "deposit",
+            "amount": 1000 + i,
+            "status": "success",
+            "created_at": start + timedelta(seconds=i),
+        }
+        for i in range(n)
+    ]
+
+
+def before(rows, adapter):
+    items = [TransactionItem(**row) for row in rows]
+    validated = adapter.validate_python(items)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def after(rows, adapter):
+    return FastJSONResponse(rows).body
+
+
+def run(fn, rows, adapter, repeat: int) -> float:
+    fn(rows, adapter)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(rows, adapter)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    adapter = TypeAdapter(list[TransactionItem])
+
+    slow = run(before, rows, adapter, args.repeat)
+    fast = run(after, rows, adapter, args.repeat)
+
+    print(f"rows={args.rows} repeat={args.repeat} orjson={'yes' if orjson else 'no'}")
+    print(f"before: {slow * 1000:8.3f} ms/response")
+    print(f"after:  {fast * 1000:8.3f} ms/response")
+    print(f"speedup: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare unique-index insert throughput for random (uuid4) and time-ordered
+(uuid7) transaction references.
+
+    python -m benchmarks.bench_reference_inserts --rows 2000000 --batch 10000
+    python -m benchmarks.bench_reference_inserts --database-url postgresql://...
+
+Each scheme gets its own scratch table shaped like `transactions.reference`,
+with a unique index on it. The benchmark fills the table in batches and
+reports the overall rate and the rate over the last 10% of rows, which is
+where a random-key index stops fitting in cache. On PostgreSQL it also
+reports the final index size; page splits leave random-key indexes larger.
+Tables are dropped afterwards.
+"""
+import argparse
+import time
+from uuid import uuid4
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, insert, text
+
+from app.core.ids import time_ordered_hex
+
+SCHEMES = {
+    "uuid4": lambda: uuid4().hex,
+    "uuid7": time_ordered_hex,
+}
+
+
+def run(engine, name: str, make_id, rows: int, batch: int) -> dict:
+    metadata = MetaData()
+    table = Table(
+        f"bench_refs_{name}",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("reference", String, nullable=False, unique=True),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    tail_from = rows - rows // 10
+    tail_started = None
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            for done in range(0, rows, batch):
+                if tail_started is None and done >= tail_from:
+                    tail_started = time.perf_counter()
+                n = min(batch, rows - done)
+                conn.execute(insert(table), [{"reference": f"dep_{make_id()}"} for _ in range(n)])
+                conn.commit()
+            elapsed = time.perf_counter() - started
+            tail = time.perf_counter() - (tail_started or started)
+
+            index_bytes = None
+            if engine.dialect.name == "postgresql":
+                index_bytes = conn.execute(
+                    text("SELECT pg_relation_size(indexrelid) FROM pg_index WHERE indrelid = CAST(:t AS regclass) AND indisunique AND NOT indisprimary"),
+                    {"t": table.name},
+                ).scalar()
+    finally:
+        metadata.drop_all(engine)
+
+    return {
+        "rows_per_s": rows / elapsed,
+        "tail_rows_per_s": (rows - tail_from) / tail if tail else 0.0,
+        "index_mb": index_bytes / 1024 / 1024 if index_bytes is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--database-url", default="sqlite:///bench_reference_inserts.db")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    print(f"rows={args.rows} batch={args.batch} dialect={engine.dialect.name}")
+    results = {}
+    for name, make_id in SCHEMES.items():
+        results[name] = result = run(engine, name, make_id, args.rows, args.batch)
+        size = f"  index={result['index_mb']:.1f} MB" if result["index_mb"] is not None else ""
+        print(f"{name}: {result['rows_per_s']:10.0f} rows/s  last 10%: {result['tail_rows_per_s']:10.0f} rows/s{size}")
+
+    print(f"speedup (last 10%): {results['uuid7']['tail_rows_per_s'] / results['uuid4']['tail_rows_per_s']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Production server config: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py main:app
+
+Tunables (environment):
+    PORT                   listen port (8080)
+    WEB_CONCURRENCY        worker processes (CPU count)
+    MAX_REQUESTS           recycle a worker after this many requests (2000);
+                           bounds memory growth from argon2's large buffers
+    MAX_REQUESTS_JITTER    random spread so workers don't recycle together (200)
+    GRACEFUL_TIMEOUT       seconds in-flight requests get to finish on SIGTERM (30)
+    DB_MAX_CONNECTIONS     total DB connections for the whole container; each
+                           worker gets an equal share for its LISTEN connection
+                           and pools (see Settings.pool_limits)
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# The app reads WEB_CONCURRENCY to split DB_MAX_CONNECTIONS across workers.
+# Set it here: with preload_app the app (and its settings) load before any
+# server hook runs.
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# Import the app once in the master and fork it, so workers start fast and
+# share read-only pages. Safe because DB engines are only created in the
+# FastAPI lifespan, i.e. after the fork.
+preload_app = True
+
+max_requests = int(os.getenv("MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "200"))
+
+# SIGTERM: stop accepting, let in-flight requests finish, then run lifespan
+# shutdown (engine disposal) in each worker.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+accesslog = "-"
+errorlog = "-"
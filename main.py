@@ -1,20 +1,72 @@
 import os
-from fastapi import FastAPI
+import sys
+from contextlib import asynccontextmanager
 
-from app.features.auth.routers import auth_router
-from app.features.api_keys.routes import api_route
-from app.features.wallet.routes import wallet_route
-from app.features.transaction.routes import transaction_route
+from app.core.startup import StartupProfiler
 
-from dotenv import load_dotenv
+# `python main.py --profile-startup` (or PROFILE_STARTUP=1 under any server)
+# reports how long each import/initialisation step takes.
+profiler = StartupProfiler(
+    enabled="--profile-startup" in sys.argv or os.getenv("PROFILE_STARTUP") == "1"
+)
 
-load_dotenv()
+with profiler.step("import fastapi"):
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
 
-app = FastAPI()
-app.include_router(auth_router.router)
-app.include_router(api_route.router)
-app.include_router(wallet_route.router)
-# app.include_router(transaction_route.router)
+with profiler.step("load settings"):
+    from app.core.settings import get_settings
+    # validate configuration now so a bad deploy fails before serving traffic
+    get_settings()
+
+with profiler.step("import app.database.db"):
+    from app.database.db import init_engines, dispose_engines
+
+from app.core.responses import default_response_class
+from app.core.metrics import render_metrics
+from app.core.events import event_bus
+from app.core.admission import AdmissionMiddleware
+from app.core.tracing import TracingMiddleware, init_tracing, shutdown_tracing, tracing_configured
+from app.features.api_keys.utils.security import shutdown_hash_pool
+
+ROUTER_MODULES = (
+    "app.features.auth.routers.auth_router",
+    "app.features.api_keys.routes.api_route",
+    "app.features.wallet.routes.wallet_route",
+    "app.features.scheduled_transfers.routes.schedule_route",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    with profiler.step("create database engines"):
+        init_engines()
+    # per worker, after fork: the span exporter runs a background thread
+    init_tracing()
+    # cross-worker notifications (LISTEN/NOTIFY); a no-op off PostgreSQL
+    event_bus.start(get_settings().database_url)
+    if profiler.enabled:
+        profiler.report()
+    yield
+    event_bus.stop()
+    shutdown_hash_pool()
+    shutdown_tracing()
+    dispose_engines()
+
+
+app = FastAPI(default_response_class=default_response_class(), lifespan=lifespan)
+if get_settings().admission_control_enabled:
+    app.add_middleware(AdmissionMiddleware)
+# added last so it is outermost: rejected requests still get a span
+if tracing_configured():
+    app.add_middleware(TracingMiddleware)
+for module in ROUTER_MODULES:
+    app.include_router(profiler.import_module(module).router)
+
+
+@app.get('/metrics', include_in_schema=False)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
 app.get('/', tags=["default"])
@@ -22,5 +74,11 @@ def index():
     return {"data": "welcome"}
 
 
-
-
+if __name__ == "__main__" and profiler.enabled:
+    # Startup only: build everything a worker builds before serving, report, exit.
+    with profiler.step("create database engines"):
+        init_engines()
+    with profiler.step("argon2 backend (deferred to first API key use)"):
+        from app.features.api_keys.utils.security import _argon2
+        _argon2()
+    profiler.report()
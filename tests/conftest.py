@@ -0,0 +1,117 @@
+"""
+Shared fixtures.
+
+Most tests run on an in-memory SQLite database. Tests that exercise row
+locks, RETURNING races or LISTEN/NOTIFY need PostgreSQL: set
+TEST_DATABASE_URL to a scratch database (its tables are dropped and
+recreated) or they are skipped.
+
+    TEST_DATABASE_URL=postgresql://postgres@localhost/wallet_test pytest
+"""
+import itertools
+import os
+from uuid import uuid4
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("ARGON2_PROFILE", "test")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.settings import get_settings
+from app.database.db import Base
+from app.features.auth.models.user_model import User
+from app.features.api_keys.models.api_model import ApiKey  # noqa: F401
+from app.features.wallet.models.wallet_model import Wallet, WalletBalanceShard  # noqa: F401
+from app.features.wallet.models.rollup_model import WalletDailyRollup  # noqa: F401
+from app.features.transaction.models.transaction_model import Transaction, TransactionPayloadArchive  # noqa: F401
+from app.features.reconciliation.models.checkpoint_model import JobCheckpoint  # noqa: F401
+from app.features.scheduled_transfers.models.schedule_model import ScheduledTransfer  # noqa: F401
+
+_user_pks = itertools.count(1)
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    """
+    configure(name=value, ...) sets settings through the environment, the
+    way production does, and rebuilds the cached Settings.
+    """
+    def apply(**values):
+        for name, value in values.items():
+            monkeypatch.setenv(name.upper(), str(value))
+        get_settings.cache_clear()
+
+    get_settings.cache_clear()
+    yield apply
+    get_settings.cache_clear()
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(sqlite_engine):
+    session = sessionmaker(bind=sqlite_engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL not set")
+    engine = create_engine(url, pool_size=30, max_overflow=10)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_session(pg_engine):
+    """
+    Session factory bound to the PostgreSQL test database. Sessions are
+    closed at teardown even when the test fails, so no open transaction
+    blocks the final drop_all. Rows are left behind; tests create their own
+    users and wallets.
+    """
+    factory = sessionmaker(bind=pg_engine, autoflush=False)
+    sessions = []
+
+    def create():
+        session = factory()
+        sessions.append(session)
+        return session
+
+    yield create
+    for session in sessions:
+        session.close()
+
+
+@pytest.fixture
+def make_wallet():
+    """
+    make_wallet(db, balance=0) commits a user with a wallet holding `balance`.
+    """
+    def create(db, balance: int = 0) -> Wallet:
+        user = User(user_id=str(uuid4()), id=next(_user_pks), email=f"{uuid4().hex[:12]}@example.test")
+        db.add(user)
+        db.flush()
+        wallet = Wallet(user_id=user.user_id, user_pk=user.id, wallet_number=uuid4().hex, balance=balance)
+        db.add(wallet)
+        db.commit()
+        return wallet
+
+    return create
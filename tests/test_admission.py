@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from app.core.admission import AdmissionLimiter, AdmissionMiddleware, classify, parse_admission_limit
+
+
+def test_parse_admission_limit():
+    assert parse_admission_limit("16/64") == (16, 64)
+    assert parse_admission_limit("1/0") == (1, 0)
+    for bad in ("16", "0/4", "4/-1", "a/b"):
+        with pytest.raises(ValueError):
+            parse_admission_limit(bad)
+
+
+@pytest.mark.parametrize("method, path, expected", [
+    ("GET", "/metrics", None),
+    ("GET", "/wallet/deposit/ref/status/wait", None),
+    ("POST", "/wallet/paystack/webhook", "webhook"),
+    ("POST", "/wallet/paystack/webhook/batch", "webhook"),
+    ("GET", "/auth/google/callback", "auth"),
+    ("POST", "/keys/bulk", "auth"),
+    ("GET", "/wallet/balance", "read"),
+    ("POST", "/wallet/transfer", "write"),
+])
+def test_classify(method, path, expected):
+    assert classify(method, path) == expected
+
+
+def test_queue_is_bounded():
+    async def scenario():
+        limiter = AdmissionLimiter("write", max_in_flight=1, max_queued=2, queue_timeout=5)
+        assert await limiter.acquire()
+        waiters = [asyncio.create_task(limiter.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert limiter.queued == 2
+        assert await limiter.acquire() is False  # queue full: rejected at once
+        assert limiter.rejected == 1
+
+        limiter.release()
+        limiter.release()
+        assert await asyncio.gather(*waiters) == [True, True]
+        assert limiter.in_flight == 1
+        limiter.release()
+        assert (limiter.in_flight, limiter.queued, limiter.admitted) == (0, 0, 3)
+
+    asyncio.run(scenario())
+
+
+def test_slots_go_to_waiters_in_order():
+    async def scenario():
+        limiter = AdmissionLimiter("read", max_in_flight=1, max_queued=5, queue_timeout=5)
+        await limiter.acquire()
+        order = []
+
+        async def wait(n):
+            await limiter.acquire()
+            order.append(n)
+
+        tasks = [asyncio.create_task(wait(n)) for n in range(3)]
+        await asyncio.sleep(0)
+        # a newcomer must queue behind the waiters even while a slot moves
+        newcomer = asyncio.create_task(wait("late"))
+        for _ in range(4):
+            limiter.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks, newcomer)
+
+        assert order == [0, 1, 2, "late"]
+
+    asyncio.run(scenario())
+
+
+def test_waiting_too_long_is_rejected_and_frees_the_queue():
+    async def scenario():
+        limiter = AdmissionLimiter("auth", max_in_flight=1, max_queued=1, queue_timeout=0.01)
+        await limiter.acquire()
+
+        assert await limiter.acquire() is False
+        assert (limiter.timed_out, limiter.queued, limiter.in_flight) == (1, 0, 1)
+
+        limiter.release()
+        assert limiter.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_middleware_rejects_only_the_full_class(configure):
+    configure(admission_limit_read="1/0")
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope["path"])
+        await asyncio.sleep(0.01)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = AdmissionMiddleware(app)
+
+    async def request(method, path):
+        statuses = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        scope = {"type": "http", "method": method, "path": path, "headers": [(b"x-api-key", b"sk_live_abc_def")]}
+        await middleware(scope, None, send)
+        return statuses[0]
+
+    async def scenario():
+        return await asyncio.gather(
+            request("GET", "/wallet/balance"), request("GET", "/wallet/balance"), request("POST", "/keys/bulk"),
+        )
+
+    assert asyncio.run(scenario()) == [200, 503, 200]
+    assert seen == ["/wallet/balance", "/keys/bulk"]
@@ -0,0 +1,137 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.settings import Settings
+from app.features.api_keys.models.api_model import ApiKey
+from app.features.api_keys.schemas.api_schema import ApiKeyRequest
+from app.features.api_keys.utils import api_util, security
+from app.features.api_keys.utils.api_util import count_active_keys, create_new_api, issue_api_keys, verify_secret_hashes
+from app.features.api_keys.utils.security import hash_key, hash_keys, shutdown_hash_pool, verify_key
+
+
+def requests(n: int) -> list[ApiKeyRequest]:
+    return [ApiKeyRequest(name=f"key-{i}", permissions=["read"], expires_at="1D") for i in range(n)]
+
+
+def owner(wallet):
+    return SimpleNamespace(user_id=wallet.user_id)
+
+
+@pytest.fixture
+def hash_pool():
+    yield
+    shutdown_hash_pool()
+
+
+def test_hash_pool_is_small_by_default():
+    assert Settings(database_url="sqlite://", jwt_secret_key="k").key_hash_workers == 2
+
+
+def test_hash_keys_on_the_pool(hash_pool):
+    hashes = hash_keys(["alpha", "beta"])
+
+    assert security._get_hash_pool()._mp_context.get_start_method() in ("forkserver", "spawn")
+
+    assert verify_key("alpha", hashes[0])
+    assert verify_key("beta", hashes[1])
+    assert not verify_key("alpha", hashes[1])
+
+
+def test_bulk_issue_stores_hashes_only(db, make_wallet, hash_pool):
+    wallet = make_wallet(db)
+
+    issued = issue_api_keys(db, owner(wallet), requests(3))
+
+    assert [key["name"] for key in issued] == ["key-0", "key-1", "key-2"]
+    for key in issued:
+        _, _, public_id, secret = key["api_key"].split("_", 3)
+        stored = db.query(ApiKey).filter_by(public_api_id=public_id).one()
+        assert stored.api_key != secret
+        assert verify_key(secret, stored.api_key)
+
+
+def test_hashing_runs_outside_the_transaction(db, make_wallet, monkeypatch):
+    wallet = make_wallet(db)
+    seen = []
+
+    def fake_hash_keys(secrets):
+        seen.append(db.in_transaction())
+        return [f"hashed-{secret}" for secret in secrets]
+
+    monkeypatch.setattr(api_util, "hash_keys", fake_hash_keys)
+    issue_api_keys(db, owner(wallet), requests(2))
+
+    assert seen == [False]
+
+
+def test_bulk_issue_respects_limit_before_hashing(db, make_wallet, monkeypatch):
+    wallet = make_wallet(db)
+    monkeypatch.setattr(api_util, "hash_keys", lambda secrets: [f"hashed-{s}" for s in secrets])
+    issue_api_keys(db, owner(wallet), requests(4))
+    monkeypatch.setattr(api_util, "hash_keys", lambda secrets: pytest.fail("hashed over the limit"))
+
+    with pytest.raises(HTTPException) as exc:
+        issue_api_keys(db, owner(wallet), requests(2))
+
+    assert exc.value.status_code == 409
+    assert count_active_keys(db, wallet.user_pk) == 4
+
+
+def test_concurrent_bulk_issues_stay_under_limit_postgres(pg_session, make_wallet, monkeypatch):
+    db = pg_session()
+    wallet = make_wallet(db)
+    barrier = threading.Barrier(2, timeout=30)
+
+    def slow_hash(secrets):
+        # both requests pass the early check before either inserts
+        barrier.wait()
+        return [f"hashed-{s}" for s in secrets]
+
+    monkeypatch.setattr(api_util, "hash_keys", slow_hash)
+    results = []
+
+    def issue():
+        session = pg_session()
+        try:
+            results.append(len(issue_api_keys(session, owner(wallet), requests(3))))
+        except HTTPException as exc:
+            results.append(exc.status_code)
+
+    threads = [threading.Thread(target=issue) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [3, 409]
+    assert count_active_keys(db, wallet.user_pk) == 3
+
+
+def test_single_key_resolves_the_owner_once(db, make_wallet, monkeypatch):
+    wallet = make_wallet(db)
+    calls = []
+    real_require_active_user = api_util.require_active_user
+
+    def counting(db, user_id):
+        calls.append(user_id)
+        return real_require_active_user(db, user_id)
+
+    monkeypatch.setattr(api_util, "require_active_user", counting)
+    created = create_new_api(db, owner(wallet), requests(1)[0])
+
+    assert calls == [wallet.user_id]
+    assert created["api_key"].user_pk == wallet.user_pk
+
+
+def test_key_lookup_is_scoped_to_the_owner(db, make_wallet, monkeypatch):
+    wallet, other = make_wallet(db), make_wallet(db)
+    monkeypatch.setattr(api_util, "hash_keys", lambda secrets: [hash_key(s) for s in secrets])
+    [issued] = issue_api_keys(db, owner(wallet), requests(1))
+
+    assert verify_secret_hashes(issued["api_key"], owner(wallet), db).user_pk == wallet.user_pk
+    with pytest.raises(HTTPException) as exc:
+        verify_secret_hashes(issued["api_key"], owner(other), db)
+    assert exc.value.status_code == 404
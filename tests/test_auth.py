@@ -0,0 +1,120 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.features.api_keys.models.api_model import ALL_PERMISSIONS, ApiKey, permission_mask
+from app.features.api_keys.schemas.api_schema import ApiKeyRequest
+from app.features.api_keys.utils import api_util
+from app.features.api_keys.utils.api_util import issue_api_keys
+from app.features.api_keys.utils.security import hash_key
+from app.features.auth import dependencies
+from app.features.auth.dependencies import Principal, PrincipalType, get_principal, require_permission, verify_api_key
+from app.features.auth.utils import auth_cache as auth_cache_module
+from app.features.auth.utils.auth_cache import CachedApiKey, auth_cache
+
+
+def test_principal_is_immutable():
+    principal = Principal(PrincipalType.SERVICE, "u1", 1, permission_mask(["read"]), key_id="pub1")
+
+    with pytest.raises(AttributeError):
+        principal.permission_mask = ALL_PERMISSIONS
+    assert principal.permissions == ["read"]
+    assert principal.rate_limit_key == "key:pub1"
+    assert Principal(PrincipalType.USER, "u1", 1).rate_limit_key == "user:u1"
+
+
+def test_permission_mask_accepts_lists_and_strings():
+    assert permission_mask(["read", "transfer"]) == permission_mask("transfer, read")
+    assert permission_mask(["read", "bogus"]) == permission_mask(["read"])
+    assert permission_mask(None) == 0
+
+
+def test_require_permission():
+    principal = Principal(PrincipalType.SERVICE, "u1", 1, permission_mask(["read"]))
+
+    require_permission(principal, "read")
+    with pytest.raises(HTTPException) as exc:
+        require_permission(principal, "transfer")
+    assert exc.value.status_code == 403
+
+
+@pytest.fixture
+def issue_key(db, make_wallet, monkeypatch):
+    monkeypatch.setattr(api_util, "hash_keys", lambda secrets: [hash_key(s) for s in secrets])
+
+    def issue(permissions=("read",)):
+        wallet = make_wallet(db)
+        request = ApiKeyRequest(name="k", permissions=list(permissions), expires_at="1D")
+        [issued] = issue_api_keys(db, SimpleNamespace(user_id=wallet.user_id), [request])
+        return wallet, issued["api_key"]
+
+    return issue
+
+
+def authenticate(db, api_key):
+    request = SimpleNamespace(state=SimpleNamespace())
+    return asyncio.run(get_principal(request, db, None, api_key)), request
+
+
+def test_api_key_principal_is_cached(db, issue_key, monkeypatch):
+    wallet, api_key = issue_key(["read", "deposit"])
+
+    principal, request = authenticate(db, api_key)
+    assert (principal.user_pk, principal.permissions) == (wallet.user_pk, ["deposit", "read"])
+    assert request.state.user_id == wallet.user_id
+
+    monkeypatch.setattr(dependencies, "load_api_key", lambda db, public_id: pytest.fail("cache missed"))
+    assert authenticate(db, api_key)[0] is principal
+
+
+def test_wrong_secret_is_rejected(db, issue_key):
+    _, api_key = issue_key()
+
+    with pytest.raises(HTTPException) as exc:
+        authenticate(db, api_key[:-2] + "xx")
+    assert exc.value.status_code == 401
+
+
+def test_revoked_key_is_rejected_after_invalidation(db, issue_key):
+    _, api_key = issue_key()
+    authenticate(db, api_key)
+    public_id = api_key.split("_", 3)[2]
+
+    db.query(ApiKey).filter_by(public_api_id=public_id).update({"is_revoked": True})
+    db.commit()
+    auth_cache.handle_event(f"key:{public_id}")
+
+    with pytest.raises(HTTPException) as exc:
+        authenticate(db, api_key)
+    assert exc.value.detail == "API key revoked"
+
+
+def test_first_use_verifies_are_bounded(configure, monkeypatch):
+    configure(key_verify_concurrency=2)
+    monkeypatch.setattr(dependencies, "_verify_slots", None)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow_verify(secret, hashed):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return True
+
+    monkeypatch.setattr(auth_cache_module, "verify_key", slow_verify)
+    keys = [CachedApiKey(hashed_key="h", user_id="u", expires_at=None, is_revoked=False, principal=None)
+            for _ in range(6)]
+
+    async def scenario():
+        return await asyncio.gather(*(verify_api_key(key, "secret") for key in keys))
+
+    assert asyncio.run(scenario()) == [True] * 6
+    assert peak[0] == 2
+    monkeypatch.setattr(auth_cache_module, "verify_key", lambda secret, hashed: pytest.fail("argon2 rerun"))
+    assert asyncio.run(verify_api_key(keys[0], "secret"))
@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+from app.features.wallet.utils.deposit_notifier import DepositNotifier
+
+
+def test_event_from_another_thread_wakes_the_waiter():
+    notifier = DepositNotifier()
+
+    async def scenario():
+        with notifier.watch("ref-1") as watch:
+            threading.Timer(0.01, notifier.handle_event, args=("ref-0:failed,ref-1:success",)).start()
+            return await watch.wait(5)
+
+    assert asyncio.run(scenario()) == "success"
+    assert notifier._watches == {}
+
+
+def test_wait_times_out_without_a_change():
+    notifier = DepositNotifier()
+
+    async def scenario():
+        with notifier.watch("ref-1") as watch:
+            return await watch.wait(0.01)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_every_waiter_on_a_reference_is_woken():
+    notifier = DepositNotifier()
+
+    async def scenario():
+        with notifier.watch("ref-1") as first, notifier.watch("ref-1") as second:
+            notifier.notify("ref-1", "success")
+            return await asyncio.gather(first.wait(1), second.wait(1))
+
+    assert asyncio.run(scenario()) == ["success", "success"]
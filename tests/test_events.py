@@ -0,0 +1,115 @@
+import os
+import select
+import threading
+from datetime import datetime
+
+import psycopg2
+from sqlalchemy import text
+
+from app.core.events import EventBus
+from app.features.auth.utils.auth_cache import CHANNEL, AuthCache, CachedApiKey, publish_key_invalidation
+
+
+def cached_key(user_id="u1") -> CachedApiKey:
+    return CachedApiKey(hashed_key="x", user_id=user_id, expires_at=datetime(2100, 1, 1),
+                        is_revoked=False, principal=object())
+
+
+def test_local_dispatch_after_commit_only(db):
+    bus, received = EventBus(), []
+    bus.subscribe("ch", received.append)
+
+    db.execute(text("SELECT 1"))
+    bus.publish(db, "ch", "rolled-back")
+    db.rollback()
+    db.execute(text("SELECT 1"))
+    bus.publish(db, "ch", "committed")
+    assert received == []
+    db.commit()
+    db.commit()
+
+    assert received == ["committed"]
+
+
+def test_publish_many_splits_payloads(db):
+    bus, received = EventBus(), []
+    bus.subscribe("ch", received.append)
+
+    bus.publish_many(db, "ch", ["x" * 1000] * 20)
+    db.commit()
+
+    assert len(received) > 1
+    assert sum(len(p.split(",")) for p in received) == 20
+    assert all(len(p) <= 7500 for p in received)
+
+
+def test_revocation_drops_cached_key():
+    cache = AuthCache()
+    cache.put_key("pub1", cached_key(), cache.generation)
+    cache.put_key("pub2", cached_key(), cache.generation)
+
+    cache.handle_event("key:pub1")
+
+    assert cache.get_key("pub1") is None
+    assert cache.get_key("pub2") is not None
+
+
+def test_user_invalidation_drops_their_keys():
+    cache = AuthCache()
+    cache.put_key("pub1", cached_key("u1"), cache.generation)
+    cache.put_key("pub2", cached_key("u2"), cache.generation)
+
+    cache.handle_event("user:u1")
+
+    assert cache.get_key("pub1") is None
+    assert cache.get_key("pub2") is not None
+
+
+def test_load_racing_an_invalidation_is_not_cached():
+    cache = AuthCache()
+    generation = cache.generation  # load starts
+    cache.handle_event("key:pub1")  # revocation lands meanwhile
+    cache.put_key("pub1", cached_key(), generation)
+
+    assert cache.get_key("pub1") is None
+
+
+def test_publish_without_listener_notifies_postgres(pg_session):
+    # a CLI process: no start(), so no listener of its own
+    bus = EventBus()
+    listener = psycopg2.connect(os.environ["TEST_DATABASE_URL"])
+    listener.autocommit = True
+    listener.cursor().execute(f'LISTEN "{CHANNEL}"')
+    try:
+        db = pg_session()
+        bus.publish(db, CHANNEL, "key:from-cli")
+        db.commit()
+
+        assert select.select([listener], [], [], 5) != ([], [], [])
+        listener.poll()
+        assert [n.payload for n in listener.notifies] == ["key:from-cli"]
+    finally:
+        listener.close()
+
+
+def test_revocation_reaches_listening_worker_postgres(pg_session):
+    worker_bus, cache = EventBus(), AuthCache()
+    connected, invalidated = threading.Event(), threading.Event()
+    worker_bus.subscribe(CHANNEL, cache.handle_event)
+    worker_bus.subscribe(CHANNEL, lambda payload: invalidated.set())
+    worker_bus.on_connect(connected.set)
+    worker_bus.start(os.environ["TEST_DATABASE_URL"])
+    try:
+        assert connected.wait(5)
+        cache.put_key("pub1", cached_key(), cache.generation)
+
+        # published through the global bus, which never started a listener here
+        db = pg_session()
+        publish_key_invalidation(db, "pub1")
+        db.commit()
+
+        assert invalidated.wait(5)
+        assert cache.get_key("pub1") is None
+    finally:
+        worker_bus.stop()
+
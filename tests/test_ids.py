@@ -0,0 +1,32 @@
+import time
+
+from app.core import ids
+from app.core.ids import time_ordered_hex, uuid7
+
+
+def test_uuid7_layout():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert before <= value.int >> 80 <= time.time_ns() // 1_000_000
+
+
+def test_ids_increase_within_a_millisecond(monkeypatch):
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+
+    values = [time_ordered_hex() for _ in range(5000)]  # past the 12-bit counter
+
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+    assert all(len(value) == 32 for value in values)
+
+
+def test_ids_keep_increasing_when_the_clock_steps_back(monkeypatch):
+    now = [1_700_000_000_000_000_000]
+    monkeypatch.setattr(ids.time, "time_ns", lambda: now[0])
+    first = time_ordered_hex()
+
+    now[0] -= 5_000_000_000
+    assert time_ordered_hex() > first
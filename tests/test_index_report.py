@@ -0,0 +1,44 @@
+from app.cli.index_report import INDEX_STATS, flag_indexes
+
+
+def index(name, columns, scans=1, unique=False, predicate=None, table="t"):
+    return {"table_name": table, "index_name": name, "idx_scan": scans, "is_unique": unique,
+            "columns": columns, "predicate": predicate}
+
+
+def flags(rows) -> dict:
+    return {row["index_name"]: row["flags"] for row in flag_indexes(rows)}
+
+
+def test_unused_and_prefix_redundant_indexes_are_flagged():
+    assert flags([
+        index("ix_a", ["a"]),
+        index("ix_a_b", ["a", "b"]),
+        index("ix_c", ["c"], scans=0),
+        index("uq_d", ["d"], scans=0, unique=True),
+        index("ix_d", ["d"]),
+        index("ix_a_other_table", ["a"], table="u"),
+    ]) == {
+        "ix_a": ["redundant (ix_a_b)"],
+        "ix_a_b": [],
+        "ix_c": ["unused"],
+        "uq_d": [],
+        "ix_d": ["redundant (uq_d)"],
+        "ix_a_other_table": [],
+    }
+
+
+def test_partial_index_is_not_redundant_with_a_full_one():
+    assert flags([
+        index("ix_a", ["a"], predicate="(a IS NOT NULL)"),
+        index("ix_a_b", ["a", "b"]),
+    ])["ix_a"] == []
+
+
+def test_schema_has_no_redundant_indexes_postgres(pg_engine):
+    with pg_engine.connect() as conn:
+        rows = [dict(row._mapping) for row in conn.execute(INDEX_STATS)]
+
+    redundant = {row["index_name"]: row["flags"] for row in flag_indexes(rows)
+                 if any(flag.startswith("redundant") for flag in row["flags"])}
+    assert redundant == {}
@@ -0,0 +1,143 @@
+import threading
+
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.wallet_model import Wallet
+from app.features.wallet.utils.wallet_util import apply_paystack_event, generate_reference_number
+from app.features.wallet.utils.webhook_batch import apply_paystack_events
+
+
+def add_deposit(db, wallet, amount=5000, tx_type=TransactionType.DEPOSIT) -> str:
+    reference = generate_reference_number()
+    db.add(Transaction(
+        wallet_id=wallet.id,
+        type=tx_type,
+        status=TransactionStatus.PENDING,
+        amount=amount,
+        reference=reference,
+    ))
+    db.commit()
+    return reference
+
+
+def event(reference, status="success"):
+    return {"event": f"charge.{status}", "data": {"reference": reference, "status": status}}
+
+
+def balance(db, wallet_id):
+    db.expire_all()
+    return db.get(Wallet, wallet_id).balance
+
+
+def test_success_credits_once(db, make_wallet):
+    wallet = make_wallet(db)
+    reference = add_deposit(db, wallet)
+
+    assert apply_paystack_event(db, event(reference)) is not None
+    db.commit()
+    assert apply_paystack_event(db, event(reference)) is None
+    db.commit()
+
+    assert balance(db, wallet.id) == 5000
+    tx = db.query(Transaction).filter_by(reference=reference).one()
+    assert tx.status == TransactionStatus.SUCCESS
+
+
+def test_failed_event_does_not_undo_success(db, make_wallet):
+    wallet = make_wallet(db)
+    reference = add_deposit(db, wallet)
+    apply_paystack_event(db, event(reference))
+    db.commit()
+
+    apply_paystack_event(db, event(reference, "failed"))
+    db.commit()
+
+    tx = db.query(Transaction).filter_by(reference=reference).one()
+    assert tx.status == TransactionStatus.SUCCESS
+
+
+def test_transfer_reference_is_not_creditable(db, make_wallet):
+    wallet = make_wallet(db)
+    reference = add_deposit(db, wallet, tx_type=TransactionType.TRANSFER_IN)
+
+    assert apply_paystack_event(db, event(reference)) is None
+    summary = apply_paystack_events(db, [event(reference)])
+    db.commit()
+
+    assert summary["unknown"] == 1
+    assert balance(db, wallet.id) == 0
+
+
+def test_batch_then_single_credits_once(db, make_wallet):
+    wallet = make_wallet(db)
+    references = [add_deposit(db, wallet, amount=100) for _ in range(3)]
+
+    summary = apply_paystack_events(db, [event(ref) for ref in references] + [event(references[0])])
+    db.commit()
+    assert summary["credited"] == 3
+    for ref in references:
+        apply_paystack_event(db, event(ref))
+    db.commit()
+
+    assert balance(db, wallet.id) == 300
+
+
+def _race(session_factory, workers):
+    """
+    Run each worker(db) on its own session and thread, released together.
+    """
+    barrier = threading.Barrier(len(workers), timeout=30)
+    errors = []
+
+    def run(work):
+        db = session_factory()
+        try:
+            barrier.wait()
+            work(db)
+            db.commit()
+        except Exception as exc:  # surfaced below
+            errors.append(exc)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=run, args=(work,)) for work in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+
+def test_concurrent_deliveries_credit_once_postgres(pg_session, make_wallet):
+    db = pg_session()
+    wallet = make_wallet(db)
+    reference = add_deposit(db, wallet)
+
+    single = lambda s: apply_paystack_event(s, event(reference))
+    batch = lambda s: apply_paystack_events(s, [event(reference)])
+    _race(pg_session, [single, batch] * 4)
+
+    assert balance(db, wallet.id) == 5000
+
+
+def test_concurrent_credits_to_one_wallet_all_land_postgres(pg_session, make_wallet):
+    db = pg_session()
+    wallet = make_wallet(db)
+    references = [add_deposit(db, wallet, amount=10) for _ in range(10)]
+
+    _race(pg_session, [lambda s, ref=ref: apply_paystack_event(s, event(ref)) for ref in references])
+
+    assert balance(db, wallet.id) == 100
+
+
+def test_overlapping_batches_do_not_deadlock_postgres(pg_session, make_wallet):
+    db = pg_session()
+    wallets = [make_wallet(db) for _ in range(30)]
+    batches = []
+    for n in range(4):
+        events = [event(add_deposit(db, wallet, amount=10)) for wallet in wallets]
+        # same wallets, opposite orders
+        batches.append(events if n % 2 else events[::-1])
+
+    _race(pg_session, [lambda s, events=events: apply_paystack_events(s, events) for events in batches])
+
+    assert [balance(db, wallet.id) for wallet in wallets] == [40] * 30
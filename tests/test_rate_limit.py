@@ -0,0 +1,111 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core import rate_limit
+from app.core.rate_limit import BucketStore, InMemoryBucketStore, RateLimiter, enforce_rate_limit, parse_limit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def test_parse_limit():
+    assert parse_limit("30/60") == (30.0, 0.5)
+    for bad in ("30", "a/60", "0/60", "30/0"):
+        with pytest.raises(ValueError):
+            parse_limit(bad)
+
+
+def test_bucket_store_is_abstract():
+    with pytest.raises(TypeError):
+        BucketStore()
+
+
+def test_bucket_empties_then_refills(clock):
+    store = InMemoryBucketStore()
+
+    assert [store.take("k", 3, 1.0)[0] for _ in range(3)] == [True, True, True]
+    allowed, retry_after = store.take("k", 3, 1.0)
+    assert not allowed
+    assert retry_after == pytest.approx(1.0)
+
+    clock.now += 0.5
+    allowed, retry_after = store.take("k", 3, 1.0)
+    assert not allowed
+    assert retry_after == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert store.take("k", 3, 1.0) == (True, 0.0)
+
+
+def test_refill_is_capped_at_capacity(clock):
+    store = InMemoryBucketStore()
+    store.take("k", 2, 1.0)
+
+    clock.now += 3600
+    results = [store.take("k", 2, 1.0)[0] for _ in range(3)]
+
+    assert results == [True, True, False]
+
+
+def test_eviction_keeps_buckets_still_refilling(clock):
+    store = InMemoryBucketStore(max_keys=2)
+    store.take("idle", 2, 1.0)
+    clock.now += 10
+    store.take("busy", 2, 1.0)
+    store.take("busy", 2, 1.0)
+
+    store.take("new", 2, 1.0)
+
+    assert set(store._buckets) == {"busy", "new"}
+    assert store.take("busy", 2, 1.0)[0] is False
+
+
+def test_full_store_evicts_only_the_least_recently_used(clock):
+    store = InMemoryBucketStore(max_keys=3)
+    for key in ("a", "b", "c"):
+        store.take(key, 1, 0.01)
+        clock.now += 1
+    store.take("a", 1, 0.01)  # used again: now the newest
+
+    store.take("d", 1, 0.01)
+
+    assert list(store._buckets) == ["c", "a", "d"]
+    assert store.take("a", 1, 0.01)[0] is False  # still throttled, not reset
+    assert store.take("c", 1, 0.01)[0] is False
+
+
+def test_limits_are_per_permission_and_identity(clock):
+    limiter = RateLimiter(InMemoryBucketStore(), {"transfer": (1, 0.1)})
+
+    assert limiter.check("key-a", "transfer")[0]
+    assert not limiter.check("key-a", "transfer")[0]
+    assert limiter.check("key-b", "transfer")[0]
+    assert limiter.check("key-a", "read")[0]  # no limit configured
+
+
+def test_enforce_raises_429_with_retry_after(clock, configure, monkeypatch):
+    configure(rate_limit_enabled="true")
+    limiter = RateLimiter(InMemoryBucketStore(), {"deposit": (1, 0.25)})
+    monkeypatch.setattr(rate_limit, "_limiter", limiter)
+
+    class Principal:
+        rate_limit_key = "key:abc"
+
+    enforce_rate_limit(Principal(), "deposit")
+    with pytest.raises(HTTPException) as exc:
+        enforce_rate_limit(Principal(), "deposit")
+
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"] == "4"
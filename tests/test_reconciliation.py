@@ -0,0 +1,145 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.features.reconciliation.utils.reconcile_util import (
+    CHECKPOINT_NAME,
+    load_checkpoint,
+    reconcile_pending_deposits,
+)
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.wallet_model import Wallet
+from app.features.wallet.utils.wallet_util import apply_paystack_event, generate_reference_number
+
+
+def add_stale_deposit(db, wallet, amount=700) -> str:
+    reference = generate_reference_number()
+    db.add(Transaction(
+        wallet_id=wallet.id,
+        type=TransactionType.DEPOSIT,
+        status=TransactionStatus.PENDING,
+        amount=amount,
+        reference=reference,
+        created_at=datetime.utcnow() - timedelta(hours=1),
+    ))
+    db.commit()
+    return reference
+
+
+def paystack(handler) -> httpx.AsyncClient:
+    def respond(request: httpx.Request) -> httpx.Response:
+        reference = request.url.path.rsplit("/", 1)[-1]
+        status = handler(reference)
+        return httpx.Response(200, json={"status": True, "data": {"reference": reference, "status": status}})
+
+    return httpx.AsyncClient(base_url="https://paystack.test", transport=httpx.MockTransport(respond))
+
+
+def reconcile(db, client) -> dict:
+    return asyncio.run(reconcile_pending_deposits(db, client))
+
+
+def test_credits_and_checkpoints(db, make_wallet):
+    wallet = make_wallet(db)
+    reference = add_stale_deposit(db, wallet)
+
+    summary = reconcile(db, paystack(lambda ref: "success"))
+    assert summary["credited"] == 1
+    assert load_checkpoint(db, CHECKPOINT_NAME) is not None
+
+    # the checkpoint moved past it; nothing is verified twice
+    summary = reconcile(db, paystack(lambda ref: "success"))
+    assert summary["scanned"] == 0
+    db.expire_all()
+    assert db.get(Wallet, wallet.id).balance == 700
+    assert db.query(Transaction).filter_by(reference=reference).one().status == TransactionStatus.SUCCESS
+
+
+def test_no_transaction_open_during_verify(db, make_wallet):
+    wallet = make_wallet(db)
+    add_stale_deposit(db, wallet)
+    seen = []
+
+    def handler(reference):
+        seen.append(db.in_transaction())
+        return "success"
+
+    reconcile(db, paystack(handler))
+    assert seen == [False]
+
+
+def test_pending_at_paystack_holds_checkpoint(db, make_wallet):
+    wallet = make_wallet(db)
+    add_stale_deposit(db, wallet)
+
+    summary = reconcile(db, paystack(lambda ref: "ongoing"))
+    assert summary["unresolved"] == 1
+    assert load_checkpoint(db, CHECKPOINT_NAME) is None
+
+
+def raw_paystack(response: httpx.Response) -> httpx.AsyncClient:
+    return httpx.AsyncClient(base_url="https://paystack.test", transport=httpx.MockTransport(lambda request: response))
+
+
+def reconcile_overdue(db, client) -> dict:
+    return asyncio.run(reconcile_pending_deposits(db, client, give_up_after=timedelta(minutes=30)))
+
+
+def deposit_status(db, reference):
+    db.expire_all()
+    return db.query(Transaction).filter_by(reference=reference).one().status
+
+
+def test_overdue_deposit_is_not_failed_when_verify_errors(db, make_wallet):
+    wallet = make_wallet(db)
+    reference = add_stale_deposit(db, wallet)
+
+    for response in (httpx.Response(502, text="bad gateway"), httpx.Response(200, text="<html>")):
+        summary = reconcile_overdue(db, raw_paystack(response))
+
+        assert (summary["unresolved"], summary["given_up"]) == (1, 0)
+        assert deposit_status(db, reference) == TransactionStatus.PENDING
+        assert load_checkpoint(db, CHECKPOINT_NAME) is None
+
+
+def test_overdue_deposit_in_flight_at_paystack_is_passed_over(db, make_wallet):
+    wallet = make_wallet(db)
+    reference = add_stale_deposit(db, wallet)
+
+    summary = reconcile_overdue(db, paystack(lambda ref: "ongoing"))
+
+    assert summary["given_up"] == 1
+    assert deposit_status(db, reference) == TransactionStatus.PENDING
+    assert load_checkpoint(db, CHECKPOINT_NAME) is not None
+
+
+def test_abandoned_at_paystack_fails_the_deposit(db, make_wallet):
+    wallet = make_wallet(db)
+    reference = add_stale_deposit(db, wallet)
+
+    summary = reconcile(db, paystack(lambda ref: "abandoned"))
+
+    assert summary["failed"] == 1
+    assert deposit_status(db, reference) == TransactionStatus.FAILED
+
+
+def test_webhook_during_verify_credits_once_postgres(pg_session, make_wallet):
+    db = pg_session()
+    wallet = make_wallet(db)
+    add_stale_deposit(db, wallet)
+
+    def handler(ref):
+        # the webhook lands while the reconciler waits on Paystack
+        webhook_db = pg_session()
+        apply_paystack_event(webhook_db, {"data": {"reference": ref, "status": "success"}})
+        webhook_db.commit()
+        webhook_db.close()
+        return "success"
+
+    summary = reconcile(db, paystack(handler))
+
+    assert summary["credited"] == 0
+    assert summary["already_applied"] == 1
+    db.expire_all()
+    assert db.get(Wallet, wallet.id).balance == 700
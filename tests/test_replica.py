@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from app.database import db as db_module
+from app.database.db import ReplicaHealth, _is_sticky, get_read_db, mark_primary_write
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(db_module.time, "monotonic", clock)
+    monkeypatch.setattr(db_module.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def replica(configure, monkeypatch):
+    """A configured replica lagging 0s; stickiness lasts one check interval."""
+    configure(read_your_writes_seconds=10, replica_lag_check_interval=2)
+    monkeypatch.setattr(db_module, "read_engine", object())
+    monkeypatch.setattr(db_module, "_recent_writes", OrderedDict())
+    monkeypatch.setattr(db_module.replica_health, "lag", 0.0)
+    return db_module.replica_health
+
+
+def test_lag_is_measured_once_per_interval(clock, configure, monkeypatch):
+    configure(replica_lag_check_interval=2)
+    health, results = ReplicaHealth(), [True, False]
+    monkeypatch.setattr(health, "_measure", lambda: results.pop(0))
+
+    assert health.is_healthy()
+    clock.now += 1
+    assert health.is_healthy()  # cached
+    clock.now += 1
+    assert not health.is_healthy()
+    assert results == []
+
+
+def test_writer_sticks_to_primary_until_replica_catches_up(clock, replica):
+    mark_primary_write("u1")
+
+    assert _is_sticky("u1")
+    assert not _is_sticky("u2")
+    clock.now += 3
+    assert not _is_sticky("u1")
+
+    replica.lag = 5.0
+    assert _is_sticky("u1")
+    replica.lag = 60.0  # capped at read_your_writes_seconds
+    clock.now += 8
+    assert not _is_sticky("u1")
+    assert db_module._recent_writes == {}
+
+
+def test_recent_writes_are_bounded(clock, replica, monkeypatch):
+    monkeypatch.setattr(db_module, "_RECENT_WRITES_MAX", 3)
+
+    for user_id in ("u1", "u2", "u3", "u1", "u4"):
+        mark_primary_write(user_id)
+
+    assert list(db_module._recent_writes) == ["u3", "u1", "u4"]
+
+
+def test_write_time_travels_with_the_client(clock, replica, monkeypatch):
+    response = Response()
+    mark_primary_write("u1", response)
+    written = response.headers["x-last-write-at"]
+    assert f"last_write_at={written}" in response.headers["set-cookie"]
+
+    # another worker: nothing recorded locally, only what the client sends
+    monkeypatch.setattr(db_module, "_recent_writes", OrderedDict())
+    monkeypatch.setattr(db_module, "engine", object())
+    monkeypatch.setattr(replica, "is_healthy", lambda: True)
+    monkeypatch.setattr(db_module, "SessionLocal", lambda: SimpleNamespace(name="primary", close=lambda: None))
+    monkeypatch.setattr(db_module, "ReadSessionLocal", lambda: SimpleNamespace(name="replica", close=lambda: None))
+
+    def session_for(headers=None, cookies=None):
+        request = SimpleNamespace(state=SimpleNamespace(user_id="u1"), headers=headers or {}, cookies=cookies or {})
+        return next(get_read_db(request)).name
+
+    assert session_for(headers={"x-last-write-at": written}) == "primary"
+    assert session_for(cookies={"last_write_at": written}) == "primary"
+    assert session_for() == "replica"
+    assert session_for(headers={"x-last-write-at": "garbage"}) == "replica"
+    assert session_for(headers={"x-last-write-at": str(clock.now + 3600)}) == "replica"
+    clock.now += 3
+    assert session_for(headers={"x-last-write-at": written}) == "replica"
+
+
+def test_no_stickiness_without_replica(monkeypatch):
+    monkeypatch.setattr(db_module, "read_engine", None)
+    monkeypatch.setattr(db_module, "_recent_writes", OrderedDict())
+    response = Response()
+
+    mark_primary_write("u1", response)
+
+    assert not _is_sticky("u1")
+    assert "x-last-write-at" not in response.headers
+
+
+def test_caught_up_server_reports_no_lag_postgres(pg_engine, configure, monkeypatch):
+    # a server that is not replaying WAL has nothing outstanding
+    configure(replica_max_lag_seconds=0)
+    monkeypatch.setattr(db_module, "read_engine", pg_engine)
+
+    assert ReplicaHealth()._measure() is True
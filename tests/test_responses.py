@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.responses import JSONResponse
+
+from app.core import responses
+from app.core.responses import FastJSONResponse, default_response_class, json_response
+from app.features.transaction.models.transaction_model import TransactionStatus
+
+ROW = {
+    "reference": "ref-1",
+    "status": TransactionStatus.SUCCESS,
+    "amount": 5000,
+    "created_at": datetime(2025, 1, 2, 3, 4, 5),
+    "paid_at": datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+}
+
+
+def test_flag_off_uses_plain_json_response(configure):
+    configure(fast_json_responses="false")
+
+    response = json_response([ROW], status_code=201)
+
+    assert type(response) is JSONResponse
+    assert response.status_code == 201
+    assert default_response_class() is JSONResponse
+
+
+def test_flag_on_uses_fast_response(configure):
+    configure(fast_json_responses="true")
+
+    assert type(json_response([ROW])) is FastJSONResponse
+    assert default_response_class() is FastJSONResponse
+
+
+@pytest.mark.parametrize("has_orjson", [True, False])
+def test_renderers_agree(configure, monkeypatch, has_orjson):
+    if has_orjson and responses.orjson is None:
+        pytest.skip("orjson not installed")
+    if not has_orjson:
+        monkeypatch.setattr(responses, "orjson", None)
+
+    configure(fast_json_responses="false")
+    plain = json.loads(json_response(ROW).body)
+    configure(fast_json_responses="true")
+    fast = json.loads(json_response(ROW).body)
+
+    assert fast == plain
+    assert fast["status"] == "success"
+    assert fast["created_at"] == "2025-01-02T03:04:05"
+    assert fast["paid_at"] == "2025-01-02T03:04:05Z"
@@ -0,0 +1,216 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.cli import rollup_catchup
+from app.cli.rollup_catchup import CHECKPOINT_NAME, catch_up, high_water_mark
+from app.features.reconciliation.models.checkpoint_model import JobCheckpoint
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.rollup_model import WalletDailyRollup
+from app.features.wallet.utils import rollup_util, transfer_util
+from app.features.wallet.utils.rollup_util import add_to_rollups, rebuild_rollups, wallet_summary
+from app.features.wallet.utils.transfer_util import perform_transfer
+from app.features.wallet.utils.wallet_util import generate_reference_number, set_wallet_shards
+
+DAY = datetime(2026, 3, 1)
+
+
+def add_tx(db, wallet, created_at, amount=100, tx_type=TransactionType.DEPOSIT, status=TransactionStatus.SUCCESS):
+    db.add(Transaction(
+        wallet_id=wallet.id,
+        type=tx_type,
+        status=status,
+        amount=amount,
+        reference=generate_reference_number(),
+        created_at=created_at,
+        updated_at=created_at,
+    ))
+    db.commit()
+
+
+def rollups(db) -> dict:
+    """(wallet_id, day, type) -> (count, total), summed over shard rows."""
+    db.expire_all()
+    totals = {}
+    for row in db.query(WalletDailyRollup).all():
+        count, total = totals.get((row.wallet_id, row.day, row.type), (0, 0))
+        totals[(row.wallet_id, row.day, row.type)] = (count + row.count, total + row.total)
+    return totals
+
+
+def shard_nos(db, wallet) -> list[int]:
+    return sorted(shard_no for shard_no, in db.query(WalletDailyRollup.shard_no).filter_by(wallet_id=wallet.id))
+
+
+@pytest.fixture
+def run_catch_up(sqlite_engine, monkeypatch):
+    monkeypatch.setattr(rollup_catchup, "SessionLocal", sessionmaker(bind=sqlite_engine))
+    return lambda: catch_up(datetime(2100, 1, 1), batch_size=2)
+
+
+def test_transfer_rollup_day_matches_created_at(db, make_wallet, monkeypatch):
+    class AlmostMidnight(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime(2026, 3, 1, 23, 59, 59, 999999)
+
+    monkeypatch.setattr(transfer_util, "datetime", AlmostMidnight)
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+
+    out_tx, in_tx = perform_transfer(db, sender, recipient.wallet_number, 40)
+    db.commit()
+
+    assert out_tx.created_at == in_tx.created_at
+    assert rollups(db) == {
+        (sender.id, date(2026, 3, 1), TransactionType.TRANSFER_OUT): (1, 40),
+        (recipient.id, date(2026, 3, 1), TransactionType.TRANSFER_IN): (1, 40),
+    }
+
+
+def test_catch_up_builds_daily_rollups(db, make_wallet, run_catch_up):
+    wallet = make_wallet(db)
+    add_tx(db, wallet, DAY + timedelta(hours=1))
+    add_tx(db, wallet, DAY + timedelta(hours=23), amount=50)
+    add_tx(db, wallet, DAY + timedelta(days=1), amount=7)
+    add_tx(db, wallet, DAY, status=TransactionStatus.PENDING)
+
+    assert run_catch_up() == 3
+
+    assert rollups(db) == {
+        (wallet.id, date(2026, 3, 1), TransactionType.DEPOSIT): (2, 150),
+        (wallet.id, date(2026, 3, 2), TransactionType.DEPOSIT): (1, 7),
+    }
+
+
+def test_catch_up_rerun_does_not_double_count(db, make_wallet, run_catch_up):
+    wallet = make_wallet(db)
+    for hour in range(5):
+        add_tx(db, wallet, DAY + timedelta(hours=hour))
+    run_catch_up()
+    first = rollups(db)
+
+    db.query(JobCheckpoint).filter_by(name=CHECKPOINT_NAME).delete()
+    db.commit()
+    run_catch_up()
+
+    assert rollups(db) == first == {(wallet.id, date(2026, 3, 1), TransactionType.DEPOSIT): (5, 500)}
+
+
+def test_catch_up_over_incremental_rollups_keeps_totals(db, make_wallet, run_catch_up):
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+    perform_transfer(db, sender, recipient.wallet_number, 40)
+    db.commit()
+    incremental = rollups(db)
+
+    run_catch_up()
+
+    assert rollups(db) == incremental
+
+
+def test_catch_up_drops_rollups_with_no_transactions_left(db, make_wallet, run_catch_up):
+    wallet = make_wallet(db)
+    add_tx(db, wallet, DAY)
+    db.add(WalletDailyRollup(wallet_id=wallet.id, day=DAY.date(), type=TransactionType.TRANSFER_OUT, count=3, total=9))
+    db.commit()
+
+    run_catch_up()
+
+    assert rollups(db) == {(wallet.id, date(2026, 3, 1), TransactionType.DEPOSIT): (1, 100)}
+
+
+def test_incremental_mode_stops_at_midnight():
+    now = datetime(2026, 3, 2, 10, 30)
+
+    assert high_water_mark(None, "incremental", now) == datetime(2026, 3, 2)
+    assert high_water_mark(DAY, "incremental", now) == DAY
+    assert high_water_mark(None, "job", now) == now - rollup_catchup.SETTLE_DELAY
+    # transfers that began before midnight may still be committing
+    assert high_water_mark(None, "incremental", datetime(2026, 3, 2, 0, 0, 30)) == DAY
+
+
+def test_sharded_wallet_spreads_rollup_rows(db, make_wallet, run_catch_up, monkeypatch):
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+    set_wallet_shards(db, recipient, 4)
+    db.commit()
+    picks = iter([0, 3, 1, 3])
+    monkeypatch.setattr(rollup_util, "random", SimpleNamespace(randrange=lambda n: next(picks)))
+
+    for _ in range(4):
+        perform_transfer(db, sender, recipient.wallet_number, 10)
+        db.commit()
+
+    assert shard_nos(db, recipient) == [0, 1, 3]
+    assert shard_nos(db, sender) == [0]
+    [today] = wallet_summary(db, recipient.id, days=1)
+    assert (today["inflow_count"], today["inflow_total"]) == (4, 40)
+
+    before = rollups(db)
+    run_catch_up()
+
+    assert shard_nos(db, recipient) == [0]
+    assert rollups(db) == before
+
+
+def test_summary_splits_inflow_and_outflow(db, make_wallet):
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+    perform_transfer(db, sender, recipient.wallet_number, 40)
+    perform_transfer(db, recipient, sender.wallet_number, 15)
+    db.commit()
+
+    [today] = wallet_summary(db, sender.id, days=7)
+
+    assert (today["inflow_count"], today["inflow_total"]) == (1, 15)
+    assert (today["outflow_count"], today["outflow_total"]) == (1, 40)
+
+
+def test_catch_up_rerun_postgres(pg_engine, pg_session, make_wallet, monkeypatch):
+    monkeypatch.setattr(rollup_catchup, "SessionLocal", sessionmaker(bind=pg_engine))
+    db = pg_session()
+    db.query(JobCheckpoint).filter_by(name=CHECKPOINT_NAME).delete()
+    db.commit()
+    wallet = make_wallet(db)
+    for hour in (1, 2, 25):
+        add_tx(db, wallet, DAY + timedelta(hours=hour))
+    db.add(WalletDailyRollup(wallet_id=wallet.id, day=DAY.date(), type=TransactionType.TRANSFER_OUT, count=3, total=9))
+    db.commit()
+
+    for _ in range(2):
+        db.query(JobCheckpoint).filter_by(name=CHECKPOINT_NAME).delete()
+        db.commit()
+        catch_up(datetime(2100, 1, 1), batch_size=2)
+
+        assert {key: value for key, value in rollups(db).items() if key[0] == wallet.id} == {
+            (wallet.id, date(2026, 3, 1), TransactionType.DEPOSIT): (2, 200),
+            (wallet.id, date(2026, 3, 2), TransactionType.DEPOSIT): (1, 100),
+        }
+
+
+def test_late_credit_and_recount_do_not_lose_updates_postgres(pg_session, make_wallet):
+    db, late = pg_session(), pg_session()
+    wallet = make_wallet(db)
+    add_tx(db, wallet, DAY)  # counted, but no rollup row yet
+    add_tx(db, wallet, DAY, amount=50, status=TransactionStatus.PENDING)
+
+    # a deposit created on DAY is confirmed today: first rollup row for DAY
+    late.query(Transaction).filter_by(wallet_id=wallet.id, status=TransactionStatus.PENDING) \
+        .update({"status": TransactionStatus.SUCCESS})
+    add_to_rollups(late, [(wallet.id, DAY.date(), TransactionType.DEPOSIT, 50)])
+
+    def recount():
+        session = pg_session()
+        rebuild_rollups(session, {(wallet.id, DAY.date())})
+        session.commit()
+
+    thread = threading.Thread(target=recount)
+    thread.start()
+    time.sleep(0.3)
+    assert thread.is_alive()  # waits for the late writer's day lock
+
+    late.commit()
+    thread.join()
+
+    assert rollups(db)[(wallet.id, DAY.date(), TransactionType.DEPOSIT)] == (2, 150)
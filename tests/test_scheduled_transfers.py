@@ -0,0 +1,156 @@
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import OperationalError
+
+from app.features.auth.models.user_model import User
+from app.features.scheduled_transfers.models.schedule_model import ScheduledTransfer
+from app.features.scheduled_transfers.utils import scheduler_util
+from app.features.scheduled_transfers.utils.scheduler_util import (
+    claim_due_transfers,
+    next_run_after,
+    run_due_transfers,
+)
+from app.features.wallet.models.wallet_model import Wallet
+
+NOW = datetime(2026, 3, 1, 12, 0)
+
+
+def add_schedule(db, sender, recipient, amount=10, interval_seconds=None, next_run_at=NOW) -> ScheduledTransfer:
+    job = ScheduledTransfer(
+        user_id=sender.user_id,
+        wallet_id=sender.id,
+        recipient_wallet_number=recipient.wallet_number,
+        amount=amount,
+        interval_seconds=interval_seconds,
+        next_run_at=next_run_at,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def balances(db, *wallets):
+    db.expire_all()
+    return [db.get(Wallet, wallet.id).balance for wallet in wallets]
+
+
+def test_recurring_run_skips_missed_intervals():
+    job = ScheduledTransfer(interval_seconds=3600, next_run_at=NOW)
+
+    assert next_run_after(job, NOW) == NOW + timedelta(hours=1)
+    assert next_run_after(job, NOW + timedelta(hours=5, minutes=30)) == NOW + timedelta(hours=6)
+    assert next_run_after(ScheduledTransfer(interval_seconds=None, next_run_at=NOW), NOW) is None
+
+
+def test_due_transfers_run_and_reschedule(db, make_wallet):
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+    once = add_schedule(db, sender, recipient, amount=10, next_run_at=datetime.utcnow() - timedelta(minutes=1))
+    recurring = add_schedule(db, sender, recipient, amount=20, interval_seconds=3600,
+                             next_run_at=datetime.utcnow() - timedelta(minutes=1))
+    later = add_schedule(db, sender, recipient, amount=30, next_run_at=datetime.utcnow() + timedelta(hours=1))
+
+    summary = run_due_transfers(db, batch_size=10)
+
+    assert summary == {"claimed": 2, "succeeded": 2, "failed": 0}
+    assert balances(db, sender, recipient) == [70, 30]
+    assert not db.get(ScheduledTransfer, once.id).is_active
+    assert db.get(ScheduledTransfer, recurring.id).is_active
+    assert db.get(ScheduledTransfer, recurring.id).next_run_at > datetime.utcnow()
+    assert db.get(ScheduledTransfer, later.id).run_count == 0
+
+
+def test_failed_transfer_is_recorded_and_others_still_run(db, make_wallet):
+    sender, recipient = make_wallet(db, 50), make_wallet(db)
+    due = datetime.utcnow() - timedelta(minutes=1)
+    too_big = add_schedule(db, sender, recipient, amount=500, next_run_at=due - timedelta(seconds=1))
+    add_schedule(db, sender, recipient, amount=20, next_run_at=due)
+
+    summary = run_due_transfers(db, batch_size=10)
+
+    assert summary == {"claimed": 2, "succeeded": 1, "failed": 1}
+    failed = db.get(ScheduledTransfer, too_big.id)
+    assert (failed.last_status, failed.last_error) == ("failed", "Insufficient balance")
+    assert balances(db, sender, recipient) == [30, 20]
+
+
+def test_concurrent_claims_are_disjoint_postgres(pg_session, make_wallet):
+    db = pg_session()
+    sender, recipient = make_wallet(db, 1000), make_wallet(db)
+    jobs = [add_schedule(db, sender, recipient, next_run_at=NOW - timedelta(days=365)) for _ in range(6)]
+    ours = {job.id for job in jobs}
+
+    first, second = pg_session(), pg_session()
+    claimed_first = {job.id for job in claim_due_transfers(first, NOW, 3)} & ours
+    claimed_second = {job.id for job in claim_due_transfers(second, NOW, 10)} & ours
+    first.rollback()
+    second.rollback()
+
+    assert len(claimed_first) == 3
+    assert claimed_first.isdisjoint(claimed_second)
+    assert claimed_first | claimed_second == ours
+
+
+def test_parallel_schedulers_run_each_job_once_postgres(pg_session, make_wallet):
+    db = pg_session()
+    sender, recipient = make_wallet(db, 1000), make_wallet(db)
+    jobs = [add_schedule(db, sender, recipient, amount=10, next_run_at=datetime.utcnow() - timedelta(minutes=1))
+            for _ in range(20)]
+    barrier = threading.Barrier(4, timeout=30)
+    errors = []
+
+    def scheduler():
+        session = pg_session()
+        try:
+            barrier.wait()
+            while run_due_transfers(session, batch_size=3)["claimed"]:
+                pass
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=scheduler) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors, errors
+    db.expire_all()
+    assert [db.get(ScheduledTransfer, job.id).run_count for job in jobs] == [1] * 20
+    assert balances(db, sender, recipient) == [800, 200]
+
+
+def test_inactive_users_schedules_are_switched_off(db, make_wallet):
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+    job = add_schedule(db, sender, recipient, interval_seconds=3600,
+                       next_run_at=datetime.utcnow() - timedelta(minutes=1))
+    db.query(User).filter_by(user_id=sender.user_id).update({"is_active": False})
+    db.commit()
+
+    summary = run_due_transfers(db, batch_size=10)
+
+    assert summary == {"claimed": 1, "succeeded": 0, "failed": 1}
+    job = db.get(ScheduledTransfer, job.id)
+    assert (job.is_active, job.last_error, job.run_count) == (False, "User is inactive", 0)
+    assert balances(db, sender, recipient) == [100, 0]
+
+
+def test_database_error_fails_only_that_job(db, make_wallet, monkeypatch):
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+    due = datetime.utcnow() - timedelta(minutes=1)
+    broken = add_schedule(db, sender, recipient, amount=10, next_run_at=due - timedelta(seconds=1))
+    add_schedule(db, sender, recipient, amount=20, next_run_at=due)
+    real_transfer = scheduler_util.perform_transfer
+
+    def transfer(db, sender_wallet, recipient_wallet_number, amount):
+        if amount == 10:
+            raise OperationalError("UPDATE wallets", {}, Exception("deadlock detected"))
+        return real_transfer(db, sender_wallet, recipient_wallet_number, amount)
+
+    monkeypatch.setattr(scheduler_util, "perform_transfer", transfer)
+    summary = run_due_transfers(db, batch_size=10)
+
+    assert summary == {"claimed": 2, "succeeded": 1, "failed": 1}
+    assert balances(db, sender, recipient) == [80, 20]
+    broken = db.get(ScheduledTransfer, broken.id)
+    assert (broken.last_status, broken.last_error, broken.is_active) == ("failed", "OperationalError", False)
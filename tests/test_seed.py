@@ -0,0 +1,56 @@
+from argparse import Namespace
+
+from sqlalchemy import case, func
+
+from app.cli.seed import Seeder
+from app.features.api_keys.models.api_model import ApiKey
+from app.features.api_keys.utils.security import verify_key
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.models.wallet_model import Wallet
+
+
+def seed(db, **overrides) -> tuple[Seeder, list[str]]:
+    args = Namespace(users=50, transactions=2000, api_keys=5, days=30, hot_wallets=2, hot_share=0.3,
+                     deposit_share=0.3, batch_size=500, seed=7, keys_out=None, create_schema=False)
+    for name, value in overrides.items():
+        setattr(args, name, value)
+    seeder = Seeder(db, args)
+    seeder.users_and_wallets()
+    seeder.transactions()
+    seeder.balances_to_wallets()
+    return seeder, seeder.api_keys()
+
+
+def test_balances_match_history(db):
+    seed(db)
+    signed = case(
+        (Transaction.type == TransactionType.TRANSFER_OUT, -Transaction.amount),
+        else_=Transaction.amount,
+    )
+    history = dict(
+        db.query(Transaction.wallet_id, func.sum(signed))
+        .filter(Transaction.status == TransactionStatus.SUCCESS)
+        .group_by(Transaction.wallet_id)
+        .all()
+    )
+    balances = dict(db.query(Wallet.id, Wallet.balance).all())
+
+    assert db.query(Transaction).count() >= 2000
+    assert all(balance >= 0 for balance in balances.values())
+    assert balances == {wallet_id: history.get(wallet_id, 0) for wallet_id in balances}
+
+
+def test_transfers_come_in_pairs(db):
+    seed(db)
+    outs = db.query(Transaction).filter_by(type=TransactionType.TRANSFER_OUT).count()
+    ins = db.query(Transaction).filter_by(type=TransactionType.TRANSFER_IN).count()
+
+    assert outs == ins > 0
+
+
+def test_raw_keys_verify(db):
+    _, raw_keys = seed(db, transactions=10)
+
+    assert len(raw_keys) == 5
+    _, _, public_id, secret = raw_keys[0].split("_", 3)
+    assert verify_key(secret, db.query(ApiKey).filter_by(public_api_id=public_id).one().api_key)
@@ -0,0 +1,43 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.settings import Settings
+
+PG = "postgresql://app@db/wallet"
+
+
+def make_settings(**values) -> Settings:
+    return Settings(database_url=PG, jwt_secret_key="k", **values)
+
+
+def test_pool_limits_unbudgeted():
+    settings = make_settings(db_pool_size=7, db_max_overflow=3)
+    assert settings.pool_limits() == (7, 3)
+    assert settings.pool_limits(replica=True) == (7, 3)
+
+
+def test_budget_covers_listener_connection():
+    settings = make_settings(db_max_connections=24, web_concurrency=4)
+    pool_size, overflow = settings.pool_limits()
+    # 6 per worker: 1 LISTEN + 5 pooled
+    assert pool_size + overflow == 5
+    assert settings.web_concurrency * (pool_size + overflow + settings.listener_connections) <= 24
+
+
+def test_budget_split_with_replica():
+    settings = make_settings(db_max_connections=40, web_concurrency=4, read_database_url=PG)
+    primary = sum(settings.pool_limits())
+    replica = sum(settings.pool_limits(replica=True))
+    assert (primary, replica) == (5, 4)
+    assert 4 * (primary + replica + 1) <= 40
+
+
+def test_no_listener_off_postgres():
+    settings = Settings(database_url="sqlite://", jwt_secret_key="k", db_max_connections=8, web_concurrency=2)
+    assert settings.listener_connections == 0
+    assert sum(settings.pool_limits()) == 4
+
+
+def test_budget_too_small_fails_at_startup():
+    with pytest.raises(ValidationError, match="DB_MAX_CONNECTIONS"):
+        make_settings(db_max_connections=4, web_concurrency=4)
@@ -0,0 +1,55 @@
+from app.features.transaction.models.transaction_model import Transaction, TransactionType
+from app.features.transaction.utils.meta_util import compact_meta, load_archived_payload, store_transaction_meta
+from app.features.wallet.utils.wallet_util import generate_reference_number
+
+WEBHOOK = {
+    "event": "charge.success",
+    "data": {
+        "reference": "ref",
+        "status": "success",
+        "channel": "card",
+        "gateway_response": "Approved",
+        "authorization": {"bin": "408408", "last4": "4081"},
+        "customer": {"email": "someone@example.test"},
+    },
+}
+
+
+def add_tx(db, wallet) -> Transaction:
+    tx = Transaction(wallet_id=wallet.id, type=TransactionType.DEPOSIT, amount=100,
+                     reference=generate_reference_number())
+    db.add(tx)
+    db.flush()
+    return tx
+
+
+def test_compact_keeps_whitelisted_fields():
+    assert compact_meta(WEBHOOK) == {"channel": "card", "gateway_response": "Approved"}
+    assert compact_meta({"authorization_url": "https://pay.test/x", "junk": 1}) == {
+        "authorization_url": "https://pay.test/x",
+    }
+    assert compact_meta({"junk": 1}) is None
+    assert compact_meta("not a dict") is None
+
+
+def test_compact_policy_archives_full_payload(db, make_wallet, configure):
+    configure(transaction_meta_policy="compact")
+    tx = add_tx(db, make_wallet(db))
+
+    store_transaction_meta(db, tx, WEBHOOK, "webhook")
+    store_transaction_meta(db, tx, WEBHOOK, "webhook")  # replayed webhook
+    db.commit()
+
+    assert tx.meta == {"channel": "card", "gateway_response": "Approved"}
+    assert load_archived_payload(db, tx.reference, "webhook") == WEBHOOK
+
+
+def test_full_policy_keeps_payload_inline(db, make_wallet, configure):
+    configure(transaction_meta_policy="full")
+    tx = add_tx(db, make_wallet(db))
+
+    store_transaction_meta(db, tx, WEBHOOK, "webhook")
+    db.commit()
+
+    assert tx.meta == WEBHOOK
+    assert load_archived_payload(db, tx.reference, "webhook") is None
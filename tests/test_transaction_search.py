@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.features.transaction.models.transaction_model import Transaction, TransactionStatus, TransactionType
+from app.features.wallet.utils.transaction_search import (
+    TransactionFilters,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+    search_transactions,
+)
+from app.features.wallet.utils.wallet_util import generate_reference_number
+
+START = datetime(2026, 3, 1)
+
+
+def add_txs(db, wallet, n, at=None, tx_type=TransactionType.DEPOSIT, amount=100, counterparty=None):
+    for i in range(n):
+        db.add(Transaction(
+            wallet_id=wallet.id,
+            type=tx_type,
+            status=TransactionStatus.SUCCESS,
+            amount=amount,
+            reference=generate_reference_number(),
+            counterparty_wallet_id=counterparty.id if counterparty else None,
+            created_at=at or START + timedelta(minutes=i),
+        ))
+    db.commit()
+
+
+def all_pages(db, wallet, filters=None, limit=3) -> list[list[str]]:
+    pages, cursor = [], None
+    while True:
+        items, cursor = search_transactions(db, wallet.id, filters or TransactionFilters(), limit, cursor)
+        pages.append([item["reference"] for item in items])
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    at = datetime(2026, 3, 1, 12, 30, 15, 123456)
+
+    assert decode_cursor(encode_cursor(at, 42)) == (at, 42)
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+def test_pages_cover_everything_once_with_tied_timestamps(db, make_wallet):
+    wallet = make_wallet(db)
+    add_txs(db, wallet, 4)
+    add_txs(db, wallet, 5, at=START + timedelta(hours=1))  # same created_at
+
+    pages = all_pages(db, wallet)
+    references = [ref for page in pages for ref in page]
+
+    assert [len(page) for page in pages] == [3, 3, 3]
+    assert len(set(references)) == 9
+    newest_first = db.query(Transaction.reference).filter_by(wallet_id=wallet.id) \
+        .order_by(Transaction.created_at.desc(), Transaction.id.desc()).all()
+    assert references == [ref for ref, in newest_first]
+
+
+def test_new_rows_do_not_shift_later_pages(db, make_wallet):
+    wallet = make_wallet(db)
+    add_txs(db, wallet, 6)
+    first, cursor = search_transactions(db, wallet.id, TransactionFilters(), 3)
+
+    add_txs(db, wallet, 2, at=START + timedelta(days=1))  # newer than everything
+    second, _ = search_transactions(db, wallet.id, TransactionFilters(), 3, cursor)
+
+    before = [item["reference"] for item in first + second]
+    assert before == [ref for page in all_pages(db, wallet) for ref in page][2:]
+
+
+def test_filters(db, make_wallet):
+    wallet, other = make_wallet(db), make_wallet(db)
+    add_txs(db, wallet, 3, amount=50)
+    add_txs(db, wallet, 2, tx_type=TransactionType.TRANSFER_OUT, amount=500, counterparty=other)
+    add_txs(db, other, 4)
+
+    def count(**filters):
+        items, _ = search_transactions(db, wallet.id, TransactionFilters(**filters), 50)
+        return len(items)
+
+    assert count() == 5
+    assert count(type=TransactionType.TRANSFER_OUT) == 2
+    assert count(min_amount=100) == 2
+    assert count(max_amount=100) == 3
+    assert count(counterparty_wallet_id=other.id) == 2
+    assert count(created_from=START + timedelta(minutes=1), created_to=START + timedelta(minutes=2)) == 2
+    items, _ = search_transactions(db, wallet.id, TransactionFilters(counterparty_wallet_id=other.id), 50)
+    assert {item["counterparty_wallet_number"] for item in items} == {other.wallet_number}
+
+
+def test_count_is_exact_up_to_the_limit(db, make_wallet, configure):
+    configure(transaction_search_exact_count_limit=5)
+    small, big = make_wallet(db), make_wallet(db)
+    add_txs(db, small, 5)
+    add_txs(db, big, 8)
+
+    assert estimate_count(db, small.id, TransactionFilters()) == (5, False)
+    assert estimate_count(db, big.id, TransactionFilters()) == (5, True)
+
+
+def test_count_falls_back_to_planner_estimate_postgres(pg_session, make_wallet, configure):
+    configure(transaction_search_exact_count_limit=5)
+    db = pg_session()
+    wallet = make_wallet(db)
+    add_txs(db, wallet, 20)
+
+    total, is_estimate = estimate_count(db, wallet.id, TransactionFilters())
+
+    assert is_estimate
+    assert total > 5
+    assert [len(page) for page in all_pages(db, wallet, limit=8)] == [8, 8, 4]
@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.features.wallet.models.wallet_model import Wallet
+from app.features.wallet.utils.transfer_util import perform_transfer
+from app.features.wallet.utils.wallet_util import set_wallet_shards, credit_wallet_id, wallet_total_balance
+
+
+def balances(db, *wallets):
+    db.expire_all()
+    return [db.get(Wallet, wallet.id).balance for wallet in wallets]
+
+
+def test_transfer_moves_funds(db, make_wallet):
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+
+    perform_transfer(db, sender, recipient.wallet_number, 40)
+    db.commit()
+
+    assert balances(db, sender, recipient) == [60, 40]
+
+
+def test_insufficient_balance_is_rejected(db, make_wallet):
+    sender, recipient = make_wallet(db, 10), make_wallet(db)
+
+    with pytest.raises(HTTPException) as exc:
+        perform_transfer(db, sender, recipient.wallet_number, 40)
+    db.rollback()
+
+    assert exc.value.status_code == 400
+    assert balances(db, sender, recipient) == [10, 0]
+
+
+def test_debit_pulls_in_shard_balances(db, make_wallet):
+    sender, recipient = make_wallet(db, 10), make_wallet(db)
+    set_wallet_shards(db, sender, 4)
+    db.commit()
+    for _ in range(5):
+        credit_wallet_id(db, sender.id, 10)
+    db.commit()
+
+    perform_transfer(db, sender, recipient.wallet_number, 55)
+    db.commit()
+
+    db.expire_all()
+    assert wallet_total_balance(db, db.get(Wallet, sender.id)) == 5
+    assert balances(db, recipient) == [55]
+
+
+def _run_concurrently(pg_session, transfers):
+    """
+    Run (sender, wallet_number, amount) transfers on separate sessions at
+    once; returns how many succeeded.
+    """
+    barrier = threading.Barrier(len(transfers), timeout=30)
+    succeeded, errors = [], []
+
+    def run(sender_id, wallet_number, amount):
+        db = pg_session()
+        try:
+            sender = db.get(Wallet, sender_id)
+            barrier.wait()
+            perform_transfer(db, sender, wallet_number, amount)
+            db.commit()
+            succeeded.append(amount)
+        except HTTPException:
+            db.rollback()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run, args=transfer) for transfer in transfers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    return len(succeeded)
+
+
+def test_concurrent_debits_never_overdraw_postgres(pg_session, make_wallet):
+    db = pg_session()
+    sender, recipient = make_wallet(db, 100), make_wallet(db)
+
+    ok = _run_concurrently(pg_session, [(sender.id, recipient.wallet_number, 30)] * 10)
+
+    assert ok == 3
+    assert balances(db, sender, recipient) == [10, 90]
+
+
+def test_opposite_transfers_do_not_deadlock_postgres(pg_session, make_wallet):
+    db = pg_session()
+    a, b = make_wallet(db, 1000), make_wallet(db, 1000)
+
+    ok = _run_concurrently(pg_session, [(a.id, b.wallet_number, 1), (b.id, a.wallet_number, 1)] * 10)
+
+    assert ok == 20
+    assert balances(db, a, b) == [1000, 1000]
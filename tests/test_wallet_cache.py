@@ -0,0 +1,34 @@
+from app.features.wallet.utils import wallet_cache
+from app.features.wallet.utils.wallet_cache import WalletNumberCache, resolve_wallet_id
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = WalletNumberCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_zero_size_cache_stores_nothing():
+    cache = WalletNumberCache(maxsize=0)
+    cache.put("a", 1)
+
+    assert cache.get("a") is None
+
+
+def test_resolve_queries_once_per_wallet_number(db, make_wallet, monkeypatch):
+    cache = WalletNumberCache(maxsize=10)
+    monkeypatch.setattr(wallet_cache, "wallet_number_cache", cache)
+    wallet = make_wallet(db)
+
+    assert resolve_wallet_id(db, wallet.wallet_number) == wallet.id
+    assert resolve_wallet_id(db, wallet.wallet_number) == wallet.id
+    assert resolve_wallet_id(db, "no-such-wallet") is None
+
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.get("no-such-wallet") is None  # misses are not cached
@@ -0,0 +1,51 @@
+from app.features.wallet.models.wallet_model import Wallet, WalletBalanceShard
+from app.features.wallet.utils.wallet_util import credit_wallet_id, set_wallet_shards, wallet_total_balance
+
+
+def sharded_wallet(db, make_wallet, shards=4, credits=8):
+    wallet = make_wallet(db, 10)
+    set_wallet_shards(db, wallet, shards)
+    db.commit()
+    for _ in range(credits):
+        credit_wallet_id(db, wallet.id, 5)
+    db.commit()
+    return wallet
+
+
+def shard_rows(db, wallet) -> dict:
+    return dict(db.query(WalletBalanceShard.shard_no, WalletBalanceShard.balance).filter_by(wallet_id=wallet.id))
+
+
+def test_credits_land_on_shards(db, make_wallet):
+    wallet = sharded_wallet(db, make_wallet)
+
+    db.expire_all()
+    assert db.get(Wallet, wallet.id).balance == 10
+    assert sum(shard_rows(db, wallet).values()) == 40
+    assert wallet_total_balance(db, db.get(Wallet, wallet.id)) == 50
+
+
+def test_disabling_shards_holding_money_folds_them_in(db, make_wallet):
+    wallet = sharded_wallet(db, make_wallet)
+    db.expire_all()
+    # shard rows loaded into the session must not be flushed after the delete
+    db.query(WalletBalanceShard).filter_by(wallet_id=wallet.id).all()
+
+    set_wallet_shards(db, wallet, 0)
+    db.commit()
+
+    db.expire_all()
+    assert shard_rows(db, wallet) == {}
+    assert db.get(Wallet, wallet.id).balance == 50
+    assert db.get(Wallet, wallet.id).shard_count == 0
+
+
+def test_shrinking_shards_keeps_the_total(db, make_wallet):
+    wallet = sharded_wallet(db, make_wallet)
+
+    set_wallet_shards(db, wallet, 2)
+    db.commit()
+
+    db.expire_all()
+    assert shard_rows(db, wallet) == {0: 0, 1: 0}
+    assert wallet_total_balance(db, db.get(Wallet, wallet.id)) == 50